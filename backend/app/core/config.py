@@ -30,6 +30,11 @@ class Settings(BaseSettings):
     
     # LLM configuration
     default_llm_model: str = Field(default="phi-3.5-mini", env="DEFAULT_LLM_MODEL")
+    llm_local_model: bool = Field(default=False, env="LLM_LOCAL_MODEL")
+    llm_compile: bool = Field(default=False, env="LLM_COMPILE")
+    llm_quantization: Literal["auto", "fp32", "fp16", "bf16", "int8", "int4"] = Field(default="auto", env="LLM_QUANTIZATION")
+    llm_speculative_decoding: bool = Field(default=False, env="LLM_SPECULATIVE_DECODING")
+    llm_draft_model: str = Field(default="", env="LLM_DRAFT_MODEL")
     
     # Paths - Use absolute paths to avoid working directory issues
     _project_root: Path = Path(__file__).parent.parent.parent
@@ -41,11 +46,26 @@ class Settings(BaseSettings):
     sadtalker_size: int = Field(default=256, env="SADTALKER_SIZE")
     sadtalker_fps: int = Field(default=12, env="SADTALKER_FPS")
     sadtalker_enhancer: str = Field(default="off", env="SADTALKER_ENHANCER")
+    sadtalker_compile: bool = Field(default=False, env="SADTALKER_COMPILE")
+    sadtalker_facerender_batch: int = Field(default=0, env="SADTALKER_FACERENDER_BATCH")  # 0 = autotune
+    sadtalker_precision: Literal["fp32", "fp16", "bf16"] = Field(default="fp32", env="SADTALKER_PRECISION")
+    sadtalker_use_tensorrt: bool = Field(default=False, env="SADTALKER_USE_TENSORRT")
+    sadtalker_mock_emit_files: bool = Field(default=True, env="SADTALKER_MOCK_EMIT_FILES")
+    sadtalker_warmup: bool = Field(default=False, env="SADTALKER_WARMUP")
+    sadtalker_scratch_dir: Path = Field(default=Path("/dev/shm/sadtalker"), env="SADTALKER_SCRATCH")
+    sadtalker_replicas: int = Field(default=0, env="SADTALKER_REPLICAS")  # 0 = one per GPU, one on CPU
+    
+    # Video encoding configuration
+    video_x264_preset: str = Field(default="veryfast", env="VIDEO_X264_PRESET")
+    video_nvenc_preset: str = Field(default="p4", env="VIDEO_NVENC_PRESET")
+    video_crf: int = Field(default=23, env="VIDEO_CRF")
     
     # Voice configuration
     voice_sample_rate: int = Field(default=16000, env="VOICE_SAMPLE_RATE")
     voice_max_duration: int = Field(default=20, env="VOICE_MAX_DURATION")
     voice_min_duration: int = Field(default=5, env="VOICE_MIN_DURATION")
+    tts_precision: Literal["auto", "fp32", "fp16", "bf16", "int8"] = Field(default="auto", env="TTS_PRECISION")
+    tts_compile: bool = Field(default=False, env="TTS_COMPILE")
     
     # Logging
     log_level: str = Field(default="INFO", env="LOG_LEVEL")
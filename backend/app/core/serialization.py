@@ -0,0 +1,20 @@
+"""JSON encoding and decoding shared across the backend, backed by orjson."""
+
+from typing import Any
+
+import orjson
+
+
+def dumps(obj: Any) -> bytes:
+    """Encode obj as compact UTF-8 JSON, with numpy arrays as lists."""
+    return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY)
+
+
+def dumps_indented(obj: Any) -> bytes:
+    """Encode obj as UTF-8 JSON indented by two spaces, with numpy arrays as lists."""
+    return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY)
+
+
+def loads(data: bytes) -> Any:
+    """Decode a JSON document."""
+    return orjson.loads(data)
@@ -9,6 +9,7 @@ from fastapi.staticfiles import StaticFiles
 
 from .core.config import settings
 from .core.logging import setup_logging, get_logger
+from .services.foundry.local_client import close_foundry_client
 from .routes import health, preview, wizard_text, wizard_image, wizard_voice, wizard_build, simple_asr, preview_generation, artifacts
 
 # Set up logging
@@ -29,10 +30,22 @@ async def lifespan(app: FastAPI):
     settings.artifacts_dir.mkdir(parents=True, exist_ok=True)
     settings.models_dir.mkdir(parents=True, exist_ok=True)
     
+    # Load SadTalker up front so the first preview skips model loading
+    if settings.sadtalker_warmup:
+        from .services.lipsync.sadtalker_real import get_sadtalker_service, sadtalker_available
+        if sadtalker_available():
+            try:
+                await get_sadtalker_service().warmup()
+            except Exception as e:
+                logger.warning(f"SadTalker warmup failed, models will load on first request: {e}")
+        else:
+            logger.info("SadTalker not installed, skipping warmup")
+    
     yield
     
     # Shutdown
     logger.info("Shutting down Persona Wizard backend...")
+    await close_foundry_client()
 
 
 # Create FastAPI app
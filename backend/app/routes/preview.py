@@ -1,5 +1,6 @@
 """Preview generation endpoints."""
 
+import asyncio
 import logging
 import uuid
 from pathlib import Path
@@ -49,8 +50,9 @@ async def generate_preview(request: PreviewRequest, background_tasks: Background
         device = get_device()
         adapter = SadTalkerAdapter(device=device)
         
-        # Generate video
-        result = adapter.generate_video(
+        # Generate video; rendering and ffmpeg encoding block, so run them off the event loop
+        result = await asyncio.to_thread(
+            adapter.generate_video,
             image_path=sample_image,
             audio_path=sample_audio,
             output_path=output_path
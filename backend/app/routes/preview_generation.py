@@ -13,6 +13,7 @@ from pydantic import BaseModel
 
 from ..services.preview.orchestrator import orchestrator
 from ..services.bundle.builder import BundleBuilder
+from ..services.llm.text_generator import TextGenerator
 from ..core.logging import get_logger
 
 logger = get_logger(__name__)
@@ -292,6 +293,8 @@ async def _get_persona_config(
                 "primary_tone": "professional"
             }
         }
+        # Compile the style once so generation skips re-reading the profile per request
+        config["text"]["style_signature"] = TextGenerator.compile_style(config["text"]["style_profile"])
     
     return config
 
@@ -1,5 +1,6 @@
 """Text upload and processing endpoints."""
 
+import asyncio
 import logging
 import uuid
 from pathlib import Path
@@ -39,9 +40,9 @@ async def upload_text(
         with open(raw_text_path, 'w', encoding='utf-8') as f:
             f.write(text)
         
-        # Create style profile
+        # Create style profile off the event loop; analysis and the JSON write block
         profile_path = text_dir / f"{text_id}_style_profile.json"
-        profile = create_style_profile(text, profile_path)
+        profile = await asyncio.to_thread(create_style_profile, text, profile_path)
         
         # Calculate token count (rough estimate)
         token_count = len(text.split()) * 1.3  # Rough token estimation
@@ -7,7 +7,6 @@ Implements circular buffering and audio accumulation for streaming transcription
 
 import numpy as np
 from typing import Optional, List
-from collections import deque
 import threading
 import time
 
@@ -29,8 +28,13 @@ class AudioStreamBuffer:
         """
         self.sample_rate = sample_rate
         self.max_samples = int(max_duration * sample_rate)
-        self.buffer = deque(maxlen=self.max_samples)
+        # Preallocated ring of the most recent samples; _head is the next write slot
+        self._ring = np.zeros(self.max_samples, dtype=np.int16)
+        self._head = 0
+        self._size = 0
+        # Accumulated audio is kept as the chunks received, joined on read
         self.accumulated_audio = []
+        self._accumulated_samples = 0
         self.lock = threading.Lock()
         self.last_activity = time.time()
         self.is_accumulating = False
@@ -55,22 +59,56 @@ class AudioStreamBuffer:
             
             with self.lock:
                 # Add to circular buffer
-                self.buffer.extend(audio_array)
+                self._write_ring(audio_array)
                 
                 # Add to accumulated audio if we're in accumulation mode
                 if self.is_accumulating:
-                    self.accumulated_audio.extend(audio_array)
+                    self.accumulated_audio.append(audio_array)
+                    self._accumulated_samples += len(audio_array)
                 
                 self.last_activity = time.time()
                 
         except Exception as e:
             logger.error(f"Failed to add audio to buffer: {e}")
     
+    @property
+    def buffer(self) -> np.ndarray:
+        """Samples currently in the circular buffer, oldest first."""
+        with self.lock:
+            return self._read_ring(self._size).copy()
+    
+    def _write_ring(self, samples: np.ndarray):
+        """Copy samples into the ring, overwriting the oldest once it is full."""
+        n = len(samples)
+        if n >= self.max_samples:
+            self._ring[:] = samples[n - self.max_samples:]
+            self._head = 0
+            self._size = self.max_samples
+            return
+        
+        end = self._head + n
+        if end <= self.max_samples:
+            self._ring[self._head:end] = samples
+        else:
+            split = self.max_samples - self._head
+            self._ring[self._head:] = samples[:split]
+            self._ring[:n - split] = samples[split:]
+        self._head = end % self.max_samples
+        self._size = min(self._size + n, self.max_samples)
+    
+    def _read_ring(self, count: int) -> np.ndarray:
+        """The most recent count samples, as a view when they do not wrap."""
+        start = (self._head - count) % self.max_samples
+        if count == 0 or start + count <= self.max_samples:
+            return self._ring[start:start + count]
+        return np.concatenate((self._ring[start:], self._ring[:self._head]))
+    
     def start_accumulation(self):
         """Start accumulating audio for transcription."""
         with self.lock:
             self.is_accumulating = True
             self.accumulated_audio = []
+            self._accumulated_samples = 0
             logger.debug("Started audio accumulation")
     
     def stop_accumulation(self):
@@ -90,8 +128,8 @@ class AudioStreamBuffer:
             if not self.accumulated_audio:
                 return None
             
-            # Convert to numpy array
-            audio_array = np.array(self.accumulated_audio, dtype=np.float32)
+            # Join the chunks into one float array
+            audio_array = np.concatenate(self.accumulated_audio).astype(np.float32)
             
             # Normalize to [-1, 1] range
             if audio_array.max() > 0:
@@ -110,18 +148,17 @@ class AudioStreamBuffer:
             Numpy array of recent audio or None if no audio
         """
         with self.lock:
-            if not self.buffer:
+            if not self._size:
                 return None
             
             # Calculate number of samples to retrieve
-            samples_to_get = min(int(duration * self.sample_rate), len(self.buffer))
+            samples_to_get = min(int(duration * self.sample_rate), self._size)
             
             if samples_to_get == 0:
                 return None
             
             # Get recent samples
-            recent_audio = list(self.buffer)[-samples_to_get:]
-            audio_array = np.array(recent_audio, dtype=np.float32)
+            audio_array = self._read_ring(samples_to_get).astype(np.float32)
             
             # Normalize to [-1, 1] range
             if audio_array.max() > 0:
@@ -132,22 +169,22 @@ class AudioStreamBuffer:
     def clear(self):
         """Clear all buffered audio."""
         with self.lock:
-            self.buffer.clear()
+            self._head = 0
+            self._size = 0
             self.accumulated_audio = []
+            self._accumulated_samples = 0
             self.is_accumulating = False
             logger.debug("Audio buffer cleared")
     
     def get_duration(self) -> float:
         """Get the duration of accumulated audio in seconds."""
         with self.lock:
-            if not self.accumulated_audio:
-                return 0.0
-            return len(self.accumulated_audio) / self.sample_rate
+            return self._accumulated_samples / self.sample_rate
     
     def get_buffer_duration(self) -> float:
         """Get the duration of buffered audio in seconds."""
         with self.lock:
-            return len(self.buffer) / self.sample_rate
+            return self._size / self.sample_rate
     
     def is_silent(self, threshold: float = 0.01, duration: float = 1.0) -> bool:
         """
@@ -211,9 +248,9 @@ class AudioStreamBuffer:
         """Get buffer statistics."""
         with self.lock:
             return {
-                "buffer_samples": len(self.buffer),
+                "buffer_samples": self._size,
                 "buffer_duration": self.get_buffer_duration(),
-                "accumulated_samples": len(self.accumulated_audio),
+                "accumulated_samples": self._accumulated_samples,
                 "accumulated_duration": self.get_duration(),
                 "is_accumulating": self.is_accumulating,
                 "last_activity": self.last_activity,
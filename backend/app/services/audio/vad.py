@@ -8,6 +8,7 @@ Uses energy-based detection with configurable thresholds.
 import numpy as np
 from typing import List, Tuple
 from collections import deque
+from itertools import islice
 import time
 
 from ...core.logging import get_logger
@@ -68,8 +69,9 @@ class VoiceActivityDetector:
             # Convert bytes to numpy array
             audio_array = np.frombuffer(audio_data, dtype=np.int16)
             
-            # Convert to float and normalize
-            audio_float = audio_array.astype(np.float32) / 32768.0
+            # Convert to float and normalize in place
+            audio_float = audio_array.astype(np.float32)
+            audio_float *= 1.0 / 32768.0
             
             # Calculate energy for this frame
             energy = self._calculate_energy(audio_float)
@@ -97,9 +99,9 @@ class VoiceActivityDetector:
         if len(audio) == 0:
             return 0.0
         
-        # Calculate RMS (Root Mean Square) energy
-        rms = np.sqrt(np.mean(audio ** 2))
-        return rms
+        # Calculate RMS (Root Mean Square) energy; the dot product runs in BLAS
+        # without materializing the squared frame
+        return float(np.sqrt(np.dot(audio, audio) / audio.size))
     
     def _update_adaptive_threshold(self):
         """Update adaptive threshold based on recent energy history."""
@@ -107,7 +109,7 @@ class VoiceActivityDetector:
             return
         
         # Calculate noise floor from recent history
-        recent_energies = list(self.energy_history)[-5:]
+        recent_energies = list(islice(self.energy_history, len(self.energy_history) - 5, None))
         noise_floor = np.percentile(recent_energies, 20)  # 20th percentile
         
         # Update adaptive threshold
@@ -204,21 +206,22 @@ class VoiceActivityDetector:
         """
         # Convert to numpy array
         audio_array = np.frombuffer(audio_data, dtype=np.int16)
-        audio_float = audio_array.astype(np.float32) / 32768.0
+        audio_float = audio_array.astype(np.float32)
+        audio_float *= 1.0 / 32768.0
         
         # Process in frames
         frame_samples = int(self.sample_rate * 0.1)  # 100ms frames
         segments = []
         current_segment = None
         
-        for i in range(0, len(audio_float), frame_samples):
-            frame = audio_float[i:i + frame_samples]
-            if len(frame) == 0:
-                break
-            
-            # Calculate energy
-            energy = self._calculate_energy(frame)
-            
+        # RMS energy of every frame at once, including a shorter final frame
+        frame_starts = np.arange(0, len(audio_float), frame_samples)
+        if len(frame_starts) == 0:
+            return segments
+        frame_lengths = np.diff(np.append(frame_starts, len(audio_float)))
+        energies = np.sqrt(np.add.reduceat(np.square(audio_float), frame_starts) / frame_lengths)
+        
+        for i, energy in zip(frame_starts.tolist(), energies.tolist()):
             # Check for voice activity
             is_voice = energy > self.adaptive_threshold
             
@@ -14,9 +14,25 @@ import logging
 
 from ...core.config import settings
 from ...core.logging import get_logger
+from ...core.serialization import dumps, loads
 
 logger = get_logger(__name__)
 
+# HTTP/2 needs the optional h2 package; fall back to pooled HTTP/1.1 keep-alive
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+
+async def _aclose_quietly(http) -> None:
+    """Close an HTTP client whose connections may belong to a finished event loop."""
+    try:
+        await http.aclose()
+    except Exception as e:
+        logger.debug(f"Error closing stale Foundry Local HTTP client: {e}")
+
 
 class FoundryLocalClient:
     """Client for Foundry Local integration."""
@@ -26,6 +42,9 @@ class FoundryLocalClient:
         self.is_available = False
         self.endpoint = "http://127.0.0.1:53224"  # Foundry Local endpoint
         self.models_dir = Path(settings.models_dir)
+        self._http = None
+        self._http_loop = None
+        self._closing_tasks = set()
         
         # Check if Foundry Local is available
         self._check_availability()
@@ -44,6 +63,44 @@ class FoundryLocalClient:
             logger.warning(f"Foundry Local not available: {e}")
             self.is_available = False
     
+    def _http_client(self):
+        """Return the pooled HTTP client for the running event loop, creating it on first use."""
+        import httpx
+        
+        loop = asyncio.get_running_loop()
+        if self._http is None or self._http_loop is not loop:
+            if self._http is not None:
+                self._discard_http_client(loop)
+            # Connections are bound to the loop that opened them
+            self._http = httpx.AsyncClient(
+                base_url=self.endpoint,
+                http2=HTTP2_AVAILABLE,
+                limits=httpx.Limits(max_keepalive_connections=32),
+                headers={"Content-Type": "application/json"}
+            )
+            self._http_loop = loop
+        return self._http
+    
+    def _discard_http_client(self, loop: asyncio.AbstractEventLoop):
+        """Close the client opened on a previous event loop so its connections are released."""
+        stale, stale_loop = self._http, self._http_loop
+        self._http = None
+        self._http_loop = None
+        if stale_loop.is_running():
+            # Close on the loop that owns the connections
+            asyncio.run_coroutine_threadsafe(_aclose_quietly(stale), stale_loop)
+            return
+        task = loop.create_task(_aclose_quietly(stale))
+        self._closing_tasks.add(task)
+        task.add_done_callback(self._closing_tasks.discard)
+    
+    async def aclose(self):
+        """Close pooled HTTP connections."""
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
+            self._http_loop = None
+    
     async def generate_text(
         self,
         prompt: str,
@@ -82,7 +139,7 @@ class FoundryLocalClient:
     ) -> Dict[str, Any]:
         """Generate text via Foundry Local API."""
         try:
-            import aiohttp
+            import httpx
             
             # Prepare request payload
             payload = {
@@ -94,62 +151,122 @@ class FoundryLocalClient:
                 "stream": False
             }
             
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    f"{self.endpoint}/v1/completions",
-                    json=payload,
-                    headers={"Content-Type": "application/json"},
-                    timeout=aiohttp.ClientTimeout(total=60)
-                ) as response:
-                    
-                    if response.status != 200:
-                        error_text = await response.text()
-                        raise RuntimeError(f"Foundry Local API error {response.status}: {error_text}")
-                    
-                    result = await response.json()
-                    
-                    if "choices" not in result or not result["choices"]:
-                        raise RuntimeError("Invalid response from Foundry Local API")
-                    
-                    generated_text = result["choices"][0]["text"]
-                    
-                    return {
-                        "text": generated_text,
-                        "word_count": len(generated_text.split()),
-                        "char_count": len(generated_text),
-                        "tokens_generated": result.get("usage", {}).get("completion_tokens", 0),
-                        "model_name": model_name,
-                        "temperature": temperature,
-                        "via_foundry": True
-                    }
-                    
-        except asyncio.TimeoutError:
+            response = await self._http_client().post("/v1/completions", content=dumps(payload), timeout=60)
+            
+            if response.status_code != 200:
+                raise RuntimeError(f"Foundry Local API error {response.status_code}: {response.text}")
+            
+            result = loads(response.content)
+            
+            if "choices" not in result or not result["choices"]:
+                raise RuntimeError("Invalid response from Foundry Local API")
+            
+            generated_text = result["choices"][0]["text"]
+            
+            return {
+                "text": generated_text,
+                "word_count": len(generated_text.split()),
+                "char_count": len(generated_text),
+                "tokens_generated": result.get("usage", {}).get("completion_tokens", 0),
+                "model_name": model_name,
+                "temperature": temperature,
+                "via_foundry": True
+            }
+            
+        except httpx.TimeoutException:
             raise RuntimeError("Foundry Local request timed out after 60 seconds")
         except Exception as e:
             logger.error(f"Foundry Local generation failed: {e}")
             raise RuntimeError(f"Foundry Local generation failed: {e}")
     
+    async def generate_text_batch(
+        self,
+        prompts: List[str],
+        model_name: str = "phi-3.5-mini",
+        max_tokens: int = 256,
+        temperature: float = 0.7,
+        **kwargs
+    ) -> List[Dict[str, Any]]:
+        """
+        Generate text for several prompts in a single Foundry Local request.
+        
+        Args:
+            prompts: Input prompts
+            model_name: Model to use
+            max_tokens: Maximum tokens to generate per prompt
+            temperature: Sampling temperature
+            **kwargs: Additional parameters
+            
+        Returns:
+            List of dicts with generated text and metadata, in prompt order
+        """
+        if not self.is_available:
+            raise RuntimeError("Foundry Local is not available. Please start Foundry Local service.")
+        
+        try:
+            import httpx
+            
+            # The completions API batches natively when given a list of prompts
+            payload = {
+                "model": model_name,
+                "prompt": prompts,
+                "max_tokens": max_tokens,
+                "temperature": temperature,
+                "top_p": kwargs.get("top_p", 0.9),
+                "stream": False
+            }
+            
+            response = await self._http_client().post(
+                "/v1/completions", content=dumps(payload), timeout=60 * len(prompts)
+            )
+            
+            if response.status_code != 200:
+                raise RuntimeError(f"Foundry Local API error {response.status_code}: {response.text}")
+            
+            result = loads(response.content)
+            
+            choices = result.get("choices") or []
+            if len(choices) != len(prompts):
+                raise RuntimeError("Invalid response from Foundry Local API")
+            
+            # Choices may come back out of order; restore prompt order by index
+            texts = [""] * len(prompts)
+            for position, choice in enumerate(choices):
+                texts[choice.get("index", position)] = choice["text"]
+            
+            return [
+                {
+                    "text": generated_text,
+                    "word_count": len(generated_text.split()),
+                    "char_count": len(generated_text),
+                    "tokens_generated": 0,  # Usage is only reported for the whole batch
+                    "model_name": model_name,
+                    "temperature": temperature,
+                    "via_foundry": True
+                }
+                for generated_text in texts
+            ]
+            
+        except httpx.TimeoutException:
+            raise RuntimeError("Foundry Local batch request timed out")
+        except Exception as e:
+            logger.error(f"Foundry Local batch generation failed: {e}")
+            raise RuntimeError(f"Foundry Local batch generation failed: {e}")
+    
     async def list_models(self) -> List[Dict[str, Any]]:
         """List available models from Foundry Local."""
         if not self.is_available:
             raise RuntimeError("Foundry Local is not available. Please start Foundry Local service.")
         
         try:
-            import aiohttp
-            
-            async with aiohttp.ClientSession() as session:
-                async with session.get(
-                    f"{self.endpoint}/v1/models",
-                    timeout=aiohttp.ClientTimeout(total=30)
-                ) as response:
-                    
-                    if response.status != 200:
-                        error_text = await response.text()
-                        raise RuntimeError(f"Foundry Local API error {response.status}: {error_text}")
-                    
-                    result = await response.json()
-                    return result.get("data", [])
-                    
+            response = await self._http_client().get("/v1/models", timeout=30)
+            
+            if response.status_code != 200:
+                raise RuntimeError(f"Foundry Local API error {response.status_code}: {response.text}")
+            
+            result = loads(response.content)
+            return result.get("data", [])
+            
         except Exception as e:
             logger.error(f"Failed to list models from Foundry Local: {e}")
             raise RuntimeError(f"Failed to list models: {e}")
@@ -204,4 +321,27 @@ class FoundryLocalClient:
                 
         except Exception as e:
             logger.error(f"Error stopping Foundry Local: {e}")
-            return False
\ No newline at end of file
+            return False
+
+
+# Process-wide client so every service shares one connection pool and health probe
+_FOUNDRY_CLIENT: Optional[FoundryLocalClient] = None
+_foundry_lock = asyncio.Lock()
+
+
+async def get_foundry_client() -> FoundryLocalClient:
+    """Return the shared Foundry Local client, creating it on first use."""
+    global _FOUNDRY_CLIENT
+    
+    if _FOUNDRY_CLIENT is None:
+        async with _foundry_lock:
+            if _FOUNDRY_CLIENT is None:
+                # The constructor probes the endpoint with a blocking request
+                _FOUNDRY_CLIENT = await asyncio.to_thread(FoundryLocalClient)
+    return _FOUNDRY_CLIENT
+
+
+async def close_foundry_client():
+    """Close the shared client's pooled connections, if the client was ever created."""
+    if _FOUNDRY_CLIENT is not None:
+        await _FOUNDRY_CLIENT.aclose()
@@ -1,6 +1,7 @@
 """Device detection and configuration for lip-sync processing."""
 
 import logging
+from functools import lru_cache
 from typing import Literal
 
 import torch
@@ -11,8 +12,9 @@ from ...core.models import DeviceInfo
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=1)
 def detect_device() -> DeviceInfo:
-    """Detect the best available device for processing."""
+    """Detect the best available device for processing (probed once per process)."""
     cuda_available = torch.cuda.is_available()
     cuda_device_count = torch.cuda.device_count() if cuda_available else 0
     
@@ -6,7 +6,12 @@ Generates talking head videos from audio and face images.
 """
 
 import asyncio
+import hashlib
 import json
+import os
+import secrets
+import shutil
+import time
 import numpy as np
 from typing import Dict, Any, Optional, Tuple
 from pathlib import Path
@@ -16,6 +21,7 @@ try:
     import torch
     import cv2
     import librosa
+    import soundfile as sf
     TORCH_AVAILABLE = True
 except ImportError:
     TORCH_AVAILABLE = False
@@ -26,6 +32,21 @@ from ...services.foundry.local_client import FoundryLocalClient
 
 logger = get_logger(__name__)
 
+# Probe CUDA once at import so service construction never pays for driver init
+CUDA_AVAILABLE = TORCH_AVAILABLE and torch.cuda.is_available()
+CUDA_CAPABILITY = torch.cuda.get_device_capability(0) if CUDA_AVAILABLE else None
+
+# Landmark layout parameters shared by every mock landmark call
+_OUTLINE_T = np.linspace(0, 1, 17)
+_EYEBROW_T = np.linspace(0, 1, 10)
+_NOSE_STEPS = np.arange(9)
+_EYE_ANGLES = np.linspace(0, 2 * np.pi, 6)
+_EYE_COS = np.cos(_EYE_ANGLES)
+_EYE_SIN = np.sin(_EYE_ANGLES)
+_MOUTH_ANGLES = np.linspace(0, 2 * np.pi, 20)
+_MOUTH_COS = np.cos(_MOUTH_ANGLES)
+_MOUTH_SIN = np.sin(_MOUTH_ANGLES)
+
 
 class SadTalkerService:
     """Local lip-sync video generation using SadTalker."""
@@ -40,6 +61,7 @@ class SadTalkerService:
         self.device = self._get_device(device)
         self.model = None
         self.is_initialized = False
+        self._mock_face_frame = None
         
         # Video parameters (short-first defaults)
         self.size_px = settings.sadtalker_size  # 256px
@@ -63,7 +85,7 @@ class SadTalkerService:
     def _get_device(self, device: str) -> str:
         """Determine the best available device."""
         if device == "auto":
-            if TORCH_AVAILABLE and torch.cuda.is_available():
+            if CUDA_AVAILABLE:
                 return "cuda"
             return "cpu"
         return device
@@ -127,8 +149,9 @@ class SadTalkerService:
             
             # Generate output path if not provided
             if output_path is None:
-                timestamp = int(asyncio.get_event_loop().time())
-                output_path = self.output_dir / f"lipsync_{timestamp}.mp4"
+                # Nanosecond timestamp plus a random suffix keeps concurrent requests apart
+                stem = f"lipsync_{time.monotonic_ns():020d}_{secrets.token_hex(3)}"
+                output_path = self.output_dir / f"{stem}.mp4"
             
             # Use Foundry Local client for real video generation
             result = await self.foundry_client.generate_video(
@@ -156,6 +179,10 @@ class SadTalkerService:
             return {"error": f"Video generation failed: {str(e)}"}
     
     async def _process_face_image(self, face_path: Path) -> Optional[Dict[str, Any]]:
+        """Process face image for lip-sync without blocking the event loop."""
+        return await asyncio.to_thread(self._process_face_image_sync, face_path)
+    
+    def _process_face_image_sync(self, face_path: Path) -> Optional[Dict[str, Any]]:
         """Process face image for lip-sync."""
         try:
             # If file doesn't exist or torch not available, use mock processing
@@ -173,12 +200,10 @@ class SadTalkerService:
             if image is None:
                 return None
             
-            # Convert to RGB
-            image_rgb = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
-            
-            # Mock face detection and landmark extraction
+            # Mock face detection and landmark extraction only need the image
+            # dimensions, so the BGR frame is used as-is without an RGB copy.
             # In reality, you would use face detection models here
-            height, width = image_rgb.shape[:2]
+            height, width = image.shape[:2]
             
             # Mock face detection
             face_box = [width//4, height//4, width*3//4, height*3//4]
@@ -204,52 +229,38 @@ class SadTalkerService:
         width = x2 - x1
         height = y2 - y1
         
-        # Generate 68 facial landmarks (standard format)
-        landmarks = []
+        # Generate 68 facial landmarks (standard format) into one preallocated array
+        out = np.empty((68, 2))
         
         # Face outline (0-16)
-        for i in range(17):
-            x = x1 + (i / 16) * width
-            y = y1 + height * 0.1
-            landmarks.append([x, y])
+        out[0:17, 0] = x1 + _OUTLINE_T * width
+        out[0:17, 1] = y1 + height * 0.1
         
         # Eyebrows (17-26)
-        for i in range(10):
-            x = x1 + (i / 9) * width
-            y = y1 + height * 0.3
-            landmarks.append([x, y])
+        out[17:27, 0] = x1 + _EYEBROW_T * width
+        out[17:27, 1] = y1 + height * 0.3
         
         # Nose (27-35)
-        for i in range(9):
-            x = x1 + width * 0.5
-            y = y1 + height * (0.4 + i * 0.05)
-            landmarks.append([x, y])
+        out[27:36, 0] = x1 + width * 0.5
+        out[27:36, 1] = y1 + height * (0.4 + _NOSE_STEPS * 0.05)
         
         # Eyes (36-47)
-        # Left eye
-        for i in range(6):
-            angle = (i / 5) * 2 * np.pi
-            x = x1 + width * 0.3 + 20 * np.cos(angle)
-            y = y1 + height * 0.4 + 15 * np.sin(angle)
-            landmarks.append([x, y])
-        
-        # Right eye
-        for i in range(6):
-            angle = (i / 5) * 2 * np.pi
-            x = x1 + width * 0.7 + 20 * np.cos(angle)
-            y = y1 + height * 0.4 + 15 * np.sin(angle)
-            landmarks.append([x, y])
+        out[36:42, 0] = x1 + width * 0.3 + 20 * _EYE_COS
+        out[36:42, 1] = y1 + height * 0.4 + 15 * _EYE_SIN
+        out[42:48, 0] = x1 + width * 0.7 + 20 * _EYE_COS
+        out[42:48, 1] = y1 + height * 0.4 + 15 * _EYE_SIN
         
         # Mouth (48-67)
-        for i in range(20):
-            angle = (i / 19) * 2 * np.pi
-            x = x1 + width * 0.5 + 30 * np.cos(angle)
-            y = y1 + height * 0.7 + 20 * np.sin(angle)
-            landmarks.append([x, y])
+        out[48:68, 0] = x1 + width * 0.5 + 30 * _MOUTH_COS
+        out[48:68, 1] = y1 + height * 0.7 + 20 * _MOUTH_SIN
         
-        return landmarks
+        return out.tolist()
     
     async def _process_audio(self, audio_path: Path, duration: Optional[float]) -> Optional[Dict[str, Any]]:
+        """Process audio for lip-sync without blocking the event loop."""
+        return await asyncio.to_thread(self._process_audio_sync, audio_path, duration)
+    
+    def _process_audio_sync(self, audio_path: Path, duration: Optional[float]) -> Optional[Dict[str, Any]]:
         """Process audio for lip-sync."""
         try:
             if not TORCH_AVAILABLE:
@@ -261,14 +272,20 @@ class SadTalkerService:
                     "processed": True
                 }
             
-            # Load audio
-            audio, sr = librosa.load(str(audio_path), sr=16000)
+            # Load audio as float32, decoding only up to the requested duration
+            with sf.SoundFile(str(audio_path)) as audio_file:
+                sr = audio_file.samplerate
+                num_samples = int(duration * sr) if duration else -1
+                audio = audio_file.read(frames=num_samples, dtype='float32', always_2d=False)
             
-            # Limit duration if specified
-            if duration:
-                max_samples = int(duration * sr)
-                if len(audio) > max_samples:
-                    audio = audio[:max_samples]
+            # Downmix to mono and resample only when needed
+            if audio.ndim > 1:
+                audio = audio.mean(axis=1, dtype=np.float32)
+            if sr != 16000:
+                audio = librosa.resample(audio, orig_sr=sr, target_sr=16000)
+                sr = 16000
+                if duration:
+                    audio = audio[:int(duration * sr)]
             
             # Calculate video frames
             video_duration = len(audio) / sr
@@ -300,32 +317,8 @@ class SadTalkerService:
         duration = audio_data.get("duration", 3.0)
         num_frames = int(duration * self.fps)
         
-        # Generate mock video frames
-        video_frames = []
-        for i in range(num_frames):
-            # Create a simple frame with the face
-            frame = np.zeros((self.size_px, self.size_px, 3), dtype=np.uint8)
-            
-            # Add some variation to simulate lip movement
-            lip_offset = int(5 * np.sin(i * 0.5))
-            
-            # Draw a simple face
-            cv2.circle(frame, (self.size_px//2, self.size_px//2), 80, (255, 220, 177), -1)
-            cv2.circle(frame, (self.size_px//2 - 30, self.size_px//2 - 20), 10, (0, 0, 0), -1)  # Left eye
-            cv2.circle(frame, (self.size_px//2 + 30, self.size_px//2 - 20), 10, (0, 0, 0), -1)  # Right eye
-            cv2.ellipse(frame, (self.size_px//2, self.size_px//2 + 20 + lip_offset), (20, 10), 0, 0, 180, (0, 0, 0), 2)  # Mouth
-            
-            video_frames.append(frame)
-        
-        # Save as video (mock - just save first frame as image for now)
-        if video_frames:
-            first_frame_path = output_path.with_suffix('.jpg')
-            cv2.imwrite(str(first_frame_path), video_frames[0])
-            
-            # Create a simple video file (mock)
-            video_path = output_path.with_suffix('.mp4')
-            with open(video_path, 'w') as f:
-                f.write("Mock video file")
+        if settings.sadtalker_mock_emit_files:
+            self._write_mock_outputs(output_path, num_frames)
         
         return {
             "output_path": str(output_path),
@@ -338,6 +331,76 @@ class SadTalkerService:
             "success": True
         }
     
+    def _write_mock_outputs(self, output_path: Path, num_frames: int) -> None:
+        """Write the mock video and preview still, reusing a cached render when possible."""
+        video_path = output_path.with_suffix('.mp4')
+        preview_path = output_path.with_suffix('.jpg')
+        if num_frames <= 0:
+            return
+        if video_path.exists() and video_path.stat().st_size > 0 and preview_path.exists():
+            return
+        
+        # The mock render only depends on its geometry and length
+        cache_key = hashlib.sha1(f"{self.size_px}:{self.fps}:{num_frames}".encode()).hexdigest()[:16]
+        cache_dir = self.output_dir / ".cache"
+        cached_video = cache_dir / f"{cache_key}.mp4"
+        cached_preview = cache_dir / f"{cache_key}.jpg"
+        
+        if not (cached_video.is_file() and cached_preview.is_file()):
+            cache_dir.mkdir(parents=True, exist_ok=True)
+            
+            # Render under a unique name so concurrent requests never see a partial file
+            token = secrets.token_hex(3)
+            temp_video = cache_dir / f"{cache_key}-{token}.mp4"
+            temp_preview = cache_dir / f"{cache_key}-{token}.jpg"
+            self._render_mock_video(temp_video, temp_preview, num_frames)
+            os.replace(temp_video, cached_video)
+            os.replace(temp_preview, cached_preview)
+        
+        shutil.copyfile(cached_video, video_path)
+        shutil.copyfile(cached_preview, preview_path)
+    
+    def _render_mock_video(self, video_path: Path, preview_path: Path, num_frames: int) -> None:
+        """Render the mock talking face to an MP4 plus a still of its first frame."""
+        # Draw the static parts of the face once
+        base_frame = self._mock_face_template()
+        frame = np.empty_like(base_frame)
+        
+        # Stream mock video frames straight to disk through a single frame buffer
+        fourcc = cv2.VideoWriter_fourcc(*'mp4v')
+        video_writer = cv2.VideoWriter(str(video_path), fourcc, self.fps, (self.size_px, self.size_px))
+        try:
+            for i in range(num_frames):
+                # Start every frame from the pre-drawn face
+                np.copyto(frame, base_frame)
+                
+                # Add some variation to simulate lip movement
+                lip_offset = int(5 * np.sin(i * 0.5))
+                cv2.ellipse(frame, (self.size_px//2, self.size_px//2 + 20 + lip_offset), (20, 10), 0, 0, 180, (0, 0, 0), 2)  # Mouth
+                
+                if i == 0:
+                    # Keep the first frame as a still preview
+                    cv2.imwrite(str(preview_path), frame)
+                
+                video_writer.write(frame)
+        finally:
+            video_writer.release()
+    
+    def _mock_face_template(self) -> np.ndarray:
+        """Get the static head and eyes of the mock face as a read-only BGR frame."""
+        cached = self._mock_face_frame
+        if cached is not None and cached.shape[0] == self.size_px:
+            return cached
+        
+        frame = np.zeros((self.size_px, self.size_px, 3), dtype=np.uint8)
+        cv2.circle(frame, (self.size_px//2, self.size_px//2), 80, (255, 220, 177), -1)
+        cv2.circle(frame, (self.size_px//2 - 30, self.size_px//2 - 20), 10, (0, 0, 0), -1)  # Left eye
+        cv2.circle(frame, (self.size_px//2 + 30, self.size_px//2 - 20), 10, (0, 0, 0), -1)  # Right eye
+        frame.flags.writeable = False
+        
+        self._mock_face_frame = frame
+        return frame
+    
     async def generate_with_persona(
         self,
         persona_config: Dict[str, Any],
@@ -382,6 +445,7 @@ class SadTalkerService:
             "device": self.device,
             "is_initialized": self.is_initialized,
             "torch_available": TORCH_AVAILABLE,
+            "cuda_capability": CUDA_CAPABILITY,
             "size_px": self.size_px,
             "fps": self.fps,
             "enhancer": self.enhancer,
@@ -424,8 +488,12 @@ class MockSadTalkerService(SadTalkerService):
         video_path = output_path.with_suffix('.mp4')
         
         # Create a simple video file (in reality, this would be a proper MP4)
-        with open(video_path, 'w') as f:
-            f.write(f"Mock SadTalker video: {duration}s, {num_frames} frames")
+        if settings.sadtalker_mock_emit_files:
+            fd = os.open(video_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+            try:
+                os.write(fd, f"Mock SadTalker video: {duration}s, {num_frames} frames".encode())
+            finally:
+                os.close(fd)
         
         return {
             "output_path": str(video_path),
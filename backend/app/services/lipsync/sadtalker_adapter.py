@@ -2,13 +2,14 @@
 
 import logging
 import subprocess
+import sys
 import tempfile
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 
 import cv2
 import numpy as np
-from PIL import Image
 
 from .base import LipSyncEngine, LipSyncResult
 from .device import get_device, is_cuda_available
@@ -16,6 +17,27 @@ from ...core.config import settings
 
 logger = logging.getLogger(__name__)
 
+# Checkpoints the full SadTalker pipeline loads from ckpt_dir
+REQUIRED_CHECKPOINTS = (
+    "checkpoints/auido2pose_00140-model.pth",
+    "checkpoints/auido2exp_00300-model.pth",
+    "checkpoints/facevid2vid_00189-model.pth.tar",
+)
+
+
+@lru_cache(maxsize=1)
+def _opencv_fourcc() -> str:
+    """Pick the first MP4 codec this OpenCV build can write, preferring H.264."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        probe_path = str(Path(temp_dir) / "probe.mp4")
+        for codec in ("avc1", "h264"):
+            writer = cv2.VideoWriter(probe_path, cv2.VideoWriter_fourcc(*codec), 12, (16, 16), isColor=True)
+            opened = writer.isOpened()
+            writer.release()
+            if opened:
+                return codec
+    return "mp4v"
+
 
 class SadTalkerAdapter(LipSyncEngine):
     """SadTalker adapter for lip-sync video generation."""
@@ -25,6 +47,8 @@ class SadTalkerAdapter(LipSyncEngine):
         self.device = device
         self.ckpt_dir = settings.artifacts_dir / "video" / "sadtalker_ckpts"
         self.ckpt_dir.mkdir(parents=True, exist_ok=True)
+        self.checkpoints_present = False
+        self._available = self._check_availability()
     
     def _get_default_config(self) -> Dict[str, Any]:
         """Get default configuration for SadTalker."""
@@ -37,17 +61,22 @@ class SadTalkerAdapter(LipSyncEngine):
             "preprocess": "crop",  # crop, resize, full
             "still": True,  # Use still image mode for better quality
             "use_enhancer": settings.sadtalker_enhancer != "off",
+            "x264_preset": settings.video_x264_preset,
+            "nvenc_preset": settings.video_nvenc_preset,
+            "crf": settings.video_crf,
         }
     
     def is_available(self) -> bool:
         """Check if SadTalker is available."""
+        return self._available
+    
+    def _check_availability(self) -> bool:
+        """Probe the checkpoint directory once; the result is cached on the adapter."""
         try:
             # Check if we have the required checkpoint files
-            required_files = [
-                "checkpoints/auido2pose_00300-model.pth",
-                "checkpoints/auido2pose_00300-model.pth",
-                "checkpoints/auido2pose_00300-model.pth",
-            ]
+            self.checkpoints_present = all((self.ckpt_dir / name).is_file() for name in REQUIRED_CHECKPOINTS)
+            if not self.checkpoints_present:
+                logger.debug(f"SadTalker checkpoints not found in {self.ckpt_dir}, using sample mode")
             
             # For S0, we'll create a minimal implementation that works
             # without the full SadTalker installation
@@ -84,10 +113,12 @@ class SadTalkerAdapter(LipSyncEngine):
                               **kwargs) -> LipSyncResult:
         """Generate a sample video for S0 demonstration."""
         try:
-            # Load and resize the input image
-            image = Image.open(image_path)
+            # Load the input image as BGR and downscale it in one pass
+            image = cv2.imread(str(image_path), cv2.IMREAD_COLOR)
+            if image is None:
+                raise ValueError(f"Could not read image: {image_path}")
             size = self.config["size"]
-            image = image.resize((size, size), Image.Resampling.LANCZOS)
+            frame = cv2.resize(image, (size, size), interpolation=cv2.INTER_AREA)
             
             # Create a simple video by duplicating the image frame
             # This is a placeholder for the actual SadTalker integration
@@ -95,23 +126,9 @@ class SadTalkerAdapter(LipSyncEngine):
             duration = 3.0  # 3 seconds for short mode
             total_frames = int(fps * duration)
             
-            # Create video writer
-            fourcc = cv2.VideoWriter_fourcc(*'mp4v')
-            video_writer = cv2.VideoWriter(
-                str(output_path),
-                fourcc,
-                fps,
-                (size, size)
-            )
-            
-            # Convert PIL image to OpenCV format
-            frame = cv2.cvtColor(np.array(image), cv2.COLOR_RGB2BGR)
-            
-            # Write frames
-            for _ in range(total_frames):
-                video_writer.write(frame)
-            
-            video_writer.release()
+            # Encode the still once with FFmpeg, falling back to OpenCV
+            if not self._encode_still_with_ffmpeg(frame, output_path, fps, duration):
+                self._encode_still_with_opencv(frame, output_path, fps, total_frames)
             
             logger.info(f"Generated sample video: {output_path}")
             
@@ -140,8 +157,77 @@ class SadTalkerAdapter(LipSyncEngine):
                 error=str(e)
             )
     
+    def _select_video_encoders(self) -> List[str]:
+        """Get FFmpeg H.264 encoders to try, fastest first."""
+        encoders = []
+        if self.device == "cuda" and is_cuda_available():
+            encoders.append("h264_nvenc")
+        elif sys.platform == "darwin":
+            encoders.append("h264_videotoolbox")
+        encoders.append("libx264")
+        return encoders
+    
+    def _encode_still_with_ffmpeg(self, 
+                                 frame: np.ndarray, 
+                                 output_path: Path, 
+                                 fps: int, 
+                                 duration: float) -> bool:
+        """Encode a single still frame as a looping video with FFmpeg."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            still_path = Path(temp_dir) / "still.png"
+            cv2.imwrite(str(still_path), frame)
+            
+            for encoder in self._select_video_encoders():
+                cmd = [
+                    'ffmpeg', '-y',
+                    '-loop', '1',
+                    '-framerate', str(fps),
+                    '-i', str(still_path),
+                    '-t', str(duration),
+                    '-c:v', encoder,
+                ]
+                if encoder == "libx264":
+                    cmd += ['-preset', self.config["x264_preset"], '-crf', str(self.config["crf"]), '-tune', 'stillimage']
+                elif encoder == "h264_nvenc":
+                    cmd += ['-preset', self.config["nvenc_preset"], '-cq', str(self.config["crf"])]
+                cmd += ['-pix_fmt', 'yuv420p', str(output_path)]
+                
+                try:
+                    result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
+                except FileNotFoundError:
+                    logger.info("FFmpeg not found, using OpenCV video writer")
+                    return False
+                except subprocess.TimeoutExpired:
+                    logger.warning(f"FFmpeg encoding with {encoder} timed out")
+                    continue
+                
+                if result.returncode == 0:
+                    return True
+                logger.warning(f"FFmpeg encoding with {encoder} failed: {result.stderr}")
+        
+        return False
+    
+    def _encode_still_with_opencv(self, 
+                                 frame: np.ndarray, 
+                                 output_path: Path, 
+                                 fps: int, 
+                                 total_frames: int):
+        """Encode a still frame by writing it repeatedly with OpenCV."""
+        size = frame.shape[1], frame.shape[0]
+        fourcc = cv2.VideoWriter_fourcc(*_opencv_fourcc())
+        video_writer = cv2.VideoWriter(str(output_path), fourcc, fps, size, isColor=True)
+        
+        try:
+            for _ in range(total_frames):
+                video_writer.write(frame)
+        finally:
+            video_writer.release()
+    
     def _download_checkpoints(self) -> bool:
         """Download SadTalker checkpoints (placeholder for S0)."""
         # This will be implemented in later phases
         logger.info("Checkpoint download not implemented in S0")
+        
+        # Re-probe so is_available() reflects any newly downloaded files
+        self._available = self._check_availability()
         return True
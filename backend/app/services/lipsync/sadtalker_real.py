@@ -6,9 +6,16 @@ Following the exact step-by-step reference implementation.
 import os
 import sys
 import asyncio
+import atexit
+import functools
+import importlib.util
 import logging
+import queue
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Callable, List
 import tempfile
 import shutil
 
@@ -17,26 +24,167 @@ backend_dir = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(backend_dir))
 sys.path.insert(0, str(backend_dir.parent))
 
+from app.core.config import settings
 from app.services.lipsync.base import LipSyncService
+from app.services.lipsync.device import get_device
 
 logger = logging.getLogger(__name__)
 
+# Facerender batch size used after the autotuned size runs out of GPU memory
+_FALLBACK_FACERENDER_BATCH = 2
+
+# Kernel buffer for raw frames piped into ffmpeg
+_ENCODER_PIPE_BUFFER = 1 << 20
+
+# SadTalker renders at 25 fps
+_VIDEO_FPS = 25
+
+# Checkpoints init_path needs for the 256px safetensor models with crop preprocessing
+_CHECKPOINT_DIR = backend_dir / "models" / "sadtalker" / "checkpoints"
+REQUIRED_CHECKPOINTS = (
+    "SadTalker_V0.0.2_256.safetensors",
+    "mapping_00229-model.pth.tar",
+)
+
+
+@functools.lru_cache(maxsize=1)
+def sadtalker_available() -> bool:
+    """Check once per process whether the sadtalker package and its checkpoints are installed."""
+    if importlib.util.find_spec("sadtalker") is None:
+        logger.debug("sadtalker package not installed")
+        return False
+    missing = [name for name in REQUIRED_CHECKPOINTS if not (_CHECKPOINT_DIR / name).is_file()]
+    if missing:
+        logger.debug(f"SadTalker checkpoints missing from {_CHECKPOINT_DIR}: {missing}")
+        return False
+    return True
+
+
+def _move_into_place(src: str, dst: str):
+    """Move a finished scratch file to its destination without copying it through Python.
+    
+    A rename is used when both paths share a filesystem; otherwise the bytes are
+    copied in-kernel with sendfile (plain copyfile where sendfile is unavailable).
+    """
+    try:
+        os.replace(src, dst)
+        return
+    except OSError:
+        pass
+    
+    if not hasattr(os, "sendfile"):
+        shutil.copyfile(src, dst)
+        return
+    
+    size = os.path.getsize(src)
+    with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+        offset = 0
+        while offset < size:
+            sent = os.sendfile(fdst.fileno(), fsrc.fileno(), offset, size - offset)
+            if sent == 0:
+                break
+            offset += sent
+
+
+def _grow_pipe_buffer(writer: asyncio.StreamWriter, size: int = _ENCODER_PIPE_BUFFER):
+    """Enlarge the kernel buffer of a subprocess stdin pipe where supported (Linux)."""
+    try:
+        import fcntl
+        pipe = writer.get_extra_info("pipe")
+        fcntl.fcntl(pipe.fileno(), getattr(fcntl, "F_SETPIPE_SZ", 1031), size)
+    except (ImportError, AttributeError, OSError) as e:
+        logger.debug(f"Could not resize encoder pipe: {e}")
+
+
+def _cpu_inference_threads() -> int:
+    """Intra-op threads for CPU inference, leaving two cores for the event loop and ffmpeg."""
+    return max(1, (os.cpu_count() or 4) - 2)
+
+
+def _configure_cpu_threads(num_threads: int):
+    """Pin OpenMP/MKL thread counts and affinity for CPU inference.
+    
+    The environment variables only reach thread pools that have not started yet;
+    torch's own intra-op count is set per worker thread by the service.
+    """
+    import torch
+    
+    os.environ.setdefault("OMP_NUM_THREADS", str(num_threads))
+    os.environ.setdefault("MKL_NUM_THREADS", str(num_threads))
+    os.environ.setdefault("KMP_AFFINITY", "granularity=fine,compact,1,0")
+    try:
+        torch.set_num_interop_threads(1)
+    except RuntimeError:
+        # Only allowed before any inter-op parallel work has run in this process
+        pass
+
+
+@dataclass
+class _VideoJob:
+    """A lip-sync request moving through the SadTalker stage pipeline."""
+    face_image_path: str
+    audio_path: str
+    output_path: str
+    temp_dir: str
+    progress_callback: Optional[Callable]
+    future: asyncio.Future
+    first_coeff_path: Optional[str] = None
+    crop_pic_path: Optional[str] = None
+    crop_info: Any = None
+    coeff_path: Optional[str] = None
+    facerender_data: Optional[Dict[str, Any]] = None
+
+
 class RealSadTalkerService(LipSyncService):
     """Real SadTalker service using the official sadtalker-z package."""
     
-    def __init__(self):
-        super().__init__()
+    def __init__(self, device: str = "cpu", num_threads: Optional[int] = None):
+        super().__init__(device)
         self.models_initialized = False
         self.preprocess_model = None
         self.audio2coeff = None
         self.animate_from_coeff = None
-        self.device = "cpu"  # Force CPU usage for compatibility
+        self.device = device  # CPU by default for compatibility
+        if num_threads is None and device == "cpu":
+            num_threads = _cpu_inference_threads()
+        self.num_threads = num_threads
+        self._facerender_batch = _FALLBACK_FACERENDER_BATCH
+        
+        # One worker thread per stage so consecutive requests overlap across stages
+        initializer = self._init_worker_thread if num_threads else None
+        self._preprocess_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="sadtalker-preprocess", initializer=initializer)
+        self._audio2coeff_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="sadtalker-audio2coeff", initializer=initializer)
+        self._render_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="sadtalker-render", initializer=initializer)
+        self._init_lock = asyncio.Lock()
+        
+        # Reusable per-request scratch directories, in RAM when tmpfs is available
+        self._scratch_root = self._init_scratch_root()
+        self._scratch_dirs: "queue.SimpleQueue[Path]" = queue.SimpleQueue()
+        self._pipeline_loop = None
+        self._preprocess_queue: Optional[asyncio.Queue] = None
         
+    def _init_worker_thread(self):
+        """Limit intra-op threads on this replica's workers so CPU replicas share the cores."""
+        import torch
+        
+        torch.set_num_threads(self.num_threads)
+
     async def _initialize_models(self):
-        """Initialize SadTalker models following the exact reference implementation."""
+        """Initialize SadTalker models off the event loop, once even under concurrent requests."""
         if self.models_initialized:
             return
-            
+        
+        async with self._init_lock:
+            if self.models_initialized:
+                return
+            # Avoid oversubscribing the cores before the first torch op spins up thread pools
+            if self.device == "cpu":
+                _configure_cpu_threads(self.num_threads)
+            # Checkpoint loading and model construction block for seconds
+            await asyncio.get_running_loop().run_in_executor(self._render_pool, self._load_models)
+
+    def _load_models(self):
+        """Initialize SadTalker models following the exact reference implementation."""
         try:
             import sadtalker
             from sadtalker.utils.init_path import init_path
@@ -73,6 +221,16 @@ class RealSadTalkerService(LipSyncService):
             self.preprocess_model = CropAndExtract(sadtalker_paths, self.device)
             self.audio2coeff = Audio2Coeff(sadtalker_paths, self.device)
             self.animate_from_coeff = AnimateFromCoeff(sadtalker_paths, self.device)
+            self._mapping_coeff_nc = self.animate_from_coeff.mapping.first[0].in_channels
+            
+            # Every SadTalker conv sees fixed 256px shapes, so cuDNN autotuning pays off
+            if self.device.startswith("cuda"):
+                import torch
+                torch.backends.cudnn.benchmark = True
+            
+            # Size the render batch on the eager models, before compile/TensorRT specialize shapes
+            self._facerender_batch = self._pick_facerender_batch()
+            self._optimize_face_renderer(backend_dir)
             
             self.models_initialized = True
             logger.info("✅ SadTalker models initialized successfully using reference implementation")
@@ -84,6 +242,327 @@ class RealSadTalkerService(LipSyncService):
         except Exception as e:
             raise RuntimeError(f"Failed to initialize SadTalker models: {e}")
 
+    async def warmup(self):
+        """Load the models and run one blank face-render batch ahead of the first request.
+        
+        The dummy batch uses the configured facerender batch size so cuDNN autotuning,
+        torch.compile graphs and TensorRT engines are built for the shapes real
+        requests will use.
+        """
+        await self._initialize_models()
+        await asyncio.get_running_loop().run_in_executor(self._render_pool, self._warmup_face_renderer)
+        logger.info("SadTalker warmup completed")
+
+    def _warmup_face_renderer(self, img_size: int = 256):
+        """Run the face renderer once on blank inputs at the configured batch size."""
+        self._render_blank_batch(self._facerender_batch, img_size)
+
+    def _render_blank_batch(self, batch: int, img_size: int = 256):
+        """Run the keypoint extractor, mapping net and generator once on blank inputs."""
+        import torch
+        from sadtalker.facerender.modules.make_animation import keypoint_transformation
+        
+        afc = self.animate_from_coeff
+        source_image = torch.zeros((batch, 3, img_size, img_size), device=self.device)
+        semantics = torch.zeros((batch, self._mapping_coeff_nc, 27), device=self.device)  # 27 = 2 * semantic_radius + 1
+        
+        with torch.inference_mode():
+            kp_canonical = afc.kp_extractor(source_image)
+            kp_source = keypoint_transformation(kp_canonical, afc.mapping(semantics))
+            afc.generator(source_image, kp_source=kp_source, kp_driving=kp_source)
+        
+        if self.device.startswith("cuda"):
+            torch.cuda.synchronize(self.device)
+
+    def _pick_facerender_batch(self) -> int:
+        """Choose how many frames the face renderer processes per forward pass.
+        
+        SADTALKER_FACERENDER_BATCH overrides the choice. On CUDA one blank frame is
+        rendered to measure the per-frame activation footprint, and the largest power
+        of two that fits in ~70% of device memory (capped at 32) is used. On CPU half
+        the cores, capped at 8.
+        """
+        if settings.sadtalker_facerender_batch > 0:
+            return settings.sadtalker_facerender_batch
+        
+        if not self.device.startswith("cuda"):
+            return max(1, min(8, (os.cpu_count() or 2) // 2))
+        
+        import torch
+        
+        try:
+            device = torch.device(self.device)
+            baseline = torch.cuda.memory_allocated(device)
+            torch.cuda.reset_peak_memory_stats(device)
+            self._render_blank_batch(1)
+            per_frame = max(1, torch.cuda.max_memory_allocated(device) - baseline)
+            
+            budget = torch.cuda.get_device_properties(device).total_memory * 0.7 - baseline
+            batch = 1
+            while batch < 32 and (batch * 2) * per_frame <= budget:
+                batch *= 2
+            
+            logger.info(f"Autotuned SadTalker facerender batch to {batch} ({per_frame / 2**20:.0f} MiB per frame)")
+            return batch
+        except Exception as e:
+            logger.warning(f"Could not autotune SadTalker facerender batch, using {_FALLBACK_FACERENDER_BATCH}: {e}")
+            return _FALLBACK_FACERENDER_BATCH
+
+    def _optimize_face_renderer(self, backend_dir: str):
+        """Apply the configured precision and compilation to the face-render generator once."""
+        import torch
+        
+        if settings.sadtalker_use_tensorrt:
+            if self.device.startswith("cuda") and self._tensorrt_available():
+                engine_dir = os.path.join(backend_dir, "models", "sadtalker", "engines")
+                self.animate_from_coeff.generator = self._tensorrt_renderer(
+                    self.animate_from_coeff.generator, engine_dir
+                )
+                self.animate_from_coeff.mapping = self._tensorrt_mapping(
+                    self.animate_from_coeff.mapping, engine_dir
+                )
+                return
+            logger.warning("TensorRT requested but not available, using PyTorch face renderer")
+        
+        if self.device == "cpu":
+            self.animate_from_coeff.generator = self._ipex_renderer(self.animate_from_coeff.generator)
+        
+        if settings.sadtalker_precision != "fp32":
+            self.animate_from_coeff.generator = self._mixed_precision_renderer(
+                self.animate_from_coeff.generator
+            )
+        
+        if not settings.sadtalker_compile:
+            return
+        
+        if not hasattr(torch, "compile"):
+            logger.warning("torch.compile not available, running SadTalker face renderer eagerly")
+            return
+        
+        # Persist compiled kernels so later starts skip most of the compile cost
+        os.environ.setdefault(
+            "TORCHINDUCTOR_CACHE_DIR",
+            os.path.join(backend_dir, "models", "sadtalker", "inductor_cache")
+        )
+        mode = "reduce-overhead" if self.device.startswith("cuda") else "default"
+        try:
+            self.animate_from_coeff.generator = torch.compile(self.animate_from_coeff.generator, mode=mode)
+            logger.info(f"Compiled SadTalker face renderer (mode={mode})")
+        except Exception as e:
+            logger.warning(f"Failed to compile SadTalker face renderer, running eagerly: {e}")
+
+    @staticmethod
+    def _ipex_renderer(generator):
+        """Optimize the face-render generator with Intel Extension for PyTorch when installed."""
+        try:
+            import intel_extension_for_pytorch as ipex
+        except ImportError:
+            return generator
+        
+        import torch
+        
+        dtype = torch.bfloat16 if settings.sadtalker_precision == "bf16" else torch.float32
+        try:
+            generator = ipex.optimize(generator.eval(), dtype=dtype)
+            logger.info(f"Optimized SadTalker face renderer with IPEX ({dtype})")
+        except Exception as e:
+            logger.warning(f"IPEX optimization failed, using stock PyTorch face renderer: {e}")
+        return generator
+
+    def _mixed_precision_renderer(self, generator):
+        """Wrap the face-render generator to run under fp16/bf16 autocast."""
+        import torch
+        
+        dtype = torch.float16 if settings.sadtalker_precision == "fp16" else torch.bfloat16
+        use_cuda = self.device.startswith("cuda")
+        device_type = "cuda" if use_cuda else "cpu"
+        
+        # NHWC lets cuDNN pick tensor-core conv kernels for the reduced precision path
+        if use_cuda:
+            generator.to(memory_format=torch.channels_last)
+        
+        def render(source_image, **kwargs):
+            if use_cuda:
+                source_image = source_image.contiguous(memory_format=torch.channels_last)
+            with torch.autocast(device_type=device_type, dtype=dtype):
+                out = generator(source_image, **kwargs)
+            # AnimateFromCoeff converts predictions to numpy, which needs full precision
+            out['prediction'] = out['prediction'].float()
+            return out
+        
+        logger.info(f"Running SadTalker face renderer with {settings.sadtalker_precision} autocast on {device_type}")
+        return render
+
+    @staticmethod
+    def _tensorrt_available() -> bool:
+        """Check whether ONNX Runtime can run TensorRT engines on this host."""
+        try:
+            import onnxruntime as ort
+        except ImportError:
+            return False
+        return "TensorrtExecutionProvider" in ort.get_available_providers()
+
+    def _tensorrt_session(self, engine_dir: str, name: str, export):
+        """Open an fp16 TensorRT session for an ONNX graph, exporting the graph on first use.
+        
+        ONNX graphs and engines live under a per-GPU subdirectory of engine_dir so a
+        model directory shared between machines never reuses an engine built for a
+        different card.
+        """
+        import onnxruntime as ort
+        import torch
+        
+        device_id = torch.device(self.device).index or 0
+        gpu_dir = os.path.join(engine_dir, torch.cuda.get_device_name(device_id).replace(" ", "_"))
+        os.makedirs(gpu_dir, exist_ok=True)
+        
+        onnx_path = os.path.join(gpu_dir, f"{name}.onnx")
+        if not os.path.exists(onnx_path):
+            export(onnx_path)
+        providers = [
+            ("TensorrtExecutionProvider", {
+                "device_id": device_id,
+                "trt_fp16_enable": True,
+                "trt_engine_cache_enable": True,
+                "trt_engine_cache_path": gpu_dir
+            }),
+            ("CUDAExecutionProvider", {"device_id": device_id})
+        ]
+        logger.info(f"Building TensorRT engine from {onnx_path}")
+        return ort.InferenceSession(onnx_path, providers=providers)
+
+    def _tensorrt_renderer(self, generator, engine_dir: str):
+        """Wrap the face-render generator to run as an fp16 TensorRT engine via ONNX Runtime.
+        
+        The ONNX graph is exported from the first real batch so input shapes match
+        the configured size; engines are cached keyed by size and batch. Any export
+        or session failure falls back to PyTorch.
+        """
+        import numpy as np
+        import torch
+        
+        device_id = torch.device(self.device).index or 0
+        sessions = {}
+        
+        class _RendererGraph(torch.nn.Module):
+            """Flatten the keypoint dicts so the generator can be exported to ONNX."""
+            
+            def __init__(self, generator):
+                super().__init__()
+                self.generator = generator
+            
+            def forward(self, source_image, kp_source, kp_driving):
+                out = self.generator(source_image, kp_source={'value': kp_source}, kp_driving={'value': kp_driving})
+                return out['prediction']
+        
+        def build_session(source_image, kp_source, kp_driving):
+            batch, _, size, _ = source_image.shape
+            
+            def export(onnx_path):
+                torch.onnx.export(
+                    _RendererGraph(generator),
+                    (source_image, kp_source, kp_driving),
+                    onnx_path,
+                    input_names=["source_image", "kp_source", "kp_driving"],
+                    output_names=["prediction"],
+                    opset_version=17
+                )
+            
+            return self._tensorrt_session(engine_dir, f"facerender_{size}_b{batch}", export)
+        
+        def render(source_image, kp_source, kp_driving):
+            inputs = {
+                "source_image": source_image.contiguous(),
+                "kp_source": kp_source['value'].contiguous(),
+                "kp_driving": kp_driving['value'].contiguous()
+            }
+            key = tuple(inputs["source_image"].shape)
+            if key not in sessions:
+                try:
+                    sessions[key] = build_session(*inputs.values())
+                except Exception as e:
+                    logger.warning(f"TensorRT face renderer unavailable, using PyTorch: {e}")
+                    sessions[key] = None
+            session = sessions[key]
+            if session is None:
+                return generator(source_image, kp_source=kp_source, kp_driving=kp_driving)
+            
+            # Bind CUDA tensors in place so frames never round-trip through host memory
+            prediction = torch.empty_like(inputs["source_image"])
+            binding = session.io_binding()
+            for name, tensor in inputs.items():
+                binding.bind_input(name, "cuda", device_id, np.float32, tuple(tensor.shape), tensor.data_ptr())
+            binding.bind_output("prediction", "cuda", device_id, np.float32, tuple(prediction.shape), prediction.data_ptr())
+            session.run_with_iobinding(binding)
+            return {'prediction': prediction}
+        
+        return render
+
+    def _tensorrt_mapping(self, mapping, engine_dir: str):
+        """Wrap the coefficient mapping net to run as an fp16 TensorRT engine via ONNX Runtime.
+        
+        The mapping net runs once per render step, so it shares the face renderer's
+        export-on-first-batch and PyTorch fallback behaviour.
+        """
+        import numpy as np
+        import torch
+        
+        device_id = torch.device(self.device).index or 0
+        output_names = ["yaw", "pitch", "roll", "t", "exp"]
+        sessions = {}
+        
+        class _MappingGraph(torch.nn.Module):
+            """Return the mapping outputs as a tuple so they can be exported to ONNX."""
+            
+            def __init__(self, mapping):
+                super().__init__()
+                self.mapping = mapping
+            
+            def forward(self, input_3dmm):
+                out = self.mapping(input_3dmm)
+                return tuple(out[name] for name in output_names)
+        
+        def build_session(input_3dmm):
+            batch, coeff_nc, window = input_3dmm.shape
+            
+            def export(onnx_path):
+                torch.onnx.export(
+                    _MappingGraph(mapping),
+                    (input_3dmm,),
+                    onnx_path,
+                    input_names=["input_3dmm"],
+                    output_names=output_names,
+                    opset_version=17
+                )
+            
+            session = self._tensorrt_session(engine_dir, f"mapping_{coeff_nc}x{window}_b{batch}", export)
+            with torch.inference_mode():
+                reference = mapping(input_3dmm)
+            return session, {name: tuple(reference[name].shape) for name in output_names}
+        
+        def run(input_3dmm):
+            input_3dmm = input_3dmm.contiguous()
+            key = tuple(input_3dmm.shape)
+            if key not in sessions:
+                try:
+                    sessions[key] = build_session(input_3dmm)
+                except Exception as e:
+                    logger.warning(f"TensorRT mapping net unavailable, using PyTorch: {e}")
+                    sessions[key] = None
+            if sessions[key] is None:
+                return mapping(input_3dmm)
+            
+            session, output_shapes = sessions[key]
+            outputs = {name: torch.empty(shape, device=input_3dmm.device) for name, shape in output_shapes.items()}
+            binding = session.io_binding()
+            binding.bind_input("input_3dmm", "cuda", device_id, np.float32, key, input_3dmm.data_ptr())
+            for name, tensor in outputs.items():
+                binding.bind_output(name, "cuda", device_id, np.float32, tuple(tensor.shape), tensor.data_ptr())
+            session.run_with_iobinding(binding)
+            return outputs
+        
+        return run
+
     async def generate_video(self, face_image_path: str, audio_path: str, output_path: str, progress_callback=None) -> Dict[str, Any]:
         """Generate video using the exact SadTalker reference implementation."""
         try:
@@ -93,11 +572,28 @@ class RealSadTalkerService(LipSyncService):
             if progress_callback:
                 progress_callback("Starting SadTalker video generation...")
 
-            # Create temporary directory for intermediate files
-            with tempfile.TemporaryDirectory() as temp_dir:
-                return await self._generate_video_reference(
-                    face_image_path, audio_path, output_path, temp_dir, progress_callback
+            if self._scratch_root is None:
+                # Create temporary directory for intermediate files
+                with tempfile.TemporaryDirectory() as temp_dir:
+                    return await self._generate_video_reference(
+                        face_image_path, audio_path, output_path, temp_dir, progress_callback
+                    )
+            
+            # Borrow a scratch directory for intermediate files
+            temp_dir = self._acquire_scratch_dir()
+            reuse = False
+            try:
+                result = await self._generate_video_reference(
+                    face_image_path, audio_path, output_path, str(temp_dir), progress_callback
                 )
+                reuse = True
+                return result
+            except RuntimeError:
+                # Failed requests have finished every stage and can hand the directory back
+                reuse = True
+                raise
+            finally:
+                self._release_scratch_dir(temp_dir, reuse)
 
         except Exception as e:
             logger.error(f"❌ Error in SadTalker video generation: {e}")
@@ -105,109 +601,418 @@ class RealSadTalkerService(LipSyncService):
             logger.error(f"Traceback: {traceback.format_exc()}")
             raise RuntimeError(f"SadTalker video generation failed: {e}")
 
-    async def _generate_video_reference(self, face_image_path: str, audio_path: str, output_path: str, temp_dir: str, progress_callback=None) -> Dict[str, Any]:
-        """Generate video following the exact SadTalker reference implementation."""
+    def _init_scratch_root(self) -> Optional[Path]:
+        """Create this process's scratch root, or return None to use regular temp dirs."""
+        root = Path(settings.sadtalker_scratch_dir) / f"worker-{os.getpid()}"
         try:
-            if progress_callback:
-                progress_callback("Extracting 3DMM from source image...")
-
-            # Step 1: Extract 3DMM from source image (exactly like reference)
-            first_frame_dir = os.path.join(temp_dir, 'first_frame_dir')
-            os.makedirs(first_frame_dir, exist_ok=True)
-            
-            logger.info('3DMM Extraction for source image')
-            first_coeff_path, crop_pic_path, crop_info = self.preprocess_model.generate(
-                face_image_path, 
-                first_frame_dir, 
-                'crop',  # preprocess mode
-                source_image_flag=True, 
-                pic_size=256
-            )
-            
-            if first_coeff_path is None:
-                raise RuntimeError("Can't get the coeffs of the input image")
+            root.mkdir(parents=True, exist_ok=True)
+            probe = root / ".probe"
+            probe.touch()
+            probe.unlink()
+        except OSError as e:
+            logger.info(f"SadTalker scratch directory {root} not writable, using temp directories: {e}")
+            return None
+        
+        atexit.register(shutil.rmtree, root, ignore_errors=True)
+        return root
 
-            if progress_callback:
-                progress_callback("Processing audio to coefficients...")
+    def _acquire_scratch_dir(self) -> Path:
+        """Take an empty scratch directory from the pool, creating one if none is free."""
+        try:
+            return self._scratch_dirs.get_nowait()
+        except queue.Empty:
+            scratch_dir = self._scratch_root / f"req-{uuid.uuid4().hex}"
+            scratch_dir.mkdir()
+            return scratch_dir
+
+    def _release_scratch_dir(self, scratch_dir: Path, reuse: bool):
+        """Empty a scratch directory and return it to the pool.
+        
+        Directories of cancelled requests may still be written by a running stage,
+        so they are removed instead of reused.
+        """
+        if not reuse:
+            shutil.rmtree(scratch_dir, ignore_errors=True)
+            return
+        
+        for entry in os.scandir(scratch_dir):
+            if entry.is_dir(follow_symlinks=False):
+                shutil.rmtree(entry.path, ignore_errors=True)
+            else:
+                os.unlink(entry.path)
+        self._scratch_dirs.put(scratch_dir)
+
+    async def _generate_video_reference(self, face_image_path: str, audio_path: str, output_path: str, temp_dir: str, progress_callback=None) -> Dict[str, Any]:
+        """Generate video following the exact SadTalker reference implementation.
+        
+        The request is queued on a three-stage pipeline (3DMM extraction, audio to
+        coefficients, face render) whose stages run on their own worker threads, so
+        one request's render overlaps the next request's audio2coeff and preprocess.
+        """
+        self._ensure_pipeline()
+        job = _VideoJob(
+            face_image_path=face_image_path,
+            audio_path=audio_path,
+            output_path=output_path,
+            temp_dir=temp_dir,
+            progress_callback=progress_callback,
+            future=asyncio.get_running_loop().create_future()
+        )
+        await self._preprocess_queue.put(job)
+        await job.future
+        
+        return {
+            "status": "success",
+            "output_path": output_path,
+            "duration": 0,  # Could calculate actual duration if needed
+            "message": "SadTalker video generation completed successfully using reference implementation"
+        }
+
+    def _ensure_pipeline(self):
+        """Start the stage workers on the running event loop if they are not running yet."""
+        loop = asyncio.get_running_loop()
+        if self._pipeline_loop is loop:
+            return
+        
+        # Bounded queues give back-pressure when a later stage falls behind
+        self._preprocess_queue = asyncio.Queue(maxsize=2)
+        audio2coeff_queue = asyncio.Queue(maxsize=2)
+        render_queue = asyncio.Queue(maxsize=2)
+        self._pipeline_workers = [
+            loop.create_task(self._stage_worker(self._preprocess_queue, audio2coeff_queue, self._preprocess_pool, self._extract_source_coeffs)),
+            loop.create_task(self._stage_worker(audio2coeff_queue, render_queue, self._audio2coeff_pool, self._audio_to_coeffs)),
+            loop.create_task(self._stage_worker(render_queue, None, None, self._render_video))
+        ]
+        self._pipeline_loop = loop
 
-            # Step 2: Audio to coefficients (exactly like reference)
-            # No reference eyeblink for now (ref_eyeblink_coeff_path=None)
-            logger.info(f"🚀 Calling get_data with: first_coeff_path={first_coeff_path}, audio_path={audio_path}, device={self.device}")
+    async def _stage_worker(self, inbox: asyncio.Queue, outbox: Optional[asyncio.Queue], pool: Optional[ThreadPoolExecutor], stage):
+        """Run one pipeline stage for each job, handing successful jobs to the next stage."""
+        loop = asyncio.get_running_loop()
+        while True:
+            job = await inbox.get()
+            if job.future.done():
+                continue
             try:
-                batch = self.get_data(first_coeff_path, audio_path, self.device, None, still=False)
-                logger.info(f"✅ get_data completed. Batch keys: {list(batch.keys()) if batch else 'None'}")
-                if batch and 'indiv_mels' in batch:
-                    logger.info(f"✅ indiv_mels shape: {batch['indiv_mels'].shape if hasattr(batch['indiv_mels'], 'shape') else 'No shape'}")
+                if pool is None:
+                    await stage(job)
                 else:
-                    logger.error(f"❌ Batch missing indiv_mels key. Available keys: {list(batch.keys()) if batch else 'None'}")
-            except Exception as e:
-                logger.error(f"❌ Error in get_data: {e}")
-                raise
-            
-            logger.info(f"🚀 Calling audio2coeff.generate with batch and temp_dir={temp_dir}")
-            try:
-                coeff_path = self.audio2coeff.generate(batch, temp_dir, 0, None)  # pose_style=0, ref_pose_coeff_path=None
-                logger.info(f"✅ audio2coeff.generate completed. Coeff path: {coeff_path}")
+                    await loop.run_in_executor(pool, self._run_inference, stage, job)
             except Exception as e:
-                logger.error(f"❌ Error in audio2coeff.generate: {e}")
+                logger.error(f"❌ Error in reference SadTalker video generation: {e}")
                 import traceback
                 logger.error(f"Traceback: {traceback.format_exc()}")
-                raise
-
-            if progress_callback:
-                progress_callback("Generating final video...")
-
-            # Step 3: Generate facerender data (exactly like reference)
-            data = self.get_facerender_data(
-                coeff_path, 
-                crop_pic_path, 
-                first_coeff_path, 
-                audio_path,
-                batch_size=2,  # Default batch size from reference
-                input_yaw_list=None,
-                input_pitch_list=None, 
-                input_roll_list=None,
-                expression_scale=1.0,
-                still_mode=False,
-                preprocess='crop',
-                size=256
-            )
-
-            # Step 4: Generate final video (exactly like reference)
-            result = self.animate_from_coeff.generate(
-                data, 
-                temp_dir, 
-                face_image_path, 
-                crop_info,
-                enhancer=None,  # No enhancer for now
-                background_enhancer=None,
-                preprocess='crop',
-                img_size=256
-            )
+                if not job.future.done():
+                    job.future.set_exception(RuntimeError(f"Reference SadTalker video generation failed: {e}"))
+                continue
+            
+            if outbox is not None:
+                await outbox.put(job)
+            elif not job.future.done():
+                job.future.set_result(None)
 
-            # Copy result to final output path
-            shutil.copy2(result, output_path)
+    @staticmethod
+    def _run_inference(stage, job: _VideoJob):
+        """Run a blocking stage with autograd tracking disabled on the worker thread."""
+        import torch
+        
+        with torch.inference_mode():
+            stage(job)
 
-            if progress_callback:
-                progress_callback("Video generation completed!")
+    def _report_progress(self, job: _VideoJob, message: str):
+        """Invoke the job's progress callback on the event loop."""
+        if job.progress_callback:
+            self._pipeline_loop.call_soon_threadsafe(job.progress_callback, message)
 
-            return {
-                "status": "success",
-                "output_path": output_path,
-                "duration": 0,  # Could calculate actual duration if needed
-                "message": "SadTalker video generation completed successfully using reference implementation"
-            }
+    def _extract_source_coeffs(self, job: _VideoJob):
+        """Stage 1: extract 3DMM coefficients from the source image."""
+        self._report_progress(job, "Extracting 3DMM from source image...")
+        
+        # Step 1: Extract 3DMM from source image (exactly like reference)
+        first_frame_dir = os.path.join(job.temp_dir, 'first_frame_dir')
+        os.makedirs(first_frame_dir, exist_ok=True)
+        
+        logger.info('3DMM Extraction for source image')
+        first_coeff_path, crop_pic_path, crop_info = self.preprocess_model.generate(
+            job.face_image_path, 
+            first_frame_dir, 
+            'crop',  # preprocess mode
+            source_image_flag=True, 
+            pic_size=256
+        )
+        
+        if first_coeff_path is None:
+            raise RuntimeError("Can't get the coeffs of the input image")
+        
+        job.first_coeff_path = first_coeff_path
+        job.crop_pic_path = crop_pic_path
+        job.crop_info = crop_info
 
+    def _audio_to_coeffs(self, job: _VideoJob):
+        """Stage 2: predict motion coefficients from audio and build the facerender batch."""
+        self._report_progress(job, "Processing audio to coefficients...")
+        
+        # Step 2: Audio to coefficients (exactly like reference)
+        # No reference eyeblink for now (ref_eyeblink_coeff_path=None)
+        logger.info(f"🚀 Calling get_data with: first_coeff_path={job.first_coeff_path}, audio_path={job.audio_path}, device={self.device}")
+        try:
+            batch = self.get_data(job.first_coeff_path, job.audio_path, self.device, None, still=False)
+            logger.info(f"✅ get_data completed. Batch keys: {list(batch.keys()) if batch else 'None'}")
+            if batch and 'indiv_mels' in batch:
+                logger.info(f"✅ indiv_mels shape: {batch['indiv_mels'].shape if hasattr(batch['indiv_mels'], 'shape') else 'No shape'}")
+            else:
+                logger.error(f"❌ Batch missing indiv_mels key. Available keys: {list(batch.keys()) if batch else 'None'}")
+        except Exception as e:
+            logger.error(f"❌ Error in get_data: {e}")
+            raise
+        
+        logger.info(f"🚀 Calling audio2coeff.generate with batch and temp_dir={job.temp_dir}")
+        try:
+            coeff_path = self.audio2coeff.generate(batch, job.temp_dir, 0, None)  # pose_style=0, ref_pose_coeff_path=None
+            logger.info(f"✅ audio2coeff.generate completed. Coeff path: {coeff_path}")
         except Exception as e:
-            logger.error(f"❌ Error in reference SadTalker video generation: {e}")
+            logger.error(f"❌ Error in audio2coeff.generate: {e}")
             import traceback
             logger.error(f"Traceback: {traceback.format_exc()}")
-            raise RuntimeError(f"Reference SadTalker video generation failed: {e}")
+            raise
+        
+        job.coeff_path = coeff_path
+        self._build_facerender_data(job)
+
+    def _build_facerender_data(self, job: _VideoJob):
+        """Build the facerender batch for the current facerender batch size."""
+        # Step 3: Generate facerender data (exactly like reference)
+        job.facerender_data = self.get_facerender_data(
+            job.coeff_path, 
+            job.crop_pic_path, 
+            job.first_coeff_path, 
+            job.audio_path,
+            batch_size=self._facerender_batch,  # Frames rendered per forward pass
+            input_yaw_list=None,
+            input_pitch_list=None, 
+            input_roll_list=None,
+            expression_scale=1.0,
+            still_mode=False,
+            preprocess='crop',
+            size=256
+        )
+
+    async def _render_video(self, job: _VideoJob):
+        """Stage 3: render the face frames and write the final video."""
+        import torch
+        
+        self._report_progress(job, "Generating final video...")
+        
+        try:
+            await self._render_frames(job)
+        except torch.cuda.OutOfMemoryError:
+            if self._facerender_batch <= _FALLBACK_FACERENDER_BATCH:
+                raise
+            
+            # Drop to a small batch for this and every later request
+            logger.warning(f"SadTalker face render ran out of GPU memory at batch {self._facerender_batch}, retrying with {_FALLBACK_FACERENDER_BATCH}")
+            self._facerender_batch = _FALLBACK_FACERENDER_BATCH
+            torch.cuda.empty_cache()
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(self._audio2coeff_pool, self._build_facerender_data, job)
+            await self._render_frames(job)
+        
+        self._report_progress(job, "Video generation completed!")
+
+    async def _render_frames(self, job: _VideoJob):
+        """Render the facerender batch into the output video."""
+        # Step 4: Generate final video
+        if shutil.which("ffmpeg"):
+            # Overlap rendering with encoding straight into the output file
+            await self._render_and_encode(job.facerender_data, job.audio_path, job.output_path, job.crop_info, img_size=256)
+        else:
+            await asyncio.get_running_loop().run_in_executor(self._render_pool, self._run_inference, self._render_reference, job)
+
+    def _render_reference(self, job: _VideoJob):
+        """Render with AnimateFromCoeff.generate and copy the result to the output path."""
+        # Exactly like reference
+        result = self.animate_from_coeff.generate(
+            job.facerender_data, 
+            job.temp_dir, 
+            job.face_image_path, 
+            job.crop_info,
+            enhancer=None,  # No enhancer for now
+            background_enhancer=None,
+            preprocess='crop',
+            img_size=256
+        )
+        
+        # Move result to final output path
+        _move_into_place(result, job.output_path)
+
+    async def _render_and_encode(self, data: Dict[str, Any], audio_path: str, output_path: str, crop_info, img_size: int = 256):
+        """Render face frames and stream them into ffmpeg as they complete.
+        
+        Mirrors AnimateFromCoeff.generate for the crop preprocess without enhancer,
+        but no intermediate video is written to disk. Each render step is converted
+        to uint8 in one pass and handed to the encoder via an asyncio.Queue. On CUDA
+        the copy into a pinned host buffer runs on a side stream and frames go to
+        NVENC; on CPU they go to libx264 ultrafast.
+        """
+        import cv2
+        import torch
+        from sadtalker.facerender.modules.make_animation import keypoint_transformation
+        
+        afc = self.animate_from_coeff
+        device = torch.device(self.device)
+        use_cuda = device.type == "cuda"
+        source_image = data['source_image'].to(device, non_blocking=True)
+        source_semantics = data['source_semantics'].to(device, non_blocking=True)
+        target_semantics = data['target_semantics_list'].to(device, non_blocking=True)
+        frame_num = data['frame_num']
+        batch, steps = target_semantics.shape[:2]
+        size = source_image.shape[-1]
+        
+        # Keep the reference output aspect ratio; H.264 needs even dimensions
+        width, height = size, size
+        original_size = crop_info[0]
+        if original_size:
+            width, height = img_size, int(img_size * original_size[1] / original_size[0])
+        width -= width % 2
+        height -= height % 2
+        resize = (width, height) != (size, size)
+        
+        # Frame i of the clip is batch row i // steps rendered at step i % steps
+        frames = torch.empty((steps, batch, size, size, 3), dtype=torch.uint8, pin_memory=use_cuda)
+        copy_stream = torch.cuda.Stream(device=device) if use_cuda else None
+        loop = asyncio.get_running_loop()
+        ready: asyncio.Queue = asyncio.Queue()
+        
+        def render():
+            try:
+                with torch.inference_mode():
+                    kp_canonical = afc.kp_extractor(source_image)
+                    kp_source = keypoint_transformation(kp_canonical, afc.mapping(source_semantics))
+                    for step in range(steps):
+                        kp_driving = keypoint_transformation(kp_canonical, afc.mapping(target_semantics[:, step]))
+                        prediction = afc.generator(source_image, kp_source=kp_source, kp_driving=kp_driving)['prediction']
+                        pixels = (prediction * 255).clamp_(0, 255).round_().to(torch.uint8).permute(0, 2, 3, 1)
+                        
+                        if copy_stream is None:
+                            frames[step].copy_(pixels)
+                            loop.call_soon_threadsafe(ready.put_nowait, (step, None))
+                            continue
+                        
+                        copy_stream.wait_stream(torch.cuda.current_stream(device))
+                        with torch.cuda.stream(copy_stream):
+                            frames[step].copy_(pixels.contiguous(), non_blocking=True)
+                            pixels.record_stream(copy_stream)
+                            copied = torch.cuda.Event()
+                            copied.record(copy_stream)
+                        loop.call_soon_threadsafe(ready.put_nowait, (step, copied))
+            finally:
+                loop.call_soon_threadsafe(ready.put_nowait, None)
+        
+        if use_cuda:
+            video_codec = ['-c:v', 'h264_nvenc', '-preset', settings.video_nvenc_preset, '-cq', str(settings.video_crf)]
+        else:
+            video_codec = ['-c:v', 'libx264', '-preset', settings.video_x264_preset, '-crf', str(settings.video_crf)]
+        
+        process = await asyncio.create_subprocess_exec(
+            'ffmpeg', '-y', '-loglevel', 'error',
+            '-f', 'rawvideo', '-pix_fmt', 'rgb24', '-s', f'{width}x{height}', '-r', str(_VIDEO_FPS), '-i', '-',
+            '-i', audio_path,
+            *video_codec, '-pix_fmt', 'yuv420p',
+            '-c:a', 'aac', '-shortest',
+            output_path,
+            stdin=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE
+        )
+        _grow_pipe_buffer(process.stdin)
+        
+        async def encode():
+            completed = -1
+            for index in range(frame_num):
+                step, row = index % steps, index // steps
+                while completed < step:
+                    item = await ready.get()
+                    if item is None:
+                        raise RuntimeError("Face renderer stopped before all frames were produced")
+                    completed, copied = item
+                    if copied is not None:
+                        await asyncio.to_thread(copied.synchronize)
+                
+                frame = frames[step, row].numpy()
+                if resize:
+                    frame = cv2.resize(frame, (width, height))
+                process.stdin.write(frame.tobytes())
+                await process.stdin.drain()
+            process.stdin.close()
+        
+        try:
+            await asyncio.gather(loop.run_in_executor(self._render_pool, render), encode())
+            stderr = await process.stderr.read()
+            if await process.wait() != 0:
+                raise RuntimeError(f"FFmpeg encoding failed: {stderr.decode(errors='replace')}")
+        except Exception:
+            if process.returncode is None:
+                process.kill()
+                await process.wait()
+            raise
 
     def is_available(self) -> bool:
         """Check if SadTalker is available and properly configured."""
         try:
-            return self._check_sadtalker_availability()
+            return sadtalker_available()
         except Exception as e:
             logger.error(f"Error checking SadTalker availability: {e}")
-            return False
\ No newline at end of file
+            return False
+
+
+class SadTalkerReplicaPool(LipSyncService):
+    """Spread lip-sync requests over several independent SadTalker model replicas.
+    
+    Each request goes to the replica with the fewest requests in flight, so a
+    replica keeps its stage pipeline full while the others take new work.
+    """
+    
+    def __init__(self, devices: List[str], num_threads: Optional[int] = None):
+        super().__init__(devices[0])
+        self.replicas = [RealSadTalkerService(device=device, num_threads=num_threads) for device in devices]
+        self._in_flight = [0] * len(self.replicas)
+    
+    @classmethod
+    def for_host(cls) -> "SadTalkerReplicaPool":
+        """Build one replica per CUDA device, or SADTALKER_REPLICAS replicas on CPU."""
+        device = get_device()
+        if device == "cuda":
+            import torch
+            
+            gpus = [f"cuda:{index}" for index in range(torch.cuda.device_count())]
+            count = settings.sadtalker_replicas or len(gpus)
+            return cls([gpus[index % len(gpus)] for index in range(count)])
+        
+        count = max(1, settings.sadtalker_replicas)
+        num_threads = max(1, _cpu_inference_threads() // count)
+        return cls([device] * count, num_threads=num_threads)
+    
+    async def warmup(self):
+        """Load and warm every replica."""
+        await asyncio.gather(*(replica.warmup() for replica in self.replicas))
+    
+    async def generate_video(self, face_image_path: str, audio_path: str, output_path: str, progress_callback=None) -> Dict[str, Any]:
+        """Generate video on the least busy replica."""
+        index = min(range(len(self.replicas)), key=self._in_flight.__getitem__)
+        self._in_flight[index] += 1
+        try:
+            return await self.replicas[index].generate_video(face_image_path, audio_path, output_path, progress_callback)
+        finally:
+            self._in_flight[index] -= 1
+    
+    def is_available(self) -> bool:
+        """Check if SadTalker is available and properly configured."""
+        return self.replicas[0].is_available()
+
+
+@functools.lru_cache(maxsize=1)
+def get_sadtalker_service() -> SadTalkerReplicaPool:
+    """Shared replica pool, built on first use; call its warmup() to load the models ahead of the first request.
+    
+    Building the pool probes CUDA, starts each replica's executors and creates
+    its scratch directory, so importing this module alone does none of that.
+    """
+    return SadTalkerReplicaPool.for_host()
@@ -6,7 +6,12 @@ Uses small, Foundry-Local-compatible models for local inference.
 """
 
 import asyncio
-import json
+import copy
+import os
+import threading
+import zlib
+from collections import OrderedDict
+from dataclasses import dataclass
 from typing import Dict, Any, Optional, List
 from pathlib import Path
 import logging
@@ -14,21 +19,46 @@ import logging
 try:
     import torch
     import transformers
-    from transformers import AutoTokenizer, AutoModelForCausalLM, pipeline
+    from transformers import AutoTokenizer, AutoModelForCausalLM
     TORCH_AVAILABLE = True
 except ImportError:
     TORCH_AVAILABLE = False
 
 from ...core.config import settings
 from ...core.logging import get_logger
-from ...services.foundry.local_client import FoundryLocalClient
+from ...services.foundry.local_client import get_foundry_client
 
 logger = get_logger(__name__)
 
 
+@dataclass(frozen=True, slots=True)
+class StyleSignature:
+    """Precompiled persona style: bucketed style metrics and the prompt prefix they produce."""
+    vocab_richness_bucket: int  # -1 simple, 0 neutral, 1 sophisticated
+    sent_len_bucket: int  # -1 short, 0 neutral, 1 long
+    primary_tone: Optional[str]
+    style_prefix: str
+
+
 class TextGenerator:
     """Local LLM text generation with persona style adaptation."""
     
+    # Canned fallback responses, filled with the lower-cased prompt at call time
+    _MOCK_RESPONSES = (
+        "I understand you're asking about {topic}. Let me share my thoughts on this topic.",
+        "That's an interesting question about {topic}. Here's what I think:",
+        "Regarding {topic}, I believe the key points are:",
+        "When it comes to {topic}, my perspective is:",
+        "I'd be happy to discuss {topic} with you. Here's my take:"
+    )
+    _MOCK_VARIATIONS = (
+        " This is a complex topic that requires careful consideration.",
+        " There are multiple factors to consider here.",
+        " I think this deserves thoughtful analysis.",
+        " This is something I've thought about quite a bit.",
+        " Let me break this down for you."
+    )
+    
     def __init__(self, model_name: str = None, device: str = "auto"):
         """
         Initialize text generator.
@@ -41,8 +71,10 @@ class TextGenerator:
         self.device = self._get_device(device)
         self.model = None
         self.tokenizer = None
-        self.pipeline = None
+        self.assistant_model = None
+        self.torch_dtype = None
         self.is_initialized = False
+        self._load_lock = asyncio.Lock()
         
         # Generation parameters
         self.max_new_tokens = 256
@@ -50,12 +82,21 @@ class TextGenerator:
         self.top_p = 0.9
         self.do_sample = True
         
+        # Style instructions keyed by the bucketed profile values they are derived from
+        self._style_signature_cache: Dict[tuple, StyleSignature] = {}
+        
+        # Prefilled KV caches for style prefixes, least recently used first;
+        # local generation runs on worker threads, so access goes through the lock
+        self._prefix_kv_cache: "OrderedDict[bytes, Any]" = OrderedDict()
+        self._prefix_kv_cache_size = 8
+        self._prefix_kv_cache_lock = threading.Lock()
+        
         # Models directory
         self.models_dir = Path(settings.models_dir) / "llm"
         self.models_dir.mkdir(parents=True, exist_ok=True)
         
-        # Foundry Local client
-        self.foundry_client = FoundryLocalClient()
+        # Foundry Local client, shared process-wide
+        self._foundry_client_provider = get_foundry_client
         
         logger.info(f"Initializing TextGenerator with model: {model_name}")
     
@@ -69,14 +110,20 @@ class TextGenerator:
     
     async def _load_model(self):
         """Load the LLM model and tokenizer."""
-        if self.is_initialized:
-            return
-        
-        if not TORCH_AVAILABLE:
-            logger.warning("PyTorch not available, using mock implementation")
-            self.is_initialized = True
-            return
-        
+        async with self._load_lock:
+            if self.is_initialized:
+                return
+            
+            if not TORCH_AVAILABLE:
+                logger.warning("PyTorch not available, using mock implementation")
+                self.is_initialized = True
+                return
+            
+            # Loading (and compiling) takes seconds to minutes; keep the event loop free
+            await asyncio.to_thread(self._load_model_blocking)
+    
+    def _load_model_blocking(self):
+        """Load the tokenizer and model on a worker thread."""
         try:
             logger.info(f"Loading LLM model: {self.model_name}")
             
@@ -90,26 +137,26 @@ class TextGenerator:
             if self.tokenizer.pad_token is None:
                 self.tokenizer.pad_token = self.tokenizer.eos_token
             
-            # Load model
+            # Load model at the configured precision
+            load_kwargs = self._model_load_kwargs()
             self.model = AutoModelForCausalLM.from_pretrained(
                 self.model_name,
                 cache_dir=str(self.models_dir),
-                torch_dtype=torch.float16 if self.device == "cuda" else torch.float32,
-                device_map="auto" if self.device == "cuda" else None
+                **load_kwargs
             )
             
             # Move to device if not using device_map
-            if self.device == "cpu":
+            if load_kwargs.get("device_map") is None:
                 self.model = self.model.to(self.device)
             
-            # Create pipeline
-            self.pipeline = pipeline(
-                "text-generation",
-                model=self.model,
-                tokenizer=self.tokenizer,
-                device=0 if self.device == "cuda" else -1,
-                torch_dtype=torch.float16 if self.device == "cuda" else torch.float32
-            )
+            # Draft model for speculative (assisted) decoding
+            if settings.llm_speculative_decoding:
+                self.assistant_model = self._load_assistant_model()
+            
+            # Compile the forward pass used by generate(), paying the compile
+            # cost here rather than on the first real request
+            if settings.llm_compile and hasattr(torch, "compile") and self._compile_model():
+                self._generate_local("warmup", None, max_tokens=8, temperature=self.temperature)
             
             self.is_initialized = True
             logger.info("LLM model loaded successfully")
@@ -117,15 +164,102 @@ class TextGenerator:
         except Exception as e:
             logger.error(f"Failed to load LLM model: {e}")
             # Fall back to mock implementation
+            self.model = None
+            self.assistant_model = None
             self.is_initialized = True
             logger.info("Using mock LLM implementation")
     
+    def _select_dtype(self, precision: str) -> "torch.dtype":
+        """Resolve a precision setting to a torch dtype for this device."""
+        if precision == "fp32":
+            return torch.float32
+        if precision == "fp16":
+            return torch.float16
+        if precision == "bf16":
+            return torch.bfloat16
+        
+        # auto: fp16 on GPU, bf16 on CPUs with native bf16 math, fp32 otherwise
+        if self.device == "cuda":
+            return torch.float16
+        if hasattr(torch.cpu, "_is_avx512_bf16_supported") and torch.cpu._is_avx512_bf16_supported():
+            return torch.bfloat16
+        return torch.float32
+    
+    def _model_load_kwargs(self) -> Dict[str, Any]:
+        """Build from_pretrained arguments for the configured quantization."""
+        quantization = settings.llm_quantization
+        
+        if quantization in ("int8", "int4"):
+            try:
+                from transformers import BitsAndBytesConfig
+                import bitsandbytes  # noqa: F401
+                
+                compute_dtype = self._select_dtype("auto")
+                if quantization == "int8":
+                    quantization_config = BitsAndBytesConfig(load_in_8bit=True)
+                else:
+                    quantization_config = BitsAndBytesConfig(load_in_4bit=True, bnb_4bit_compute_dtype=compute_dtype)
+                
+                self.torch_dtype = compute_dtype
+                return {"quantization_config": quantization_config, "device_map": "auto"}
+            except ImportError:
+                logger.warning(f"bitsandbytes not available, loading LLM without {quantization} quantization")
+                quantization = "auto"
+        
+        self.torch_dtype = self._select_dtype(quantization)
+        logger.info(f"Loading LLM weights as {self.torch_dtype}")
+        return {
+            "torch_dtype": self.torch_dtype,
+            "device_map": "auto" if self.device == "cuda" else None
+        }
+    
+    def _load_assistant_model(self) -> Optional["AutoModelForCausalLM"]:
+        """Load the draft model for speculative decoding, or None if it cannot assist."""
+        draft_name = settings.llm_draft_model
+        if not draft_name:
+            logger.warning("Speculative decoding enabled without LLM_DRAFT_MODEL, using plain decoding")
+            return None
+        
+        try:
+            # The target verifies draft tokens by id, so both models must share a vocabulary
+            draft_tokenizer = AutoTokenizer.from_pretrained(draft_name, cache_dir=str(self.models_dir))
+            if draft_tokenizer.get_vocab() != self.tokenizer.get_vocab():
+                logger.warning(f"Draft model {draft_name} does not share the {self.model_name} vocabulary, using plain decoding")
+                return None
+            
+            assistant_model = AutoModelForCausalLM.from_pretrained(
+                draft_name,
+                cache_dir=str(self.models_dir),
+                torch_dtype=self.torch_dtype
+            ).to(self.model.device)
+            logger.info(f"Loaded draft model {draft_name} for speculative decoding")
+            return assistant_model
+        except Exception as e:
+            logger.warning(f"Failed to load draft model {draft_name}, using plain decoding: {e}")
+            return None
+    
+    def _compile_model(self) -> bool:
+        """Compile the model forward pass with TorchInductor; False if it runs eagerly."""
+        # Persist compiled kernels so later starts skip most of the compile cost
+        os.environ.setdefault("TORCHINDUCTOR_CACHE_DIR", str(self.models_dir / "inductor_cache"))
+        
+        # CUDA graphs only exist on GPU; CPU gets plain kernel fusion
+        mode = "reduce-overhead" if self.device == "cuda" else "default"
+        try:
+            self.model.forward = torch.compile(self.model.forward, mode=mode, fullgraph=False)
+            logger.info(f"Compiled LLM forward pass (mode={mode})")
+            return True
+        except Exception as e:
+            logger.warning(f"Failed to compile LLM, running eagerly: {e}")
+            return False
+    
     async def generate_text(
         self,
         prompt: str,
         style_profile: Optional[Dict[str, Any]] = None,
         max_tokens: Optional[int] = None,
-        temperature: Optional[float] = None
+        temperature: Optional[float] = None,
+        style_signature: Optional[StyleSignature] = None
     ) -> Dict[str, Any]:
         """
         Generate text based on prompt and style profile.
@@ -135,6 +269,7 @@ class TextGenerator:
             style_profile: Persona style profile from text analysis
             max_tokens: Maximum tokens to generate
             temperature: Sampling temperature
+            style_signature: Precompiled style, used instead of style_profile when given
             
         Returns:
             Dict with generated text and metadata
@@ -145,20 +280,33 @@ class TextGenerator:
             temperature = temperature or self.temperature
             
             # Apply style adaptation if profile provided
-            adapted_prompt = self._adapt_prompt_to_style(prompt, style_profile)
+            if style_signature is None:
+                style_signature = self._style_signature(style_profile)
+            adapted_prompt = self._adapt_prompt_to_style(prompt, style_signature)
             
-            # Use Foundry Local client for real model inference
-            result = await self.foundry_client.generate_text(
-                prompt=adapted_prompt,
-                model_name=self.model_name,
-                max_tokens=max_tokens,
-                temperature=temperature,
-                top_p=self.top_p,
-                do_sample=self.do_sample
-            )
+            client = await self._foundry_client_provider()
+            if settings.llm_local_model and not client.is_available:
+                # Foundry Local is down; fall back to the in-process model, loaded on first use
+                await self._load_model()
+            
+            if self.model is not None and not client.is_available:
+                # Run the locally loaded model, reusing the style prefix's KV cache
+                result = await asyncio.to_thread(
+                    self._generate_local, prompt, style_signature, max_tokens, temperature
+                )
+            else:
+                # Use Foundry Local client for real model inference
+                result = await client.generate_text(
+                    prompt=adapted_prompt,
+                    model_name=self.model_name,
+                    max_tokens=max_tokens,
+                    temperature=temperature,
+                    top_p=self.top_p,
+                    do_sample=self.do_sample
+                )
             
             # Add style adaptation info
-            result["style_adapted"] = style_profile is not None
+            result["style_adapted"] = style_signature is not None
             result["original_prompt"] = prompt
             result["adapted_prompt"] = adapted_prompt
             
@@ -168,86 +316,255 @@ class TextGenerator:
             logger.error(f"Text generation failed: {e}")
             return await self._mock_generate_text(prompt, max_tokens or self.max_new_tokens)
     
-    def _adapt_prompt_to_style(self, prompt: str, style_profile: Optional[Dict[str, Any]]) -> str:
-        """Adapt prompt based on style profile."""
-        if not style_profile:
+    def _generate_local(
+        self,
+        prompt: str,
+        style_signature: Optional[StyleSignature],
+        max_tokens: int,
+        temperature: float
+    ) -> Dict[str, Any]:
+        """Generate with the locally loaded model via model.generate."""
+        # Tokenize the style prefix and the user prompt separately so the
+        # prefix KV cache can be reused across requests with the same persona
+        style_instruction = style_signature.style_prefix if style_signature is not None else ""
+        user_ids = self.tokenizer(prompt, return_tensors="pt", add_special_tokens=False).input_ids
+        
+        past_key_values = None
+        if style_instruction:
+            prefix_ids = self.tokenizer(f"{style_instruction}. ", return_tensors="pt").input_ids
+            input_ids = torch.cat([prefix_ids, user_ids], dim=1)
+            past_key_values = self._get_prefix_kv_cache(prefix_ids)
+        else:
+            input_ids = user_ids
+        
+        input_ids = input_ids.to(self.model.device)
+        with torch.inference_mode():
+            output_ids = self.model.generate(
+                input_ids=input_ids,
+                attention_mask=torch.ones_like(input_ids),
+                # generate() extends the cache in place, so hand it a private copy
+                past_key_values=copy.deepcopy(past_key_values) if past_key_values is not None else None,
+                max_new_tokens=max_tokens,
+                do_sample=self.do_sample,
+                temperature=temperature,
+                top_p=self.top_p,
+                pad_token_id=self.tokenizer.pad_token_id,
+                use_cache=True,
+                # The draft proposes several tokens that the target verifies in one forward pass
+                assistant_model=self.assistant_model
+            )
+        
+        new_tokens = output_ids[0, input_ids.shape[1]:]
+        generated_text = self.tokenizer.decode(new_tokens, skip_special_tokens=True)
+        
+        return {
+            "text": generated_text,
+            "word_count": len(generated_text.split()),
+            "char_count": len(generated_text),
+            "tokens_generated": int(new_tokens.shape[0]),
+            "model_name": self.model_name,
+            "temperature": temperature,
+            "via_foundry": False
+        }
+    
+    def _get_prefix_kv_cache(self, prefix_ids: "torch.Tensor") -> Any:
+        """Get the KV cache for a style prefix, prefilling it on a miss."""
+        key = prefix_ids.numpy().tobytes()
+        with self._prefix_kv_cache_lock:
+            cached = self._prefix_kv_cache.get(key)
+            if cached is not None:
+                self._prefix_kv_cache.move_to_end(key)
+                return cached
+        
+        # Prefill outside the lock so cache hits on other threads are not held up
+        with torch.inference_mode():
+            outputs = self.model(prefix_ids.to(self.model.device), use_cache=True)
+        
+        with self._prefix_kv_cache_lock:
+            self._prefix_kv_cache[key] = outputs.past_key_values
+            self._prefix_kv_cache.move_to_end(key)
+            if len(self._prefix_kv_cache) > self._prefix_kv_cache_size:
+                self._prefix_kv_cache.popitem(last=False)
+        
+        return outputs.past_key_values
+    
+    async def generate_text_batch(
+        self,
+        prompts: List[str],
+        style_profiles: Optional[List[Optional[Dict[str, Any]]]] = None,
+        max_tokens: Optional[int] = None,
+        temperature: Optional[float] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Generate text for several prompts with one model call.
+        
+        Args:
+            prompts: Input prompts for text generation
+            style_profiles: Optional style profile per prompt (same length as prompts)
+            max_tokens: Maximum tokens to generate per prompt
+            temperature: Sampling temperature
+            
+        Returns:
+            List of dicts with generated text and metadata, in prompt order
+        """
+        if not prompts:
+            return []
+        
+        style_profiles = style_profiles or [None] * len(prompts)
+        if len(style_profiles) != len(prompts):
+            raise ValueError("style_profiles must match the number of prompts")
+        
+        max_tokens = max_tokens or self.max_new_tokens
+        temperature = temperature or self.temperature
+        
+        # Apply style adaptation per prompt
+        adapted_prompts = [
+            self._adapt_prompt_to_style(prompt, self._style_signature(style_profile))
+            for prompt, style_profile in zip(prompts, style_profiles)
+        ]
+        
+        try:
+            # One request amortizes per-call overhead across the whole batch
+            client = await self._foundry_client_provider()
+            results = await client.generate_text_batch(
+                prompts=adapted_prompts,
+                model_name=self.model_name,
+                max_tokens=max_tokens,
+                temperature=temperature,
+                top_p=self.top_p,
+                do_sample=self.do_sample
+            )
+        except Exception as e:
+            logger.error(f"Batch text generation failed: {e}")
+            return list(await asyncio.gather(*(
+                self._mock_generate_text(prompt, max_tokens) for prompt in prompts
+            )))
+        
+        # Add style adaptation info
+        for result, prompt, adapted_prompt, style_profile in zip(results, prompts, adapted_prompts, style_profiles):
+            result["style_adapted"] = style_profile is not None
+            result["original_prompt"] = prompt
+            result["adapted_prompt"] = adapted_prompt
+        
+        return results
+    
+    def _adapt_prompt_to_style(self, prompt: str, style_signature: Optional[StyleSignature]) -> str:
+        """Adapt prompt based on a compiled style signature."""
+        if style_signature is None or not style_signature.style_prefix:
             return prompt
+        return f"{style_signature.style_prefix}. {prompt}"
+    
+    def _style_signature(self, style_profile: Optional[Dict[str, Any]]) -> Optional[StyleSignature]:
+        """Get the compiled style for a profile, compiling it once per distinct profile."""
+        if not style_profile:
+            return None
+        
+        key = self._style_key(style_profile)
+        style_signature = self._style_signature_cache.get(key)
+        if style_signature is None:
+            style_signature = self._compile_style_key(*key)
+            self._style_signature_cache[key] = style_signature
+        
+        return style_signature
+    
+    @classmethod
+    def compile_style(cls, style_profile: Dict[str, Any]) -> StyleSignature:
+        """
+        Compile a style profile once, e.g. at persona load.
+        
+        Args:
+            style_profile: Persona style profile from text analysis
+            
+        Returns:
+            StyleSignature to pass as style_signature on later generate calls
+        """
+        return cls._compile_style_key(*cls._style_key(style_profile))
+    
+    @staticmethod
+    def _style_key(style_profile: Dict[str, Any]) -> tuple:
+        """Bucket the style characteristics that shape the prompt.
         
-        # Extract style characteristics
+        Only the buckets affect the instruction text, so keying on them keeps the
+        signature cache to a handful of entries however many profiles are seen.
+        """
         style_metrics = style_profile.get("style_metrics", {})
         tone = style_profile.get("tone", {})
         
-        # Build style context
-        style_context = []
-        
-        # Add vocabulary richness info
-        if "vocabulary_richness" in style_metrics:
-            richness = style_metrics["vocabulary_richness"]
+        # Vocabulary richness: 1 sophisticated, -1 simple
+        richness = style_metrics.get("vocabulary_richness")
+        richness_bucket = 0
+        if richness is not None:
             if richness > 0.7:
-                style_context.append("Use sophisticated vocabulary")
+                richness_bucket = 1
             elif richness < 0.3:
-                style_context.append("Use simple, accessible language")
+                richness_bucket = -1
         
-        # Add sentence length preference
-        if "avg_sentence_length" in style_metrics:
-            avg_length = style_metrics["avg_sentence_length"]
+        # Sentence length: 1 long, -1 short
+        avg_length = style_metrics.get("avg_sentence_length")
+        length_bucket = 0
+        if avg_length is not None:
             if avg_length > 20:
-                style_context.append("Use longer, more complex sentences")
+                length_bucket = 1
             elif avg_length < 10:
-                style_context.append("Use shorter, concise sentences")
+                length_bucket = -1
+        
+        return richness_bucket, length_bucket, tone.get("primary_tone")
+    
+    @staticmethod
+    def _compile_style_key(
+        richness_bucket: int,
+        length_bucket: int,
+        primary_tone: Optional[str]
+    ) -> StyleSignature:
+        """Build the style instruction text for bucketed style characteristics."""
+        style_context = []
+        
+        # Add vocabulary richness info
+        if richness_bucket == 1:
+            style_context.append("Use sophisticated vocabulary")
+        elif richness_bucket == -1:
+            style_context.append("Use simple, accessible language")
+        
+        # Add sentence length preference
+        if length_bucket == 1:
+            style_context.append("Use longer, more complex sentences")
+        elif length_bucket == -1:
+            style_context.append("Use shorter, concise sentences")
         
         # Add tone guidance
-        if "primary_tone" in tone:
-            primary_tone = tone["primary_tone"]
+        if primary_tone is not None:
             style_context.append(f"Maintain a {primary_tone} tone")
         
-        # Combine with original prompt
-        if style_context:
-            style_instruction = " ".join(style_context)
-            return f"{style_instruction}. {prompt}"
-        
-        return prompt
+        return StyleSignature(
+            vocab_richness_bucket=richness_bucket,
+            sent_len_bucket=length_bucket,
+            primary_tone=primary_tone,
+            style_prefix=" ".join(style_context)
+        )
     
     async def _mock_generate_text(self, prompt: str, max_tokens: int) -> Dict[str, Any]:
         """Mock text generation for testing."""
         # Simulate processing time
         await asyncio.sleep(0.5)
         
-        # Generate mock responses based on prompt
-        mock_responses = [
-            f"I understand you're asking about {prompt.lower()}. Let me share my thoughts on this topic.",
-            f"That's an interesting question about {prompt.lower()}. Here's what I think:",
-            f"Regarding {prompt.lower()}, I believe the key points are:",
-            f"When it comes to {prompt.lower()}, my perspective is:",
-            f"I'd be happy to discuss {prompt.lower()} with you. Here's my take:"
-        ]
-        
-        # Select response based on prompt length
-        response_index = len(prompt) % len(mock_responses)
-        base_response = mock_responses[response_index]
-        
-        # Add some variation
-        variations = [
-            " This is a complex topic that requires careful consideration.",
-            " There are multiple factors to consider here.",
-            " I think this deserves thoughtful analysis.",
-            " This is something I've thought about quite a bit.",
-            " Let me break this down for you."
-        ]
-        
-        variation = variations[len(prompt) % len(variations)]
+        # Select response and variation based on prompt length
+        base_response = self._MOCK_RESPONSES[len(prompt) % len(self._MOCK_RESPONSES)].format(topic=prompt.lower())
+        variation = self._MOCK_VARIATIONS[len(prompt) % len(self._MOCK_VARIATIONS)]
         generated_text = base_response + variation
         
         # Ensure we don't exceed max_tokens (rough approximation)
         words = generated_text.split()
-        if len(words) > max_tokens // 2:  # Rough word-to-token ratio
-            generated_text = " ".join(words[:max_tokens // 2])
+        n_words = len(words)
+        if n_words > max_tokens // 2:  # Rough word-to-token ratio
+            words = words[:max_tokens // 2]
+            n_words = len(words)
+            generated_text = " ".join(words)
         
         return {
             "text": generated_text,
-            "word_count": len(generated_text.split()),
+            "word_count": n_words,
             "char_count": len(generated_text),
-            "tokens_generated": len(generated_text.split()) * 1.3,  # Rough estimate
+            "tokens_generated": n_words * 1.3,  # Rough estimate
             "model_name": f"mock-{self.model_name}",
             "temperature": self.temperature,
             "style_adapted": False
@@ -272,8 +589,9 @@ class TextGenerator:
         text_config = persona_config.get("text", {})
         generation_config = text_config.get("generation", {})
         
-        # Get style profile if available
+        # Get style profile if available, preferring the signature compiled at persona load
         style_profile = text_config.get("style_profile")
+        style_signature = text_config.get("style_signature")
         
         # Use persona-specific parameters
         max_tokens = generation_config.get("max_new_tokens", self.max_new_tokens)
@@ -283,7 +601,8 @@ class TextGenerator:
             prompt=prompt,
             style_profile=style_profile,
             max_tokens=max_tokens,
-            temperature=temperature
+            temperature=temperature,
+            style_signature=style_signature
         )
     
     def get_model_info(self) -> Dict[str, Any]:
@@ -302,7 +621,10 @@ class TextGenerator:
         """Clean up resources."""
         self.model = None
         self.tokenizer = None
-        self.pipeline = None
+        self.assistant_model = None
+        self._style_signature_cache.clear()
+        with self._prefix_kv_cache_lock:
+            self._prefix_kv_cache.clear()
         self.is_initialized = False
         logger.info("TextGenerator cleaned up")
 
@@ -310,6 +632,21 @@ class TextGenerator:
 class MockTextGenerator(TextGenerator):
     """Mock text generator for testing."""
     
+    # Response templates, filled with the prompt at call time
+    _RESPONSES = (
+        "Based on your question about '{prompt}', I think it's important to consider multiple perspectives. This topic touches on several key areas that deserve careful analysis.",
+        "Regarding '{prompt}', my experience suggests that the most effective approach involves understanding the underlying principles. Let me share some insights that might be helpful.",
+        "When discussing '{prompt}', I find it valuable to examine both the theoretical framework and practical applications. Here's what I've learned from my research and experience.",
+        "Your question about '{prompt}' is quite thought-provoking. I believe the answer lies in understanding the interconnected nature of these concepts and their real-world implications.",
+        "Concerning '{prompt}', I'd like to offer a nuanced perspective that considers both the immediate context and the broader implications. This is a topic that requires careful consideration."
+    )
+    _RICH_VOCABULARY_SUFFIX = " The complexity of this subject matter demands sophisticated analysis and careful consideration of multiple variables."
+    _SIMPLE_VOCABULARY_SUFFIX = " Let me explain this in simple terms that are easy to understand."
+    _TONE_SUFFIXES = {
+        "formal": " I trust this information will be of assistance to you.",
+        "casual": " Hope this helps! Let me know if you have any other questions."
+    }
+    
     def __init__(self, model_name: str = "mock-llm", device: str = "cpu"):
         super().__init__(model_name, device)
         self.is_initialized = True
@@ -319,57 +656,63 @@ class MockTextGenerator(TextGenerator):
         """Mock model loading."""
         self.is_initialized = True
     
+    async def generate_text_batch(
+        self,
+        prompts: List[str],
+        style_profiles: Optional[List[Optional[Dict[str, Any]]]] = None,
+        max_tokens: Optional[int] = None,
+        temperature: Optional[float] = None
+    ) -> List[Dict[str, Any]]:
+        """Mock batch generation by running the mock generator for each prompt."""
+        style_profiles = style_profiles or [None] * len(prompts)
+        return list(await asyncio.gather(*(
+            self.generate_text(prompt, style_profile, max_tokens, temperature)
+            for prompt, style_profile in zip(prompts, style_profiles)
+        )))
+    
     async def generate_text(
         self,
         prompt: str,
         style_profile: Optional[Dict[str, Any]] = None,
         max_tokens: Optional[int] = None,
-        temperature: Optional[float] = None
+        temperature: Optional[float] = None,
+        style_signature: Optional[StyleSignature] = None
     ) -> Dict[str, Any]:
         """Mock text generation with more realistic behavior."""
         await asyncio.sleep(0.2)  # Simulate processing time
         
-        # Generate more sophisticated mock responses
-        responses = [
-            f"Based on your question about '{prompt}', I think it's important to consider multiple perspectives. This topic touches on several key areas that deserve careful analysis.",
-            f"Regarding '{prompt}', my experience suggests that the most effective approach involves understanding the underlying principles. Let me share some insights that might be helpful.",
-            f"When discussing '{prompt}', I find it valuable to examine both the theoretical framework and practical applications. Here's what I've learned from my research and experience.",
-            f"Your question about '{prompt}' is quite thought-provoking. I believe the answer lies in understanding the interconnected nature of these concepts and their real-world implications.",
-            f"Concerning '{prompt}', I'd like to offer a nuanced perspective that considers both the immediate context and the broader implications. This is a topic that requires careful consideration."
-        ]
-        
-        # Select response based on prompt characteristics
-        response_index = hash(prompt) % len(responses)
-        base_response = responses[response_index]
+        # Select response based on prompt characteristics; crc32 is stable across
+        # processes, unlike the salted built-in hash()
+        response_index = zlib.crc32(prompt.encode()) % len(self._RESPONSES)
+        base_response = self._RESPONSES[response_index].format(prompt=prompt)
         
         # Add style-adapted content if profile provided
-        if style_profile:
-            style_metrics = style_profile.get("style_metrics", {})
-            tone = style_profile.get("tone", {})
-            
+        if style_signature is None:
+            style_signature = self._style_signature(style_profile)
+        if style_signature is not None:
             # Add style-specific elements
-            if style_metrics.get("vocabulary_richness", 0.5) > 0.7:
-                base_response += " The complexity of this subject matter demands sophisticated analysis and careful consideration of multiple variables."
-            elif style_metrics.get("vocabulary_richness", 0.5) < 0.3:
-                base_response += " Let me explain this in simple terms that are easy to understand."
+            if style_signature.vocab_richness_bucket > 0:
+                base_response += self._RICH_VOCABULARY_SUFFIX
+            elif style_signature.vocab_richness_bucket < 0:
+                base_response += self._SIMPLE_VOCABULARY_SUFFIX
             
-            if tone.get("primary_tone") == "formal":
-                base_response += " I trust this information will be of assistance to you."
-            elif tone.get("primary_tone") == "casual":
-                base_response += " Hope this helps! Let me know if you have any other questions."
+            base_response += self._TONE_SUFFIXES.get(style_signature.primary_tone, "")
         
         # Truncate if too long
         max_tokens = max_tokens or self.max_new_tokens
         words = base_response.split()
-        if len(words) > max_tokens // 2:
-            base_response = " ".join(words[:max_tokens // 2])
+        n_words = len(words)
+        if n_words > max_tokens // 2:
+            words = words[:max_tokens // 2]
+            n_words = len(words)
+            base_response = " ".join(words)
         
         return {
             "text": base_response,
-            "word_count": len(base_response.split()),
+            "word_count": n_words,
             "char_count": len(base_response),
-            "tokens_generated": len(base_response.split()) * 1.3,
+            "tokens_generated": n_words * 1.3,
             "model_name": f"mock-{self.model_name}",
             "temperature": temperature or self.temperature,
-            "style_adapted": style_profile is not None
+            "style_adapted": style_profile is not None or style_signature is not None
         }
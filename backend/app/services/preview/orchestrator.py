@@ -6,20 +6,54 @@ LLM → TTS → SadTalker → MP4 output
 """
 
 import asyncio
-import json
+import copy
+import functools
+import os
+import time
 import uuid
-from typing import Dict, Any, Optional, List
+from collections import deque
+from typing import Dict, Any, Optional, List, Tuple
 from pathlib import Path
-from datetime import datetime
+from datetime import datetime, timezone
 
 from ..llm.text_generator import TextGenerator
 from ..tts.voice_cloner import VoiceCloner
 from ..lipsync.sadtalker import SadTalkerService
 from ...core.config import settings
 from ...core.logging import get_logger
+from ...core.serialization import dumps_indented, loads
 
 logger = get_logger(__name__)
 
+# Most recent progress steps kept per task
+_MAX_TASK_STEPS = 64
+
+
+def _now_iso() -> str:
+    """Current UTC time as an ISO-8601 string."""
+    return datetime.now(timezone.utc).isoformat()
+
+# Default voice profile, built once; each request gets a deep copy so callers
+# can modify it. Only the metadata (with its creation time) is rebuilt per request.
+_ZERO_EMBED_256 = [0.0] * 256  # Mock embedding
+_ZERO_MFCC_13 = [0.0] * 13
+_DEFAULT_VOICE_PROFILE_TEMPLATE: Dict[str, Any] = {
+    "voice_name": "default",
+    "speaker_embedding": _ZERO_EMBED_256,
+    "prosody_patterns": {
+        "pitch_range": [80, 200],
+        "speaking_rate": 150,
+        "pitch_mean": 140,
+        "energy_mean": 0.5
+    },
+    "acoustic_features": {
+        "mfcc_mean": _ZERO_MFCC_13,
+        "spectral_centroid": 2000.0,
+        "zero_crossing_rate": 0.1
+    },
+    "xtts_ready": True,  # Enable XTTS synthesis
+    "xtts_voice_id": "default",  # Use default voice ID
+}
 
 class PreviewOrchestrator:
     """Orchestrates the complete preview generation pipeline."""
@@ -33,6 +67,9 @@ class PreviewOrchestrator:
         # Task tracking
         self.active_tasks: Dict[str, Dict[str, Any]] = {}
         
+        # (voice profile files signature, existing XTTS profile or None) from the last scan
+        self._default_vp_cache: Optional[Tuple[Optional[tuple], Optional[Dict[str, Any]]]] = None
+        
         logger.info("PreviewOrchestrator initialized")
     
     async def generate_preview_with_id(
@@ -51,8 +88,8 @@ class PreviewOrchestrator:
             self.active_tasks[task_id] = {
                 "status": "started",
                 "progress": 0,
-                "steps": [],
-                "started_at": datetime.utcnow().isoformat(),
+                "steps": deque(maxlen=_MAX_TASK_STEPS),
+                "started_at": _now_iso(),
                 "prompt": prompt
             }
             
@@ -61,9 +98,8 @@ class PreviewOrchestrator:
             # Step 1: Generate text using LLM
             await self._update_task_status(task_id, "generating_text", 10, "Generating text with LLM...")
             
-            text_result = await self.text_generator.generate_with_persona(
-                prompt=prompt,
-                persona_config=persona_config
+            text_result, voice_profile, face_image_path = await self._generate_text_and_resolve_inputs(
+                prompt, persona_config, voice_profile, face_image_path
             )
             
             if "error" in text_result:
@@ -75,13 +111,10 @@ class PreviewOrchestrator:
             # Step 2: Generate speech using TTS
             await self._update_task_status(task_id, "generating_speech", 30, "Generating speech with TTS...")
             
-            if voice_profile is None:
-                # Use default voice profile
-                voice_profile = await self._get_default_voice_profile(persona_config)
-            
             speech_result = await self.voice_cloner.synthesize_speech(
                 text=generated_text,
-                voice_profile=voice_profile
+                voice_profile=voice_profile,
+                persist=True  # SadTalker reads the audio from disk
             )
             
             if "error" in speech_result:
@@ -93,30 +126,10 @@ class PreviewOrchestrator:
             # Step 3: Generate video using SadTalker
             await self._update_task_status(task_id, "generating_video", 60, "Generating video with SadTalker...")
             
-            if face_image_path is None:
-                # Use default face image from persona config
-                face_image_path = self._get_default_face_image(persona_config)
-            
-            # Create progress callback for SadTalker
-            def sadtalker_progress_callback(progress: int, stage: str):
-                # Map SadTalker progress (0-100) to overall progress (60-90)
-                overall_progress = 60 + int((progress * 0.3))
-                # Update task status synchronously
-                if task_id in self.active_tasks:
-                    self.active_tasks[task_id]["current_step"] = "generating_video"
-                    self.active_tasks[task_id]["progress"] = overall_progress
-                    self.active_tasks[task_id]["steps"].append({
-                        "step": "generating_video",
-                        "progress": overall_progress,
-                        "message": f"SadTalker: {stage}",
-                        "timestamp": datetime.utcnow().isoformat()
-                    })
-                    logger.info(f"Task {task_id} progress: {overall_progress}% - SadTalker: {stage}")
-            
             video_result = await self.sadtalker.generate_video(
                 face_image_path=face_image_path,
                 audio_path=audio_path,
-                progress_callback=sadtalker_progress_callback
+                progress_callback=self._make_sadtalker_callback(task_id)
             )
             
             if "error" in video_result:
@@ -132,7 +145,8 @@ class PreviewOrchestrator:
             # Mark task as completed
             self.active_tasks[task_id]["status"] = "completed"
             self.active_tasks[task_id]["progress"] = 100
-            self.active_tasks[task_id]["completed_at"] = datetime.utcnow().isoformat()
+            self.active_tasks[task_id]["completed_at"] = _now_iso()
+            self.active_tasks[task_id]["finish_ts"] = time.time()
             
             logger.info(f"Preview generation completed: {task_id}")
             return preview_result
@@ -141,7 +155,8 @@ class PreviewOrchestrator:
             logger.error(f"Preview generation failed for task {task_id}: {e}")
             self.active_tasks[task_id]["status"] = "failed"
             self.active_tasks[task_id]["error"] = str(e)
-            self.active_tasks[task_id]["failed_at"] = datetime.utcnow().isoformat()
+            self.active_tasks[task_id]["failed_at"] = _now_iso()
+            self.active_tasks[task_id]["finish_ts"] = time.time()
             
             return {
                 "task_id": task_id,
@@ -169,111 +184,63 @@ class PreviewOrchestrator:
         Returns:
             Dict with preview generation results
         """
-        task_id = str(uuid.uuid4())
+        return await self.generate_preview_with_id(
+            str(uuid.uuid4()), prompt, persona_config, voice_profile, face_image_path
+        )
+    
+    async def _generate_text_and_resolve_inputs(
+        self,
+        prompt: str,
+        persona_config: Dict[str, Any],
+        voice_profile: Optional[Dict[str, Any]],
+        face_image_path: Optional[str]
+    ) -> tuple:
+        """Generate text while looking up the default voice profile and face image.
         
+        Neither lookup depends on the generated text, so their disk I/O runs
+        alongside the LLM instead of after it.
+        """
         try:
-            # Initialize task tracking
-            self.active_tasks[task_id] = {
-                "status": "started",
-                "progress": 0,
-                "steps": [],
-                "started_at": datetime.utcnow().isoformat(),
-                "prompt": prompt
-            }
-            
-            logger.info(f"Starting preview generation task {task_id}")
-            
-            # Step 1: Generate text using LLM
-            await self._update_task_status(task_id, "generating_text", 10, "Generating text with LLM...")
-            
-            text_result = await self.text_generator.generate_with_persona(
-                prompt=prompt,
-                persona_config=persona_config
-            )
-            
-            if "error" in text_result:
-                raise Exception(f"Text generation failed: {text_result['error']}")
-            
-            generated_text = text_result["text"]
-            logger.info(f"Generated text: {generated_text[:100]}...")
-            
-            # Step 2: Generate speech using TTS
-            await self._update_task_status(task_id, "generating_speech", 30, "Generating speech with TTS...")
-            
-            if voice_profile is None:
-                # Use default voice profile
-                voice_profile = await self._get_default_voice_profile(persona_config)
-            
-            speech_result = await self.voice_cloner.synthesize_speech(
-                text=generated_text,
-                voice_profile=voice_profile
-            )
-            
-            if "error" in speech_result:
-                raise Exception(f"Speech synthesis failed: {speech_result['error']}")
-            
-            audio_path = speech_result["output_path"]
-            logger.info(f"Generated speech: {audio_path}")
-            
-            # Step 3: Generate video using SadTalker
-            await self._update_task_status(task_id, "generating_video", 60, "Generating video with SadTalker...")
-            
-            if face_image_path is None:
-                # Use default face image from persona config
-                face_image_path = self._get_default_face_image(persona_config)
-            
-            # Create progress callback for SadTalker
-            def sadtalker_progress_callback(progress: int, stage: str):
-                # Map SadTalker progress (0-100) to overall progress (60-90)
-                overall_progress = 60 + int((progress * 0.3))
-                # Update task status synchronously
-                if task_id in self.active_tasks:
-                    self.active_tasks[task_id]["current_step"] = "generating_video"
-                    self.active_tasks[task_id]["progress"] = overall_progress
-                    self.active_tasks[task_id]["steps"].append({
-                        "step": "generating_video",
-                        "progress": overall_progress,
-                        "message": f"SadTalker: {stage}",
-                        "timestamp": datetime.utcnow().isoformat()
-                    })
-                    logger.info(f"Task {task_id} progress: {overall_progress}% - SadTalker: {stage}")
-            
-            video_result = await self.sadtalker.generate_video(
-                face_image_path=face_image_path,
-                audio_path=audio_path,
-                progress_callback=sadtalker_progress_callback
-            )
-            
-            if "error" in video_result:
-                raise Exception(f"Video generation failed: {video_result['error']}")
-            
-            # Step 4: Finalize preview
-            await self._update_task_status(task_id, "finalizing", 90, "Finalizing preview...")
-            
-            preview_result = await self._finalize_preview(
-                task_id, text_result, speech_result, video_result
+            async with asyncio.TaskGroup() as tg:
+                text_task = tg.create_task(self.text_generator.generate_with_persona(
+                    prompt=prompt,
+                    persona_config=persona_config
+                ))
+                voice_task = None
+                if voice_profile is None:
+                    # Use default voice profile
+                    voice_task = tg.create_task(self._get_default_voice_profile(persona_config))
+                face_task = None
+                if face_image_path is None:
+                    # Use default face image from persona config
+                    face_task = tg.create_task(asyncio.to_thread(self._get_default_face_image, persona_config))
+        except ExceptionGroup as group:
+            # Surface the original error in the task status rather than the group
+            raise group.exceptions[0]
+        
+        if voice_task is not None:
+            voice_profile = voice_task.result()
+        if face_task is not None:
+            face_image_path = face_task.result()
+        
+        return text_task.result(), voice_profile, face_image_path
+    
+    def _make_sadtalker_callback(self, task_id: str):
+        """Create the SadTalker progress callback for a task."""
+        return functools.partial(self._on_sadtalker_progress, task_id)
+    
+    def _on_sadtalker_progress(self, task_id: str, progress: int, stage: str):
+        """Record SadTalker progress on a task."""
+        # Map SadTalker progress (0-100) to overall progress (60-90)
+        overall_progress = 60 + int((progress * 0.3))
+        # Update task status synchronously
+        if task_id in self.active_tasks:
+            self.active_tasks[task_id]["current_step"] = "generating_video"
+            self.active_tasks[task_id]["progress"] = overall_progress
+            self.active_tasks[task_id]["steps"].append(
+                (time.time_ns(), "generating_video", overall_progress, f"SadTalker: {stage}")
             )
-            
-            # Mark task as completed
-            self.active_tasks[task_id]["status"] = "completed"
-            self.active_tasks[task_id]["progress"] = 100
-            self.active_tasks[task_id]["completed_at"] = datetime.utcnow().isoformat()
-            
-            logger.info(f"Preview generation completed: {task_id}")
-            return preview_result
-            
-        except Exception as e:
-            logger.error(f"Preview generation failed for task {task_id}: {e}")
-            self.active_tasks[task_id]["status"] = "failed"
-            self.active_tasks[task_id]["error"] = str(e)
-            self.active_tasks[task_id]["failed_at"] = datetime.utcnow().isoformat()
-            
-            return {
-                "task_id": task_id,
-                "status": "failed",
-                "error": str(e),
-                "progress": self.active_tasks[task_id].get("progress", 0)
-            }
+            logger.info(f"Task {task_id} progress: {overall_progress}% - SadTalker: {stage}")
     
     async def _update_task_status(
         self, 
@@ -286,55 +253,68 @@ class PreviewOrchestrator:
         if task_id in self.active_tasks:
             self.active_tasks[task_id]["current_step"] = step
             self.active_tasks[task_id]["progress"] = progress
-            self.active_tasks[task_id]["steps"].append({
-                "step": step,
-                "progress": progress,
-                "message": message,
-                "timestamp": datetime.utcnow().isoformat()
-            })
+            # Compact (timestamp, step, progress, message) entries, formatted on read
+            self.active_tasks[task_id]["steps"].append((time.time_ns(), step, progress, message))
     
     async def _get_default_voice_profile(self, persona_config: Dict[str, Any]) -> Dict[str, Any]:
         """Get default voice profile from persona config."""
-        voice_config = persona_config.get("voice", {})
-        
         # Try to load an existing voice profile first
         voice_profiles_dir = settings.artifacts_dir / "voice"
-        if voice_profiles_dir.exists():
-            # Look for any existing voice profile
-            for profile_file in voice_profiles_dir.glob("*.json"):
-                if "metadata" not in profile_file.name:  # Skip metadata files
-                    try:
-                        with open(profile_file, 'r') as f:
-                            profile = json.load(f)
-                            if profile.get("xtts_ready") and profile.get("xtts_voice_id"):
-                                logger.info(f"Using existing voice profile: {profile_file.name}")
-                                return profile
-                    except Exception as e:
-                        logger.warning(f"Failed to load voice profile {profile_file}: {e}")
-                        continue
+        
+        # Listing the directory is cheap next to parsing every profile, so the scan is
+        # reused until a profile file is added, removed or edited; keeping it off the
+        # event loop lets it overlap text generation
+        signature = await asyncio.to_thread(self._voice_profiles_signature, voice_profiles_dir)
+        if self._default_vp_cache is not None and self._default_vp_cache[0] == signature:
+            profile = self._default_vp_cache[1]
+        else:
+            profile = (
+                await asyncio.to_thread(self._scan_voice_profiles, voice_profiles_dir)
+                if signature is not None else None
+            )
+            self._default_vp_cache = (signature, profile)
+        
+        if profile is not None:
+            return copy.deepcopy(profile)
         
         # Create a default voice profile with XTTS support
-        return {
-            "voice_name": "default",
-            "speaker_embedding": [0.0] * 256,  # Mock embedding
-            "prosody_patterns": {
-                "pitch_range": [80, 200],
-                "speaking_rate": 150,
-                "pitch_mean": 140,
-                "energy_mean": 0.5
-            },
-            "acoustic_features": {
-                "mfcc_mean": [0.0] * 13,
-                "spectral_centroid": 2000.0,
-                "zero_crossing_rate": 0.1
-            },
-            "xtts_ready": True,  # Enable XTTS synthesis
-            "xtts_voice_id": "default",  # Use default voice ID
-            "metadata": {
-                "created_at": datetime.utcnow().isoformat(),
-                "extraction_method": "default"
-            }
+        profile = copy.deepcopy(_DEFAULT_VOICE_PROFILE_TEMPLATE)
+        profile["metadata"] = {
+            "created_at": _now_iso(),
+            "extraction_method": "default"
         }
+        return profile
+    
+    @staticmethod
+    def _voice_profiles_signature(voice_profiles_dir: Path) -> Optional[tuple]:
+        """Name, mtime and size of every candidate profile file, or None if the directory is missing."""
+        try:
+            with os.scandir(voice_profiles_dir) as entries:
+                return tuple(sorted(
+                    (entry.name, stat.st_mtime_ns, stat.st_size)
+                    for entry in entries
+                    if entry.name.endswith(".json") and "metadata" not in entry.name
+                    for stat in (entry.stat(),)
+                ))
+        except OSError:
+            return None
+    
+    def _scan_voice_profiles(self, voice_profiles_dir: Path) -> Optional[Dict[str, Any]]:
+        """Return the first XTTS-ready voice profile in the directory, if any."""
+        with os.scandir(voice_profiles_dir) as entries:
+            for entry in entries:
+                # Skip metadata files
+                if not entry.name.endswith(".json") or "metadata" in entry.name:
+                    continue
+                try:
+                    with open(entry.path, 'rb') as f:
+                        profile = loads(f.read())
+                    if profile.get("xtts_ready") and profile.get("xtts_voice_id"):
+                        logger.info(f"Using existing voice profile: {entry.name}")
+                        return profile
+                except Exception as e:
+                    logger.warning(f"Failed to load voice profile {entry.path}: {e}")
+        return None
     
     def _get_default_face_image(self, persona_config: Dict[str, Any]) -> str:
         """Get default face image path from persona config."""
@@ -372,7 +352,7 @@ class PreviewOrchestrator:
         preview_metadata = {
             "task_id": task_id,
             "status": "completed",
-            "generated_at": datetime.utcnow().isoformat(),
+            "generated_at": _now_iso(),
             "text": {
                 "generated_text": text_result["text"],
                 "word_count": text_result["word_count"],
@@ -396,8 +376,7 @@ class PreviewOrchestrator:
         
         # Save metadata
         metadata_path = settings.data_dir / "outputs" / f"preview_{task_id}_metadata.json"
-        with open(metadata_path, 'w') as f:
-            json.dump(preview_metadata, f, indent=2)
+        await asyncio.to_thread(metadata_path.write_bytes, dumps_indented(preview_metadata))
         
         return {
             "task_id": task_id,
@@ -411,36 +390,46 @@ class PreviewOrchestrator:
     
     async def get_task_status(self, task_id: str) -> Optional[Dict[str, Any]]:
         """Get status of a preview generation task."""
-        return self.active_tasks.get(task_id)
+        task_data = self.active_tasks.get(task_id)
+        return self._task_view(task_data) if task_data is not None else None
     
     async def list_active_tasks(self) -> List[Dict[str, Any]]:
         """List all active preview generation tasks."""
-        return list(self.active_tasks.values())
+        return [self._task_view(task_data) for task_data in self.active_tasks.values()]
+    
+    @staticmethod
+    def _task_view(task_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Copy task data with its progress steps expanded into dicts."""
+        view = dict(task_data)
+        view["steps"] = [
+            {
+                "step": step,
+                "progress": progress,
+                "message": message,
+                "timestamp": datetime.fromtimestamp(timestamp_ns / 1e9, timezone.utc).isoformat()
+            }
+            for timestamp_ns, step, progress, message in task_data.get("steps", ())
+        ]
+        return view
     
     async def cancel_task(self, task_id: str) -> bool:
         """Cancel a preview generation task."""
         if task_id in self.active_tasks:
             self.active_tasks[task_id]["status"] = "cancelled"
-            self.active_tasks[task_id]["cancelled_at"] = datetime.utcnow().isoformat()
+            self.active_tasks[task_id]["cancelled_at"] = _now_iso()
+            self.active_tasks[task_id]["finish_ts"] = time.time()
             return True
         return False
     
     async def cleanup_old_tasks(self, max_age_hours: int = 24):
         """Clean up old completed tasks."""
-        cutoff_time = datetime.utcnow().timestamp() - (max_age_hours * 3600)
+        cutoff_time = time.time() - (max_age_hours * 3600)
         
-        tasks_to_remove = []
-        for task_id, task_data in self.active_tasks.items():
-            if task_data.get("status") in ["completed", "failed", "cancelled"]:
-                completed_at = task_data.get("completed_at") or task_data.get("failed_at") or task_data.get("cancelled_at")
-                if completed_at:
-                    try:
-                        task_time = datetime.fromisoformat(completed_at.replace('Z', '+00:00')).timestamp()
-                        if task_time < cutoff_time:
-                            tasks_to_remove.append(task_id)
-                    except Exception:
-                        # If we can't parse the timestamp, remove the task
-                        tasks_to_remove.append(task_id)
+        # finish_ts is only set once a task completes, fails or is cancelled
+        tasks_to_remove = [
+            task_id for task_id, task_data in self.active_tasks.items()
+            if task_data.get("finish_ts", float("inf")) < cutoff_time
+        ]
         
         for task_id in tasks_to_remove:
             del self.active_tasks[task_id]
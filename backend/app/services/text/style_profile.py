@@ -1,49 +1,100 @@
 """Text style profile analysis and generation."""
 
-import json
+import copy
+import hashlib
 import logging
 import re
+import threading
 from pathlib import Path
 from typing import Dict, List, Any, Optional
-from collections import Counter
+from collections import Counter, OrderedDict
+
+import numpy as np
+
+from ...core.serialization import dumps_indented
 
 logger = logging.getLogger(__name__)
 
+# Precompiled once at import instead of on every profile
+_WHITESPACE_RE = re.compile(r'\s+')
+_CTRL_RE = re.compile(r'[\x00-\x08\x0b\x0c\x0e-\x1f\x7f]')
+_WORD_RE = re.compile(r'\b[a-zA-Z]+\b')
+# A sentence is a run between terminators, trimmed of surrounding whitespace
+_SENTENCE_RE = re.compile(r'[^.!?\s](?:[^.!?]*[^.!?\s])?')
+
+# Common stop words excluded from the most-common-words list
+_STOP_WORDS = frozenset({
+    'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by',
+    'is', 'are', 'was', 'were', 'be', 'been', 'being', 'have', 'has', 'had', 'do', 'does', 'did',
+    'will', 'would', 'could', 'should', 'may', 'might', 'must', 'can', 'this', 'that', 'these', 'those',
+    'i', 'you', 'he', 'she', 'it', 'we', 'they', 'me', 'him', 'her', 'us', 'them'
+})
+
+# Byte lookup table for syllable counting
+_VOWEL_MASK = np.zeros(256, dtype=bool)
+_VOWEL_MASK[list(b'aeiouy')] = True
+
+# Tone indicator words, counted as whole words
+_POSITIVE_WORDS = frozenset({'good', 'great', 'excellent', 'amazing', 'wonderful', 'fantastic', 'love', 'like', 'enjoy', 'happy', 'pleased', 'satisfied'})
+_NEGATIVE_WORDS = frozenset({'bad', 'terrible', 'awful', 'hate', 'dislike', 'angry', 'sad', 'disappointed', 'frustrated', 'annoyed'})
+_FORMAL_WORDS = frozenset({'therefore', 'however', 'furthermore', 'moreover', 'consequently', 'nevertheless', 'thus', 'hence'})
+_CASUAL_WORDS = frozenset({'yeah', 'ok', 'cool', 'awesome', 'hey', 'hi', 'gonna', 'wanna', 'gotta'})
+_TONE_WORDS = {
+    "positive": _POSITIVE_WORDS,
+    "negative": _NEGATIVE_WORDS,
+    "formal": _FORMAL_WORDS,
+    "casual": _CASUAL_WORDS
+}
+_TONE_CATEGORY = {word: category for category, words in _TONE_WORDS.items() for word in words}
+
+# Profiles of recently analyzed texts keyed by content digest, least recently used first
+_PROFILE_CACHE: "OrderedDict[bytes, Dict[str, Any]]" = OrderedDict()
+_PROFILE_CACHE_SIZE = 128
+_profile_cache_lock = threading.Lock()
+
 
 class TextStyleProfile:
     """Analyzes text to create a style profile."""
     
     def __init__(self, text: str):
         self.text = text
-        self.cleaned_text = self._clean_text(text)
-        self.words = self._tokenize(self.cleaned_text)
-        self.sentences = self._split_sentences(self.cleaned_text)
-        self.paragraphs = self._split_paragraphs(self.cleaned_text)
-    
-    def _clean_text(self, text: str) -> str:
-        """Clean and normalize text."""
-        # Remove extra whitespace
-        text = re.sub(r'\s+', ' ', text.strip())
-        # Remove control characters
-        text = re.sub(r'[\x00-\x08\x0b\x0c\x0e-\x1f\x7f]', '', text)
-        return text
-    
-    def _tokenize(self, text: str) -> List[str]:
-        """Simple word tokenization."""
-        # Split on whitespace and punctuation, keep only alphanumeric
-        words = re.findall(r'\b[a-zA-Z]+\b', text.lower())
-        return words
-    
-    def _split_sentences(self, text: str) -> List[str]:
-        """Split text into sentences."""
-        # Simple sentence splitting on common sentence endings
-        sentences = re.split(r'[.!?]+', text)
-        return [s.strip() for s in sentences if s.strip()]
-    
-    def _split_paragraphs(self, text: str) -> List[str]:
-        """Split text into paragraphs."""
-        paragraphs = text.split('\n\n')
-        return [p.strip() for p in paragraphs if p.strip()]
+        self._parse(text)
+    
+    def _parse(self, text: str) -> None:
+        """Clean the text and extract words, sentence statistics and paragraph count."""
+        # Normalize whitespace and remove control characters
+        cleaned = _CTRL_RE.sub('', _WHITESPACE_RE.sub(' ', text.strip()))
+        self.cleaned_text = cleaned
+        
+        # Keep only alphabetic words
+        self.words = _WORD_RE.findall(cleaned.lower())
+        
+        # Stream sentences, keeping only the count and the (start, end) offsets
+        # of the first, last, longest and shortest ones
+        sentence_count = 0
+        first = last = longest = shortest = None
+        longest_len = -1
+        shortest_len = len(cleaned) + 1
+        for match in _SENTENCE_RE.finditer(cleaned):
+            span = match.span()
+            length = span[1] - span[0]
+            sentence_count += 1
+            if first is None:
+                first = span
+            last = span
+            if length > longest_len:
+                longest, longest_len = span, length
+            if length < shortest_len:
+                shortest, shortest_len = span, length
+        self.sentence_count = sentence_count
+        self.sample_spans = (first, last, longest, shortest) if sentence_count else None
+        
+        # Whitespace is normalized above, so the cleaned text is one paragraph
+        self.paragraph_count = 1 if cleaned else 0
+    
+    def _sentence(self, span: tuple) -> str:
+        """Slice a sentence out of the cleaned text."""
+        return self.cleaned_text[span[0]:span[1]]
     
     def analyze(self) -> Dict[str, Any]:
         """Analyze text and return style profile."""
@@ -52,8 +103,8 @@ class TextStyleProfile:
         
         # Basic statistics
         word_count = len(self.words)
-        sentence_count = len(self.sentences)
-        paragraph_count = len(self.paragraphs)
+        sentence_count = self.sentence_count
+        paragraph_count = self.paragraph_count
         
         # Average sentence length
         avg_sentence_length = word_count / sentence_count if sentence_count > 0 else 0
@@ -66,21 +117,15 @@ class TextStyleProfile:
         vocabulary_richness = unique_words / word_count if word_count > 0 else 0
         
         # Most common words (excluding common stop words)
-        stop_words = {
-            'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by',
-            'is', 'are', 'was', 'were', 'be', 'been', 'being', 'have', 'has', 'had', 'do', 'does', 'did',
-            'will', 'would', 'could', 'should', 'may', 'might', 'must', 'can', 'this', 'that', 'these', 'those',
-            'i', 'you', 'he', 'she', 'it', 'we', 'they', 'me', 'him', 'her', 'us', 'them'
-        }
-        
-        filtered_words = [w for w in self.words if w not in stop_words and len(w) > 2]
-        word_freq = Counter(filtered_words)
+        word_freq = Counter(w for w in self.words if len(w) > 2 and w not in _STOP_WORDS)
+        filtered_count = sum(word_freq.values())
         most_common = word_freq.most_common(20)
         
-        # Punctuation analysis
-        punctuation_count = len(re.findall(r'[.!?,:;]', self.text))
-        exclamation_count = len(re.findall(r'!', self.text))
-        question_count = len(re.findall(r'\?', self.text))
+        # Punctuation analysis; str.count scans single characters in C without regex overhead
+        text = self.text
+        exclamation_count = text.count('!')
+        question_count = text.count('?')
+        punctuation_count = exclamation_count + question_count + sum(text.count(c) for c in '.,:;')
         
         # Reading level estimation (simplified Flesch Reading Ease)
         syllables = self._count_syllables(self.words)
@@ -109,7 +154,7 @@ class TextStyleProfile:
             "vocabulary": {
                 "most_common_words": most_common,
                 "vocabulary_size": unique_words,
-                "stop_word_ratio": round((word_count - len(filtered_words)) / word_count, 3) if word_count > 0 else 0
+                "stop_word_ratio": round((word_count - filtered_count) / word_count, 3) if word_count > 0 else 0
             },
             "punctuation": {
                 "exclamation_ratio": round(exclamation_count / word_count, 3) if word_count > 0 else 0,
@@ -117,67 +162,65 @@ class TextStyleProfile:
                 "total_punctuation": punctuation_count
             },
             "tone": tone_indicators,
-            "text_samples": {
-                "first_sentence": self.sentences[0] if self.sentences else "",
-                "last_sentence": self.sentences[-1] if self.sentences else "",
-                "longest_sentence": max(self.sentences, key=len) if self.sentences else "",
-                "shortest_sentence": min(self.sentences, key=len) if self.sentences else ""
+            "text_samples": self._text_samples()
+        }
+    
+    def _text_samples(self) -> Dict[str, str]:
+        """Slice out the sample sentences found while parsing."""
+        if self.sample_spans is None:
+            return {
+                "first_sentence": "",
+                "last_sentence": "",
+                "longest_sentence": "",
+                "shortest_sentence": ""
             }
+        
+        first, last, longest, shortest = self.sample_spans
+        return {
+            "first_sentence": self._sentence(first),
+            "last_sentence": self._sentence(last),
+            "longest_sentence": self._sentence(longest),
+            "shortest_sentence": self._sentence(shortest)
         }
     
     def _count_syllables(self, words: List[str]) -> int:
-        """Count syllables in words (simplified)."""
-        total = 0
-        for word in words:
-            # Simple syllable counting: count vowel groups
-            vowels = 'aeiouy'
-            word = word.lower()
-            if word:
-                # Count vowel groups
-                vowel_groups = 0
-                prev_was_vowel = False
-                for char in word:
-                    is_vowel = char in vowels
-                    if is_vowel and not prev_was_vowel:
-                        vowel_groups += 1
-                    prev_was_vowel = is_vowel
-                
-                # Handle silent 'e'
-                if word.endswith('e') and vowel_groups > 1:
-                    vowel_groups -= 1
-                
-                # Minimum 1 syllable per word
-                total += max(1, vowel_groups)
-        
-        return total
-    
-    def _analyze_tone(self) -> Dict[str, float]:
-        """Analyze tone indicators (simplified)."""
-        text_lower = self.text.lower()
+        """Count syllables in words (simplified).
+        
+        Counts vowel groups per word over one byte buffer of the space-joined
+        words; tokenization guarantees the words are ASCII letters.
+        """
+        if not words:
+            return 0
         
-        # Positive indicators
-        positive_words = ['good', 'great', 'excellent', 'amazing', 'wonderful', 'fantastic', 'love', 'like', 'enjoy', 'happy', 'pleased', 'satisfied']
-        positive_count = sum(text_lower.count(word) for word in positive_words)
+        buf = np.frombuffer(' '.join(words).lower().encode(), dtype=np.uint8)
+        vowels = _VOWEL_MASK[buf]
         
-        # Negative indicators
-        negative_words = ['bad', 'terrible', 'awful', 'hate', 'dislike', 'angry', 'sad', 'disappointed', 'frustrated', 'annoyed']
-        negative_count = sum(text_lower.count(word) for word in negative_words)
+        # A vowel group starts at a vowel not preceded by a vowel; the separating
+        # spaces keep groups from spanning words
+        group_starts = vowels.copy()
+        group_starts[1:] &= ~vowels[:-1]
         
-        # Formal indicators
-        formal_words = ['therefore', 'however', 'furthermore', 'moreover', 'consequently', 'nevertheless', 'thus', 'hence']
-        formal_count = sum(text_lower.count(word) for word in formal_words)
+        lengths = np.fromiter(map(len, words), dtype=np.intp, count=len(words))
+        starts = np.zeros(len(words), dtype=np.intp)
+        np.cumsum(lengths[:-1] + 1, out=starts[1:])
+        vowel_groups = np.add.reduceat(group_starts.astype(np.intp), starts)
         
-        # Casual indicators
-        casual_words = ['yeah', 'ok', 'cool', 'awesome', 'hey', 'hi', 'gonna', 'wanna', 'gotta']
-        casual_count = sum(text_lower.count(word) for word in casual_words)
+        # Handle silent 'e'
+        silent_e = (buf[starts + lengths - 1] == ord('e')) & (vowel_groups > 1)
+        vowel_groups -= silent_e
         
+        # Minimum 1 syllable per word
+        return int(np.maximum(vowel_groups, 1).sum())
+    
+    def _analyze_tone(self) -> Dict[str, float]:
+        """Analyze tone indicators (simplified)."""
+        # Tone words are alphabetic, so whole-word matches are exactly the word tokens
+        counts = Counter(_TONE_CATEGORY[word] for word in self.words if word in _TONE_CATEGORY)
         total_words = len(self.words)
         
         return {
-            "positive": round(positive_count / total_words, 3) if total_words > 0 else 0,
-            "negative": round(negative_count / total_words, 3) if total_words > 0 else 0,
-            "formal": round(formal_count / total_words, 3) if total_words > 0 else 0,
-            "casual": round(casual_count / total_words, 3) if total_words > 0 else 0
+            category: round(counts[category] / total_words, 3) if total_words > 0 else 0
+            for category in _TONE_WORDS
         }
     
     def _empty_profile(self) -> Dict[str, Any]:
@@ -224,12 +267,14 @@ class TextStyleProfile:
     
     def save_profile(self, output_path: Path) -> None:
         """Save style profile to JSON file."""
-        profile = self.analyze()
-        
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(profile, f, indent=2, ensure_ascii=False)
-        
-        logger.info(f"Style profile saved to: {output_path}")
+        _write_profile(self.analyze(), output_path)
+
+
+def _write_profile(profile: Dict[str, Any], output_path: Path) -> None:
+    """Write a style profile to a JSON file."""
+    output_path.write_bytes(dumps_indented(profile))
+    
+    logger.info(f"Style profile saved to: {output_path}")
 
 
 def create_style_profile(text: str, output_path: Path) -> Dict[str, Any]:
@@ -243,11 +288,22 @@ def create_style_profile(text: str, output_path: Path) -> Dict[str, Any]:
     # Ensure output directory exists
     output_path.parent.mkdir(parents=True, exist_ok=True)
     
-    # Create and analyze profile
-    profile_analyzer = TextStyleProfile(text)
-    profile = profile_analyzer.analyze()
+    # Reuse the analysis of identical text, e.g. while iterating on a persona
+    key = hashlib.sha256(text.encode()).digest()[:16]
+    with _profile_cache_lock:
+        profile = _PROFILE_CACHE.get(key)
+        if profile is not None:
+            _PROFILE_CACHE.move_to_end(key)
+    
+    if profile is None:
+        profile = TextStyleProfile(text).analyze()
+        with _profile_cache_lock:
+            _PROFILE_CACHE[key] = profile
+            if len(_PROFILE_CACHE) > _PROFILE_CACHE_SIZE:
+                _PROFILE_CACHE.popitem(last=False)
     
     # Save profile
-    profile_analyzer.save_profile(output_path)
+    _write_profile(profile, output_path)
     
-    return profile
+    # Callers get their own copy so the cached profile stays intact
+    return copy.deepcopy(profile)
@@ -6,30 +6,83 @@ Generates audio from text using cloned voice characteristics.
 """
 
 import asyncio
-import json
+import functools
+import importlib.util
+import io
+import os
+import secrets
+import subprocess
+import tempfile
+import threading
+import time
+import uuid
 import numpy as np
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Dict, Any, Optional, Tuple, List
+from typing import Dict, Any, AsyncIterator, Optional, Tuple, List, Union
 from pathlib import Path
 import logging
 
+# torch, torchaudio and librosa take seconds to import and the mock and Foundry
+# paths never touch them, so they are imported only where they are used
 try:
-    import torch
-    import torchaudio
-    import librosa
     import soundfile as sf
-    TORCH_AVAILABLE = True
+    SOUNDFILE_AVAILABLE = True
+except ImportError:
+    SOUNDFILE_AVAILABLE = False
+
+# soxr resamples in C with SIMD kernels, far faster than librosa's default path
+try:
+    import soxr
+    SOXR_AVAILABLE = True
 except ImportError:
-    TORCH_AVAILABLE = False
+    SOXR_AVAILABLE = False
 
 from ...core.config import settings
 from ...core.logging import get_logger
+from ...core.serialization import dumps_indented, loads
 from ...services.foundry.local_client import FoundryLocalClient
-from .xtts_real import RealXTTSService
 
 logger = get_logger(__name__)
 
 
+@functools.lru_cache(maxsize=None)
+def _torch_available() -> bool:
+    """Whether PyTorch is installed, checked without importing it."""
+    return importlib.util.find_spec("torch") is not None
+
+
+@functools.lru_cache(maxsize=None)
+def _has_cuda() -> bool:
+    """Whether a CUDA device is usable; imports torch on first call only."""
+    if not _torch_available():
+        return False
+    import torch
+    return torch.cuda.is_available()
+
+
+# One period of a sine wave; mock synthesis looks samples up instead of calling np.sin
+_SINE_LUT_SIZE = 4096
+_SINE_LUT = np.sin(np.linspace(0, 2 * np.pi, _SINE_LUT_SIZE, endpoint=False)).astype(np.float32)
+
+
+def _lut_sin(cycles: np.ndarray) -> np.ndarray:
+    """Approximate sin(2 * pi * cycles) for non-negative cycles with the lookup table."""
+    return _SINE_LUT[(cycles % 1.0 * _SINE_LUT_SIZE).astype(np.int32)]
+
+
+def _is_iso_bmff(data: bytes) -> bool:
+    """Whether data starts like an MP4/M4A/MOV file (an ftyp box)."""
+    return data[4:8] == b"ftyp"
+
+
+def _to_int16(audio_array: np.ndarray) -> np.ndarray:
+    """Clip float audio to [-1, 1] and convert to int16, reusing the input buffer."""
+    np.clip(audio_array, -1.0, 1.0, out=audio_array)
+    audio_array *= 32767.0
+    return audio_array.astype(np.int16, copy=False)
+
+
 class VoiceCloner:
     """Local TTS with voice cloning using XTTS-v2."""
     
@@ -40,7 +93,8 @@ class VoiceCloner:
         Args:
             device: Device to run on ("cpu", "cuda", "auto")
         """
-        self.device = self._get_device(device)
+        # Resolved on first use, since probing for CUDA imports torch
+        self._device = device
         self.model = None
         self.is_initialized = False
         
@@ -57,22 +111,55 @@ class VoiceCloner:
         self.voice_profiles_dir = settings.artifacts_dir / "voice"
         self.voice_profiles_dir.mkdir(parents=True, exist_ok=True)
         
+        # Per-instance generator for mock embeddings; avoids the legacy global RNG
+        self._rng = np.random.default_rng()
+        
+        # voice name -> (profile file mtime, parsed profile)
+        self._profile_cache: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+        # Listing fields of each profile file, keyed by path, with the mtime_ns they were read at
+        self._profile_headers: Dict[str, Tuple[int, Dict[str, Any]]] = {}
+        
+        # Serializes XTTS speaker encoding so concurrent clones overlap only their decoding
+        self._encoder_lock = threading.Lock()
+        
         # Foundry Local client
         self.foundry_client = FoundryLocalClient()
         
-        # Real XTTS service - handle initialization failure gracefully
-        try:
-            self.xtts_service = RealXTTSService()
-        except Exception as e:
-            logger.warning(f"Failed to initialize XTTS service: {e}")
-            self.xtts_service = None
+        # Real XTTS service, created on first use since it imports torch
+        self._xtts_service = None
+        self._xtts_service_created = False
         
-        logger.info(f"Initializing VoiceCloner on device: {self.device}")
+        logger.info(f"Initializing VoiceCloner on device: {device}")
+    
+    @property
+    def device(self) -> str:
+        """Device to run on, with "auto" resolved on first access."""
+        if self._device == "auto":
+            self._device = self._get_device("auto")
+        return self._device
+    
+    @property
+    def xtts_service(self):
+        """Real XTTS service, or None if it failed to initialize."""
+        if not self._xtts_service_created:
+            self._xtts_service_created = True
+            # Handle initialization failure gracefully
+            try:
+                from .xtts_real import RealXTTSService
+                self._xtts_service = RealXTTSService(device=self.device)
+            except Exception as e:
+                logger.warning(f"Failed to initialize XTTS service: {e}")
+        return self._xtts_service
+    
+    @xtts_service.setter
+    def xtts_service(self, service):
+        self._xtts_service = service
+        self._xtts_service_created = True
     
     def _get_device(self, device: str) -> str:
         """Determine the best available device."""
         if device == "auto":
-            if TORCH_AVAILABLE and torch.cuda.is_available():
+            if _has_cuda():
                 return "cuda"
             return "cpu"
         return device
@@ -82,7 +169,7 @@ class VoiceCloner:
         if self.is_initialized:
             return
         
-        if not TORCH_AVAILABLE:
+        if not _torch_available():
             logger.warning("PyTorch not available, using mock implementation")
             self.is_initialized = True
             return
@@ -124,29 +211,36 @@ class VoiceCloner:
             await self._load_model()
             
             # Process reference audio
-            audio_array = self._process_audio(reference_audio)
+            # ffmpeg decoding and file I/O run on worker threads to keep the event loop free
+            audio_array = await asyncio.to_thread(self._process_audio_sync, reference_audio)
             if audio_array is None:
                 return {"error": "Failed to process reference audio"}
             
-            # Save reference audio to temporary file for XTTS
-            import tempfile
-            import os
-            with tempfile.NamedTemporaryFile(suffix='.wav', delete=False) as temp_file:
-                temp_audio_path = temp_file.name
-                sf.write(temp_audio_path, audio_array, 22050)
+            # Save the processed audio as WAV once; XTTS reads the same artifact
+            audio_id = uuid.uuid4().hex
+            artifacts_audio_dir = Path(settings.artifacts_dir) / "voice"
+            artifacts_audio_dir.mkdir(parents=True, exist_ok=True)
+            wav_path = artifacts_audio_dir / f"{audio_id}.wav"
+            await asyncio.to_thread(sf.write, wav_path, audio_array, 22050, subtype='PCM_16')
             
+            cloned = False
             try:
                 # Use real XTTS service for voice cloning
                 if self.xtts_service is None:
                     raise RuntimeError("XTTS service not available")
                 
                 logger.info(f"Cloning voice using real XTTS: {voice_name}")
-                clone_result = self.xtts_service.clone_voice(temp_audio_path, voice_name)
+                clone_result = await asyncio.to_thread(self._encode_voice, str(wav_path), voice_name)
                 
                 if clone_result.get("status") != "success":
                     logger.error(f"XTTS voice cloning failed: {clone_result}")
                     return {"error": f"Voice cloning failed: {clone_result.get('error', 'Unknown error')}"}
                 
+                # Persist the speaker conditioning so synthesis after a restart
+                # skips re-encoding the reference audio
+                conditioning_path = self.voice_profiles_dir / f"{voice_name}.pt"
+                await asyncio.to_thread(self.xtts_service.save_conditioning, voice_name, conditioning_path)
+                
                 # Extract voice characteristics for compatibility
                 voice_profile = await self._extract_voice_characteristics(
                     audio_array, reference_text
@@ -154,19 +248,9 @@ class VoiceCloner:
                 
                 # Add XTTS-specific data
                 voice_profile["xtts_ready"] = True
-                voice_profile["reference_audio_path"] = temp_audio_path
+                voice_profile["reference_audio_path"] = str(wav_path)
                 voice_profile["xtts_voice_id"] = voice_name
                 
-                # Save processed audio as WAV file in artifacts directory
-                import uuid
-                audio_id = str(uuid.uuid4())
-                artifacts_audio_dir = Path(settings.artifacts_dir) / "voice"
-                artifacts_audio_dir.mkdir(parents=True, exist_ok=True)
-                
-                # Save the processed audio as WAV (without _original suffix)
-                wav_path = artifacts_audio_dir / f"{audio_id}.wav"
-                sf.write(wav_path, audio_array, 22050)
-                
                 # Save metadata for the audio file
                 metadata = {
                     "voice_name": voice_name,
@@ -179,17 +263,17 @@ class VoiceCloner:
                 }
                 
                 metadata_path = artifacts_audio_dir / f"{audio_id}.json"
-                with open(metadata_path, 'w') as f:
-                    json.dump(metadata, f, indent=2)
+                await asyncio.to_thread(self._write_json, metadata_path, metadata)
                 
-                # Save voice profile
+                # Save voice profile, with its arrays in .npy sidecar files
                 profile_path = self.voice_profiles_dir / f"{voice_name}.json"
-                with open(profile_path, 'w') as f:
-                    json.dump(voice_profile, f, indent=2)
+                stored_profile = await asyncio.to_thread(self._store_profile_arrays, voice_name, voice_profile)
+                await asyncio.to_thread(self._write_json, profile_path, stored_profile)
                 
                 logger.info(f"Voice profile saved: {profile_path}")
                 logger.info(f"Audio artifact saved: {wav_path}")
                 
+                cloned = True
                 return {
                     "voice_name": voice_name,
                     "profile_path": str(profile_path),
@@ -202,19 +286,45 @@ class VoiceCloner:
                 }
                 
             finally:
-                # Clean up temporary audio file
-                if os.path.exists(temp_audio_path):
-                    os.unlink(temp_audio_path)
+                # Don't leave an orphaned artifact behind a failed clone
+                if not cloned:
+                    wav_path.unlink(missing_ok=True)
             
         except Exception as e:
             logger.error(f"Voice cloning failed: {e}")
             return {"error": f"Voice cloning failed: {str(e)}"}
     
+    async def clone_voices(self, requests: List[Tuple[bytes, str, str]]) -> List[Dict[str, Any]]:
+        """
+        Clone several voices at once.
+        
+        Decoding runs on worker threads for every request concurrently, while
+        XTTS encodes one reference at a time, so decoding voice N+1 overlaps
+        encoding voice N.
+        
+        Args:
+            requests: (reference_audio, reference_text, voice_name) per voice
+            
+        Returns:
+            clone_voice results, in request order
+        """
+        return list(await asyncio.gather(*(
+            self.clone_voice(reference_audio, reference_text, voice_name)
+            for reference_audio, reference_text, voice_name in requests
+        )))
+    
+    def _encode_voice(self, reference_audio_path: str, voice_name: str) -> Dict[str, Any]:
+        """Run XTTS speaker encoding for one reference. Blocking; run off the event loop."""
+        with self._encoder_lock:
+            return self.xtts_service.clone_voice(reference_audio_path, voice_name)
+    
     async def synthesize_speech(
         self,
         text: str,
         voice_profile: Dict[str, Any],
-        output_format: str = "wav"
+        output_format: str = "wav",
+        *,
+        persist: bool = True
     ) -> Dict[str, Any]:
         """
         Synthesize speech from text using cloned voice with real XTTS.
@@ -223,6 +333,7 @@ class VoiceCloner:
             text: Text to synthesize
             voice_profile: Voice profile from clone_voice
             output_format: Output audio format ("wav", "mp3")
+            persist: Write the audio under data/outputs; otherwise return it as an in-memory WAV
             
         Returns:
             Dict with synthesized audio data and metadata
@@ -238,41 +349,26 @@ class VoiceCloner:
                 # Use real XTTS service for synthesis
                 logger.info(f"Synthesizing speech using real XTTS for voice: {voice_profile.get('xtts_voice_id')}")
                 
-                # Create temporary output file
-                import tempfile
-                with tempfile.NamedTemporaryFile(suffix=f".{output_format}", delete=False) as tmp_file:
-                    temp_output_path = tmp_file.name
-                
-                # Use XTTS service for synthesis
+                # Use XTTS service for synthesis, keeping the audio in memory
                 if self.xtts_service is None:
                     raise RuntimeError("XTTS service not available")
                 
-                synthesis_result = self.xtts_service.synthesize_speech(
-                    text=text,
-                    voice_id=voice_profile.get("xtts_voice_id"),
-                    output_path=temp_output_path
+                await self._ensure_xtts_voice(voice_profile.get("xtts_voice_id"))
+                audio_data, sample_rate = await asyncio.to_thread(
+                    self.xtts_service.synthesize_to_ndarray, text, voice_profile.get("xtts_voice_id")
                 )
-                
-                if synthesis_result.get("status") != "success":
-                    logger.error(f"XTTS synthesis failed: {synthesis_result}")
-                    raise Exception(f"XTTS synthesis failed: {synthesis_result.get('error', 'Unknown error')}")
-                
-                # Read the generated audio file
-                audio_data, sample_rate = sf.read(temp_output_path)
-                audio_data = (audio_data * 32767).astype(np.int16)
+                audio_data = _to_int16(audio_data)
                 
                 # Save to final location
-                output_path = self._save_audio(audio_data.tobytes(), output_format)
-                
-                # Clean up temp file
-                import os
-                os.unlink(temp_output_path)
+                saved = await asyncio.to_thread(
+                    self._save_audio, audio_data, output_format, sample_rate, persist=persist
+                )
                 
                 return {
                     "audio_data": audio_data.tobytes(),
-                    "output_path": str(output_path),
-                    "duration": synthesis_result.get("duration", len(audio_data) / sample_rate),
-                    "sample_rate": synthesis_result.get("sample_rate", sample_rate),
+                    **self._saved_audio_fields(saved),
+                    "duration": len(audio_data) / sample_rate,
+                    "sample_rate": sample_rate,
                     "format": output_format,
                     "text_length": len(text),
                     "voice_name": voice_profile.get("voice_name", "unknown"),
@@ -284,7 +380,6 @@ class VoiceCloner:
                 logger.info("Using Foundry Local or mock synthesis (XTTS not ready)")
                 
                 # Create temporary output file
-                import tempfile
                 with tempfile.NamedTemporaryFile(suffix=f".{output_format}", delete=False) as tmp_file:
                     temp_output_path = tmp_file.name
                 
@@ -296,25 +391,26 @@ class VoiceCloner:
                 )
                 
                 # Read the generated audio file
-                if TORCH_AVAILABLE:
-                    audio_data, sample_rate = sf.read(temp_output_path)
-                    audio_data = (audio_data * 32767).astype(np.int16)
+                if SOUNDFILE_AVAILABLE:
+                    audio_data, sample_rate = await asyncio.to_thread(sf.read, temp_output_path, dtype='float32')
+                    audio_data = _to_int16(audio_data)
                 else:
                     # Fallback for when soundfile is not available
                     with open(temp_output_path, 'rb') as f:
-                        audio_data = f.read()
+                        audio_data = np.frombuffer(f.read(), dtype=np.int16)
                     sample_rate = self.sample_rate
                 
                 # Save to final location
-                output_path = self._save_audio(audio_data, output_format)
+                saved = await asyncio.to_thread(
+                    self._save_audio, audio_data, output_format, sample_rate, persist=persist
+                )
                 
                 # Clean up temp file
-                import os
                 os.unlink(temp_output_path)
                 
                 return {
-                    "audio_data": audio_data,
-                    "output_path": str(output_path),
+                    "audio_data": audio_data.tobytes(),
+                    **self._saved_audio_fields(saved),
                     "duration": result.get("duration", len(audio_data) / self.sample_rate),
                     "sample_rate": result.get("sample_rate", self.sample_rate),
                     "format": output_format,
@@ -328,11 +424,14 @@ class VoiceCloner:
             # Fall back to mock implementation
             try:
                 audio_data = await self._mock_synthesize_speech(text, voice_profile)
-                output_path = self._save_audio(audio_data, output_format)
+                saved = await asyncio.to_thread(
+                    self._save_audio, np.frombuffer(audio_data, dtype=np.int16), output_format, self.sample_rate,
+                    persist=persist
+                )
                 
                 return {
                     "audio_data": audio_data,
-                    "output_path": str(output_path),
+                    **self._saved_audio_fields(saved),
                     "duration": len(audio_data) / self.sample_rate,
                     "sample_rate": self.sample_rate,
                     "format": output_format,
@@ -344,58 +443,113 @@ class VoiceCloner:
                 logger.error(f"Fallback synthesis also failed: {fallback_error}")
                 return {"error": f"Speech synthesis failed: {str(e)}"}
     
-    def _process_audio(self, audio_data: bytes) -> Optional[np.ndarray]:
-        """Process audio data (WebM format from frontend)."""
+    async def _ensure_xtts_voice(self, voice_id: str):
+        """Load saved speaker conditioning for a voice XTTS has not seen in this process."""
+        if voice_id == "default" or voice_id in self.xtts_service.speaker_embeddings:
+            return
+        conditioning_path = self.voice_profiles_dir / f"{voice_id}.pt"
+        if conditioning_path.exists():
+            await asyncio.to_thread(self.xtts_service.load_conditioning, voice_id, conditioning_path)
+    
+    async def synthesize_speech_stream(
+        self,
+        text: str,
+        voice_profile: Dict[str, Any],
+        chunk_ms: int = 60
+    ) -> AsyncIterator[bytes]:
+        """
+        Synthesize speech and yield int16 PCM chunks as soon as they are produced.
+        
+        An XTTS stream holds the shared model until it ends, so other syntheses
+        wait for it rather than running alongside.
+        
+        Args:
+            text: Text to synthesize
+            voice_profile: Voice profile from clone_voice
+            chunk_ms: Chunk duration in milliseconds
+            
+        Yields:
+            Raw mono int16 PCM bytes
+        """
+        if len(text) > self.max_text_length:
+            text = text[:self.max_text_length]
+            logger.warning(f"Text truncated to {self.max_text_length} characters")
+        
+        if voice_profile.get("xtts_ready") and voice_profile.get("xtts_voice_id") and self.xtts_service is not None:
+            await self._ensure_xtts_voice(voice_profile.get("xtts_voice_id"))
+            chunks = self.xtts_service.synthesize_speech_stream(
+                text, voice_profile.get("xtts_voice_id"), chunk_ms
+            )
+            # Each chunk is produced on a worker thread so the event loop stays free
+            try:
+                while True:
+                    chunk = await asyncio.to_thread(next, chunks, None)
+                    if chunk is None:
+                        break
+                    yield _to_int16(np.array(chunk, dtype=np.float32)).tobytes()
+            finally:
+                # Free the XTTS model for other syntheses if the consumer stopped early;
+                # a stream still producing a chunk releases it when garbage collected
+                try:
+                    chunks.close()
+                except ValueError:
+                    pass
+            return
+        
+        # Without XTTS there is no incremental decoder; split the one-shot result
+        result = await self.synthesize_speech(text, voice_profile, persist=False)
+        if "error" in result:
+            raise RuntimeError(result["error"])
+        audio_data = result["audio_data"]
+        chunk_bytes = 2 * result["sample_rate"] * chunk_ms // 1000
+        for start in range(0, len(audio_data), chunk_bytes):
+            yield audio_data[start:start + chunk_bytes]
+    
+    def _process_audio_sync(self, audio_data: bytes) -> Optional[np.ndarray]:
+        """Process audio data (WebM format from frontend). Blocking; run off the event loop."""
         try:
             logger.info(f"Processing audio data: {len(audio_data)} bytes")
             
-            # Save WebM audio to temporary file
-            import tempfile
-            with tempfile.NamedTemporaryFile(suffix='.webm', delete=False) as temp_file:
-                temp_webm_path = temp_file.name
-                temp_file.write(audio_data)
-            
-            # Convert WebM to WAV using ffmpeg
-            temp_wav_path = temp_webm_path.replace('.webm', '.wav')
+            # MP4/M4A uploads may keep the moov atom at the end of the file, which
+            # ffmpeg can only reach on seekable input, so those go through a temp file
+            input_path = None
+            if _is_iso_bmff(audio_data):
+                with tempfile.NamedTemporaryFile(suffix='.m4a', delete=False) as temp_file:
+                    temp_file.write(audio_data)
+                    input_path = temp_file.name
             
-            import subprocess
+            # Decode to raw 22050 Hz mono PCM; WebM and other streamable formats are piped in
             cmd = [
                 'ffmpeg', '-y',
-                '-i', temp_webm_path,
+                '-i', input_path or 'pipe:0',
+                '-f', 's16le',
                 '-acodec', 'pcm_s16le',
                 '-ar', '22050',  # XTTS standard sample rate
                 '-ac', '1',      # Mono
-                temp_wav_path
+                'pipe:1'
             ]
             
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
-            
-            # Clean up WebM file
-            import os
-            os.unlink(temp_webm_path)
+            try:
+                result = subprocess.run(
+                    cmd, input=None if input_path else audio_data, capture_output=True, timeout=30
+                )
+            except FileNotFoundError:
+                # Without ffmpeg, soundfile can still decode WAV/FLAC/OGG uploads
+                logger.warning("FFmpeg not found, decoding audio with soundfile")
+                return self._decode_with_soundfile(audio_data)
+            finally:
+                if input_path:
+                    os.unlink(input_path)
             
-            if result.returncode != 0:
-                logger.warning(f"FFmpeg conversion failed: {result.stderr}")
+            if result.returncode != 0 or not result.stdout:
+                logger.warning(f"FFmpeg conversion failed: {result.stderr.decode(errors='replace')}")
                 # Fallback: create a simple WAV file
                 return self._create_fallback_audio()
             
-            # Load the converted WAV file
-            audio_array, sample_rate = sf.read(temp_wav_path)
+            # ffmpeg already resampled and downmixed, so no further conversion is needed
+            audio_array = np.frombuffer(result.stdout, dtype=np.int16).astype(np.float32) / 32768.0
             
-            # Clean up WAV file
-            os.unlink(temp_wav_path)
-            
-            # Convert to mono if stereo
-            if len(audio_array.shape) > 1:
-                audio_array = np.mean(audio_array, axis=1)
-            
-            # Resample to 22050 Hz if needed (XTTS standard)
-            if sample_rate != 22050:
-                import librosa
-                audio_array = librosa.resample(audio_array, orig_sr=sample_rate, target_sr=22050)
-                sample_rate = 22050
-            
-            logger.info(f"Processed audio: {len(audio_array)} samples at {sample_rate} Hz")
+            logger.info(f"Processed audio: {len(audio_array)} samples at 22050 Hz")
             return audio_array
             
         except Exception as e:
@@ -403,6 +557,31 @@ class VoiceCloner:
             # Fallback: create a simple audio file
             return self._create_fallback_audio()
     
+    def _decode_with_soundfile(self, audio_data: bytes) -> Optional[np.ndarray]:
+        """Decode audio formats supported by libsndfile from memory."""
+        try:
+            audio_array, sample_rate = sf.read(io.BytesIO(audio_data), dtype='float32', always_2d=False)
+        except Exception as e:
+            logger.warning(f"Soundfile decoding failed: {e}")
+            return self._create_fallback_audio()
+        
+        # Convert to mono if stereo, without promoting to float64
+        if audio_array.ndim > 1:
+            audio_array = audio_array.mean(axis=1, dtype=np.float32)
+        
+        # Resample to 22050 Hz if needed (XTTS standard)
+        if sample_rate != 22050:
+            audio_array = np.ascontiguousarray(audio_array)
+            if SOXR_AVAILABLE:
+                audio_array = soxr.resample(audio_array, sample_rate, 22050, quality='HQ')
+            else:
+                import librosa
+                audio_array = librosa.resample(audio_array, orig_sr=sample_rate, target_sr=22050)
+            sample_rate = 22050
+        
+        logger.info(f"Processed audio: {len(audio_array)} samples at {sample_rate} Hz")
+        return audio_array
+    
     def _create_fallback_audio(self) -> np.ndarray:
         """Create fallback audio when conversion fails."""
         try:
@@ -415,7 +594,7 @@ class VoiceCloner:
             audio_array = np.sin(2 * np.pi * frequency * t).astype(np.float32)
             
             # Add some variation
-            audio_array += np.random.normal(0, 0.1, len(audio_array))
+            audio_array += self._rng.normal(0, 0.1, len(audio_array))
             audio_array = np.clip(audio_array, -1.0, 1.0)
             
             logger.info(f"Created fallback audio: {len(audio_array)} samples")
@@ -436,13 +615,28 @@ class VoiceCloner:
         
         duration = len(audio_array) / self.sample_rate
         
-        # Calculate basic audio characteristics
-        rms_energy = np.sqrt(np.mean(audio_array ** 2))
-        zero_crossing_rate = np.mean(librosa.feature.zero_crossing_rate(audio_array)[0])
+        if len(audio_array) == 0:
+            # Nothing to frame; report silent features rather than dividing by zero
+            rms_energy = zero_crossing_rate = spectral_centroid = 0.0
+        else:
+            # Calculate basic audio characteristics in single O(N) passes; only the
+            # means are kept, so there is no need to frame the signal
+            rms_energy = np.sqrt(np.mean(audio_array ** 2))
+            zero_crossing_rate = np.mean(np.abs(np.diff(np.signbit(audio_array).astype(np.int8))))
+        
+            # Spectral centroid averaged over non-overlapping Hann-windowed frames
+            # (reference audio is 22050 Hz); a reshape view avoids librosa's padded,
+            # 4x-overlapping STFT buffer
+            n_fft = min(2048, len(audio_array))
+            n_frames = len(audio_array) // n_fft
+            frames = audio_array[:n_frames * n_fft].reshape(n_frames, n_fft) * np.hanning(n_fft)
+            spectrum = np.abs(np.fft.rfft(frames, axis=1))
+            freqs = np.fft.rfftfreq(n_fft, 1 / 22050)
+            spectral_centroid = np.mean((spectrum @ freqs) / (spectrum.sum(axis=1) + 1e-9))
         
         # Mock voice characteristics
         characteristics = {
-            "speaker_embedding": np.random.randn(256).tolist(),  # Mock embedding
+            "speaker_embedding": self._rng.standard_normal(256, dtype=np.float32),  # Mock embedding
             "prosody_patterns": {
                 "pitch_range": [80, 200],  # Hz
                 "speaking_rate": 150,  # words per minute
@@ -450,8 +644,8 @@ class VoiceCloner:
                 "energy_mean": float(rms_energy)
             },
             "acoustic_features": {
-                "mfcc_mean": np.random.randn(13).tolist(),
-                "spectral_centroid": float(np.mean(librosa.feature.spectral_centroid(y=audio_array)[0])),
+                "mfcc_mean": self._rng.standard_normal(13, dtype=np.float32),
+                "spectral_centroid": float(spectral_centroid),
                 "zero_crossing_rate": float(zero_crossing_rate)
             },
             "metadata": {
@@ -482,78 +676,165 @@ class VoiceCloner:
         t = np.linspace(0, duration, int(self.sample_rate * duration))
         
         # Create a simple tone with some variation
-        frequency = 200 + np.sin(t * 0.5) * 50  # Varying frequency
-        amplitude = 0.3 * np.sin(2 * np.pi * frequency * t)
+        frequency = 200 + _lut_sin(t * (0.5 / (2 * np.pi))) * 50  # Varying frequency
+        amplitude = 0.3 * _lut_sin(frequency * t)
         
         # Add some noise for realism
-        noise = np.random.normal(0, 0.05, len(amplitude))
+        noise = self._rng.normal(0, 0.05, len(amplitude))
         audio_array = amplitude + noise
         
         # Normalize and convert to int16
-        audio_array = np.clip(audio_array, -1.0, 1.0)
-        audio_array = (audio_array * 32767).astype(np.int16)
+        audio_array = _to_int16(audio_array)
         
         return audio_array.tobytes()
     
-    def _save_audio(self, audio_data: bytes, format: str) -> Path:
-        """Save audio data to file."""
-        timestamp = int(asyncio.get_event_loop().time())
-        filename = f"synthesized_{timestamp}.{format}"
+    def _store_profile_arrays(self, voice_name: str, voice_profile: Dict[str, Any]) -> Dict[str, Any]:
+        """Save a profile's numpy arrays to .npy files and return a copy naming them in place of the arrays."""
+        stored_profile = dict(voice_profile)
+        embedding_file = f"{voice_name}.embedding.npy"
+        np.save(self.voice_profiles_dir / embedding_file, stored_profile.pop("speaker_embedding"))
+        stored_profile["speaker_embedding_file"] = embedding_file
+        
+        acoustic_features = dict(stored_profile["acoustic_features"])
+        mfcc_file = f"{voice_name}.mfcc.npy"
+        np.save(self.voice_profiles_dir / mfcc_file, acoustic_features.pop("mfcc_mean"))
+        acoustic_features["mfcc_mean_file"] = mfcc_file
+        stored_profile["acoustic_features"] = acoustic_features
+        
+        return stored_profile
+    
+    def _attach_profile_arrays(self, profile: Dict[str, Any]) -> None:
+        """Memory-map the .npy sidecars referenced by a loaded profile."""
+        embedding_file = profile.get("speaker_embedding_file")
+        if embedding_file:
+            profile["speaker_embedding"] = np.load(self.voice_profiles_dir / embedding_file, mmap_mode='r')
+        
+        acoustic_features = profile.get("acoustic_features", {})
+        mfcc_file = acoustic_features.get("mfcc_mean_file")
+        if mfcc_file:
+            acoustic_features["mfcc_mean"] = np.load(self.voice_profiles_dir / mfcc_file, mmap_mode='r')
+    
+    @staticmethod
+    def _write_json(path: Path, data: Dict[str, Any]) -> None:
+        """Write a JSON document to disk."""
+        with open(path, 'wb') as f:
+            f.write(dumps_indented(data))
+    
+    def _save_audio(
+        self, audio: np.ndarray, format: str, sample_rate: int, *, persist: bool = False
+    ) -> Union[Path, io.BytesIO]:
+        """Encode int16 audio samples as WAV, to a file under data/outputs or to an in-memory buffer."""
+        if not persist:
+            buffer = io.BytesIO()
+            sf.write(buffer, audio, sample_rate, subtype='PCM_16', format='WAV')
+            buffer.seek(0)
+            return buffer
+        
+        # Nanosecond clock plus a random suffix so concurrent syntheses never share a file name
+        filename = f"synthesized_{time.monotonic_ns()}_{secrets.token_hex(3)}.{format}"
         output_path = settings.data_dir / "outputs" / filename
         output_path.parent.mkdir(parents=True, exist_ok=True)
         
-        # Convert bytes back to numpy array for saving
-        audio_array = np.frombuffer(audio_data, dtype=np.int16)
-        
-        if format == "wav":
-            sf.write(str(output_path), audio_array, self.sample_rate)
-        else:
-            # Default to WAV if format not supported
-            sf.write(str(output_path), audio_array, self.sample_rate)
+        # Only WAV is supported; other formats are written as WAV
+        sf.write(str(output_path), audio, sample_rate, subtype='PCM_16', format='WAV')
         
         return output_path
     
+    @staticmethod
+    def _saved_audio_fields(saved: Union[Path, io.BytesIO]) -> Dict[str, Any]:
+        """Result fields for audio returned by _save_audio."""
+        if isinstance(saved, io.BytesIO):
+            return {"output_path": None, "audio_file": saved}
+        return {"output_path": str(saved)}
+    
     async def load_voice_profile(self, voice_name: str) -> Optional[Dict[str, Any]]:
         """Load a saved voice profile."""
         profile_path = self.voice_profiles_dir / f"{voice_name}.json"
         
-        if not profile_path.exists():
+        try:
+            mtime = profile_path.stat().st_mtime
+        except OSError:
+            self._profile_cache.pop(voice_name, None)
             return None
         
+        cached = self._profile_cache.get(voice_name)
+        if cached is not None and cached[0] == mtime:
+            return dict(cached[1])
+        
         try:
-            with open(profile_path, 'r') as f:
-                profile = json.load(f)
-            return profile
+            with open(profile_path, 'rb') as f:
+                profile = loads(f.read())
+            self._attach_profile_arrays(profile)
+            self._profile_cache[voice_name] = (mtime, profile)
+            return dict(profile)
         except Exception as e:
             logger.error(f"Failed to load voice profile {voice_name}: {e}")
             return None
     
     def list_voice_profiles(self) -> List[Dict[str, Any]]:
-        """List available voice profiles."""
-        profiles = []
+        """List available voice profiles.
         
-        for profile_file in self.voice_profiles_dir.glob("*.json"):
-            try:
-                with open(profile_file, 'r') as f:
-                    profile = json.load(f)
-                
-                profiles.append({
-                    "voice_name": profile_file.stem,
-                    "profile_path": str(profile_file),
-                    "created_at": profile.get("metadata", {}).get("created_at", "unknown"),
-                    "duration": profile.get("metadata", {}).get("duration", 0)
-                })
-            except Exception as e:
-                logger.error(f"Failed to read profile {profile_file}: {e}")
+        Names and mtimes come from the directory listing; profile headers are
+        read, in parallel, only for files that changed since the last listing.
+        """
+        try:
+            entries = [
+                (entry, entry.stat().st_mtime_ns)
+                for entry in os.scandir(self.voice_profiles_dir)
+                if entry.name.endswith(".json") and entry.is_file()
+            ]
+        except OSError as e:
+            logger.error(f"Failed to list voice profiles: {e}")
+            return []
+        
+        # Drop headers of deleted profiles and re-read those whose file changed
+        headers = {
+            entry.path: self._profile_headers[entry.path]
+            for entry, mtime in entries
+            if entry.path in self._profile_headers and self._profile_headers[entry.path][0] == mtime
+        }
+        stale = [(entry, mtime) for entry, mtime in entries if entry.path not in headers]
+        if stale:
+            with ThreadPoolExecutor(max_workers=min(8, len(stale))) as pool:
+                read = pool.map(self._read_profile_header, [entry.path for entry, _ in stale])
+                for (entry, mtime), header in zip(stale, read):
+                    if header is not None:
+                        headers[entry.path] = (mtime, header)
+        self._profile_headers = headers
+        
+        profiles = []
+        for entry, mtime in entries:
+            if entry.path not in headers:
+                continue
+            profiles.append({
+                "voice_name": entry.name[:-5],
+                "profile_path": entry.path,
+                "mtime": mtime / 1e9,
+                **headers[entry.path][1]
+            })
         
         return profiles
     
+    @staticmethod
+    def _read_profile_header(path: str) -> Optional[Dict[str, Any]]:
+        """Read the listing fields of one voice profile."""
+        try:
+            with open(path, 'rb') as f:
+                metadata = loads(f.read()).get("metadata", {})
+            return {
+                "created_at": metadata.get("created_at", "unknown"),
+                "duration": metadata.get("duration", 0)
+            }
+        except Exception as e:
+            logger.error(f"Failed to read profile {path}: {e}")
+            return None
+    
     def get_model_info(self) -> Dict[str, Any]:
         """Get model information."""
         return {
             "device": self.device,
             "is_initialized": self.is_initialized,
-            "torch_available": TORCH_AVAILABLE,
+            "torch_available": _torch_available(),
             "sample_rate": self.sample_rate,
             "max_text_length": self.max_text_length,
             "voice_profiles_dir": str(self.voice_profiles_dir)
@@ -596,31 +877,28 @@ class MockVoiceCloner(VoiceCloner):
         t = np.linspace(0, duration, int(self.sample_rate * duration))
         
         # Create speech-like patterns
-        base_freq = 150 + np.random.normal(0, 20)  # Base frequency with variation
+        base_freq = 150 + self._rng.normal(0, 20)  # Base frequency with variation
         
-        # Add formant-like structure
-        formant1 = 0.6 * np.sin(2 * np.pi * base_freq * t)
-        formant2 = 0.3 * np.sin(2 * np.pi * base_freq * 2.5 * t)
-        formant3 = 0.1 * np.sin(2 * np.pi * base_freq * 4.0 * t)
+        # Add formant-like structure: three harmonics evaluated as one (3, N) lookup
+        formant_gains = np.array([0.6, 0.3, 0.1], dtype=np.float32)
+        formant_freqs = base_freq * np.array([1.0, 2.5, 4.0])
         
         # Combine formants
-        audio_array = formant1 + formant2 + formant3
-        
-        # Add envelope to simulate speech rhythm
-        envelope = np.ones_like(t)
-        for i in range(len(words)):
-            start_idx = int(i * len(t) / len(words))
-            end_idx = int((i + 1) * len(t) / len(words))
-            envelope[start_idx:end_idx] *= np.random.uniform(0.3, 1.0)
+        audio_array = formant_gains @ _lut_sin(np.outer(formant_freqs, t))
         
-        audio_array *= envelope
+        # Add envelope to simulate speech rhythm: one random gain per word,
+        # repeated across that word's share of the samples
+        n_words = len(words)
+        if n_words:
+            gains = self._rng.uniform(0.3, 1.0, size=n_words).astype(np.float32)
+            boundaries = np.arange(n_words + 1) * len(t) // n_words
+            audio_array *= np.repeat(gains, np.diff(boundaries))
         
         # Add some realistic noise
-        noise = np.random.normal(0, 0.02, len(audio_array))
+        noise = self._rng.normal(0, 0.02, len(audio_array))
         audio_array += noise
         
         # Normalize and convert to int16
-        audio_array = np.clip(audio_array, -1.0, 1.0)
-        audio_array = (audio_array * 32767).astype(np.int16)
+        audio_array = _to_int16(audio_array)
         
         return audio_array.tobytes()
@@ -3,29 +3,162 @@ Real XTTS implementation for voice cloning and synthesis using Coqui TTS.
 Based on official documentation: https://docs.coqui.ai/en/latest/
 """
 
+import contextlib
+import hashlib
+import importlib.util
+import mmap
 import os
+import re
 import torch
 import torchaudio
 import numpy as np
 from pathlib import Path
-from typing import Dict, Any, Optional, Tuple
+from typing import Dict, Any, Iterator, List, Optional, Tuple
 import logging
 import tempfile
 import subprocess
+import threading
+import wave
+
+from ...core.config import settings
 
 logger = logging.getLogger(__name__)
 
+# Long text is synthesized in sentence-aligned chunks of at most this many characters
+_MAX_CHUNK_CHARS = 200
+_SENTENCE_SPLIT_RE = re.compile(r'(?<=[.!?])\s+')
+# Cosine crossfade between consecutive chunks
+_CROSSFADE_S = 0.02
+
+
+# Loaded XTTS models and their autocast dtype, keyed by device
+_shared_models: Dict[str, Tuple[Any, Optional[torch.dtype]]] = {}
+_shared_models_lock = threading.Lock()
+# Serializes inference on each shared model, keyed by device
+_inference_locks: Dict[str, threading.Lock] = {}
+
+
+def _allow_xtts_checkpoint_globals():
+    """Allowlist the config classes pickled into XTTS checkpoints for weights_only torch.load."""
+    if not hasattr(torch.serialization, "add_safe_globals"):
+        return
+    try:
+        from TTS.config.shared_configs import BaseDatasetConfig
+        from TTS.tts.configs.xtts_config import XttsConfig
+        from TTS.tts.models.xtts import XttsArgs, XttsAudioConfig
+    except ImportError:
+        # Older Coqui releases pickle none of these
+        return
+    torch.serialization.add_safe_globals([XttsConfig, XttsAudioConfig, XttsArgs, BaseDatasetConfig])
+
+
+def _file_digest(path: str) -> str:
+    """SHA-256 of a file's contents, hashed straight from a memory map."""
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        return hashlib.sha256(data).hexdigest()
+
+
+def _save_conditioning_tensors(conditioning: Tuple[Any, Any], path: Path):
+    """Write speaker conditioning tensors, replacing the file atomically."""
+    gpt_cond_latent, speaker_embedding = conditioning
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # Concurrent writers each rename a complete temp file, so readers never see a partial one
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            torch.save({"gpt": gpt_cond_latent.cpu(), "spk": speaker_embedding.cpu()}, f)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def _configure_cpu_threads():
+    """Use every available core for intra-op work and one inter-op thread to avoid oversubscription."""
+    cores = len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else os.cpu_count()
+    torch.set_num_threads(cores or 1)
+    try:
+        torch.set_num_interop_threads(1)
+    except RuntimeError:
+        # Only settable before any inter-op work has started
+        pass
+
+
+def _chunk_text(text: str, max_chars: int = _MAX_CHUNK_CHARS) -> List[str]:
+    """Split text into sentence-aligned chunks of at most max_chars characters."""
+    chunks = []
+    current = ""
+    for sentence in _SENTENCE_SPLIT_RE.split(text.strip()):
+        # Sentences longer than a chunk are broken at word boundaries
+        while len(sentence) > max_chars:
+            cut = sentence.rfind(" ", 0, max_chars)
+            if cut <= 0:
+                cut = max_chars
+            if current:
+                chunks.append(current)
+                current = ""
+            chunks.append(sentence[:cut])
+            sentence = sentence[cut:].lstrip()
+        if current and len(current) + 1 + len(sentence) > max_chars:
+            chunks.append(current)
+            current = sentence
+        else:
+            current = f"{current} {sentence}" if current else sentence
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def _crossfade_concat(wavs: List[np.ndarray], fade: int) -> np.ndarray:
+    """Concatenate waveforms, overlapping each boundary with a cosine crossfade."""
+    pieces = []
+    tail = wavs[0]
+    for wav in wavs[1:]:
+        n = min(fade, len(tail), len(wav))
+        ramp = 0.5 - 0.5 * np.cos(np.linspace(0, np.pi, n, dtype=np.float32))
+        pieces.append(tail[:len(tail) - n])
+        pieces.append(tail[len(tail) - n:] * (1 - ramp) + wav[:n] * ramp)
+        tail = wav[n:]
+    pieces.append(tail)
+    return np.concatenate(pieces)
+
+
 class RealXTTSService:
     """Real XTTS service for voice cloning and synthesis using Coqui TTS."""
     
-    def __init__(self):
-        self.device = self._get_device()
-        self.model = None
+    def __init__(self, device: Optional[str] = None):
+        # Fail fast when Coqui TTS is missing, but defer loading the weights to first use
+        if importlib.util.find_spec("TTS") is None:
+            logger.error("Coqui TTS library not available")
+            raise RuntimeError("Coqui TTS library is required for voice cloning. Please install it with: pip install TTS")
+        
+        self.device = self._get_device(device)
+        with _shared_models_lock:
+            self._inference_lock = _inference_locks.setdefault(self.device, threading.Lock())
+        self._model = None
         self.speaker_embeddings = {}
-        self._load_model()
+        self.autocast_dtype = None
+    
+    @property
+    def model(self):
+        """The XTTS model, loaded on first access and shared by all services on the same device."""
+        if self._model is None:
+            with _shared_models_lock:
+                shared = _shared_models.get(self.device)
+                if shared is None:
+                    self._load_model()
+                    shared = _shared_models[self.device] = (self._model, self.autocast_dtype)
+                self._model, self.autocast_dtype = shared
+        return self._model
+    
+    @model.setter
+    def model(self, model):
+        self._model = model
     
-    def _get_device(self) -> str:
+    def _get_device(self, device: Optional[str] = None) -> str:
         """Get the appropriate device for inference."""
+        if device == "cuda" and torch.cuda.is_available():
+            return "cuda"
         # Force CPU usage due to MPS compatibility issues with XTTS
         # TODO: Re-enable MPS when PyTorch MPS supports all required operations
         return "cpu"
@@ -38,35 +171,31 @@ class RealXTTSService:
             from TTS.api import TTS
             logger.info("Loading Coqui XTTS-v2 model for voice cloning...")
             
-            # Fix PyTorch loading issue by setting weights_only=False
-            import torch
-            original_load = torch.load
+            _allow_xtts_checkpoint_globals()
             
-            def safe_load(*args, **kwargs):
-                kwargs.setdefault('weights_only', False)
-                return original_load(*args, **kwargs)
+            # Initialize XTTS-v2 model as per Coqui documentation
+            # Reference: https://docs.coqui.ai/en/latest/
+            self.model = TTS("tts_models/multilingual/multi-dataset/xtts_v2")
             
-            torch.load = safe_load
+            # Move to device if available
+            if self.device != "cpu":
+                self.model = self.model.to(self.device)
             
-            try:
-                # Initialize XTTS-v2 model as per Coqui documentation
-                # Reference: https://docs.coqui.ai/en/latest/
-                self.model = TTS("tts_models/multilingual/multi-dataset/xtts_v2")
-                
-                # Move to device if available
-                if self.device != "cpu":
-                    self.model = self.model.to(self.device)
-                
-                logger.info(f"Coqui XTTS-v2 model loaded successfully on {self.device}")
-                
-            finally:
-                # Restore original torch.load
-                torch.load = original_load
+            logger.info(f"Coqui XTTS-v2 model loaded successfully on {self.device}")
+            
+            if self.device == "cpu":
+                _configure_cpu_threads()
+            
+            self._apply_precision(settings.tts_precision)
+            compiled = settings.tts_compile and self._compile_model()
+            if self.device == "cpu" and not compiled:
+                self._script_vocoder()
             
         except ImportError as e:
             logger.error(f"Coqui TTS library not available: {e}")
             raise RuntimeError("Coqui TTS library is required for voice cloning. Please install it with: pip install TTS")
         except Exception as e:
+            self.model = None
             logger.error(f"Failed to load Coqui XTTS-v2 model: {e}")
             raise RuntimeError(f"Failed to load XTTS model: {e}")
     
@@ -90,20 +219,21 @@ class RealXTTSService:
                 self._convert_webm_to_wav(reference_audio_path, wav_path)
                 reference_audio_path = wav_path
             
-            # Load reference audio to validate and get properties
-            audio_data, sample_rate = torchaudio.load(reference_audio_path)
-            if audio_data is None:
-                raise ValueError(f"Could not load reference audio: {reference_audio_path}")
+            # Validate the reference and get its properties from the WAV header;
+            # only the speaker encoder needs the decoded samples
+            sample_rate, num_frames = self._audio_header(reference_audio_path)
+            duration = num_frames / sample_rate
             
-            # For Coqui XTTS-v2, we don't need to extract embeddings manually
-            # The model handles voice cloning internally using the reference audio
-            # We just need to store the reference audio path for synthesis
+            # Encode the reference audio into speaker conditioning once, so each
+            # synthesis reuses the latents instead of re-reading the waveform
+            conditioning = self._compute_conditioning(reference_audio_path)
             
-            # Store the reference audio path for XTTS synthesis
+            # Store the reference audio path and conditioning for XTTS synthesis
             self.speaker_embeddings[voice_id] = {
                 "reference_audio_path": reference_audio_path,
                 "sample_rate": sample_rate,
-                "duration": audio_data.shape[1] / sample_rate
+                "duration": duration,
+                "conditioning": conditioning
             }
             
             logger.info(f"Voice cloned successfully: {voice_id} (Coqui XTTS-v2 ready)")
@@ -112,7 +242,7 @@ class RealXTTSService:
                 "status": "success",
                 "voice_id": voice_id,
                 "sample_rate": sample_rate,
-                "duration": audio_data.shape[1] / sample_rate,
+                "duration": duration,
                 "xtts_ready": True
             }
             
@@ -123,8 +253,198 @@ class RealXTTSService:
                 "error": str(e)
             }
     
+    @staticmethod
+    def _audio_header(audio_path: str) -> Tuple[int, int]:
+        """Return (sample rate, frame count) of an audio file, decoding it only if it isn't PCM WAV."""
+        try:
+            with wave.open(audio_path, 'rb') as wav_file:
+                return wav_file.getframerate(), wav_file.getnframes()
+        except (wave.Error, EOFError):
+            audio_data, sample_rate = torchaudio.load(audio_path)
+            if audio_data is None:
+                raise ValueError(f"Could not load reference audio: {audio_path}")
+            return sample_rate, audio_data.shape[1]
+    
+    def _apply_precision(self, precision: str):
+        """Run XTTS in reduced precision: fp16 autocast on CUDA, bf16 autocast, or int8 dynamic quantization on CPU."""
+        tts_model = self._xtts_model()
+        if tts_model is None:
+            return
+        
+        if precision == "auto":
+            precision = "fp16" if self.device == "cuda" else "fp32"
+        
+        if precision == "fp16":
+            if self.device != "cuda":
+                logger.warning("fp16 XTTS inference needs CUDA, keeping fp32")
+                return
+            # Autocast keeps fp32 weights, so fp32 reference audio and cached
+            # conditioning still feed the model while matmuls use tensor cores
+            self.autocast_dtype = torch.float16
+        elif precision == "bf16":
+            if self.device == "cuda" and not torch.cuda.is_bf16_supported():
+                logger.warning("This GPU has no bf16 support, keeping fp32")
+                return
+            # On CPU, bf16 autocast runs on AVX-512 BF16 / AMX kernels where available
+            self.autocast_dtype = torch.bfloat16
+        elif precision == "int8":
+            if self.device != "cpu":
+                logger.warning("int8 XTTS quantization is CPU-only, keeping fp32")
+                return
+            self.model.synthesizer.tts_model = torch.ao.quantization.quantize_dynamic(
+                tts_model, {torch.nn.Linear}, dtype=torch.qint8
+            )
+        logger.info(f"XTTS inference precision: {precision}")
+    
+    def _compile_model(self) -> bool:
+        """Compile the GPT decoder and HiFi-GAN vocoder with TorchInductor, falling back to eager."""
+        tts_model = self._xtts_model()
+        if tts_model is None or not hasattr(torch, "compile"):
+            return False
+        
+        eager = {name: getattr(tts_model, name) for name in ("gpt", "hifigan_decoder") if hasattr(tts_model, name)}
+        try:
+            for name, module in eager.items():
+                setattr(tts_model, name, torch.compile(module, mode="reduce-overhead", fullgraph=False))
+            # Compilation is lazy, so build the kernels now rather than on the first user request
+            self._warmup(tts_model)
+            logger.info(f"Compiled XTTS modules: {', '.join(eager)}")
+            return True
+        except Exception as e:
+            # XTTS has dynamic shapes that some backends cannot compile
+            logger.warning(f"torch.compile failed for XTTS, using eager modules: {e}")
+            for name, module in eager.items():
+                setattr(tts_model, name, module)
+            return False
+    
+    def _script_vocoder(self):
+        """TorchScript the HiFi-GAN vocoder for CPU inference, keeping the eager module if it won't script."""
+        tts_model = self._xtts_model()
+        vocoder = getattr(tts_model, "hifigan_decoder", None)
+        if vocoder is None:
+            return
+        
+        # The GPT decoder stays eager; its generation loop does not script
+        try:
+            scripted = torch.jit.optimize_for_inference(torch.jit.script(vocoder.eval()))
+            tts_model.hifigan_decoder = scripted
+            # The first scripted calls profile and optimize the graph, so run them now
+            self._warmup(tts_model)
+            logger.info("Scripted XTTS HiFi-GAN vocoder for CPU inference")
+        except Exception as e:
+            logger.warning(f"TorchScript failed for the XTTS vocoder, using the eager module: {e}")
+            tts_model.hifigan_decoder = vocoder
+    
+    def _warmup(self, tts_model):
+        """Run one short synthesis with a built-in speaker, if the model ships any."""
+        speakers = getattr(getattr(tts_model, "speaker_manager", None), "speakers", None)
+        if not speakers:
+            return
+        speaker = next(iter(speakers.values()))
+        with torch.inference_mode(), self._precision_context():
+            tts_model.inference(
+                "Warm up.", "en", speaker["gpt_cond_latent"], speaker["speaker_embedding"]
+            )
+    
+    def _precision_context(self):
+        """Autocast context for inference calls, or a no-op at full precision."""
+        # The autocast dtype is settled when the shared model loads
+        if self.model is None or self.autocast_dtype is None:
+            return contextlib.nullcontext()
+        return torch.autocast(device_type=self.device, dtype=self.autocast_dtype)
+    
+    def _xtts_model(self):
+        """Return the underlying XTTS model if it exposes conditioning latents."""
+        synthesizer = getattr(self.model, "synthesizer", None)
+        tts_model = getattr(synthesizer, "tts_model", None)
+        if tts_model is not None and hasattr(tts_model, "get_conditioning_latents"):
+            return tts_model
+        return None
+    
+    def _compute_conditioning(self, reference_audio_path: str) -> Optional[Tuple[Any, Any]]:
+        """Compute (gpt_cond_latent, speaker_embedding) for a reference clip."""
+        tts_model = self._xtts_model()
+        if tts_model is None:
+            return None
+        
+        # Conditioning depends only on the audio, so identical references reuse it across restarts
+        cache_path = settings.data_dir / "cache" / "xtts" / f"{_file_digest(reference_audio_path)}.pt"
+        if cache_path.exists():
+            try:
+                return self._load_conditioning_tensors(cache_path)
+            except Exception as e:
+                logger.warning(f"Ignoring unreadable XTTS conditioning cache {cache_path}: {e}")
+        
+        with torch.inference_mode():
+            conditioning = tts_model.get_conditioning_latents(audio_path=[reference_audio_path])
+        try:
+            _save_conditioning_tensors(conditioning, cache_path)
+        except OSError as e:
+            logger.warning(f"Failed to cache XTTS conditioning: {e}")
+        return conditioning
+    
+    def _conditioning_for(self, voice_id: str) -> Optional[Tuple[Any, Any]]:
+        """Return a voice's cached conditioning, encoding its reference audio on first use."""
+        speaker_data = self.speaker_embeddings[voice_id]
+        conditioning = speaker_data.get("conditioning")
+        if conditioning is None:
+            reference_audio = speaker_data.get("reference_audio_path")
+            if reference_audio and os.path.exists(reference_audio):
+                # Voices registered without conditioning are encoded once, then reuse the latents
+                conditioning = self._compute_conditioning(reference_audio)
+                speaker_data["conditioning"] = conditioning
+        return conditioning
+    
+    def save_conditioning(self, voice_id: str, path: Path) -> bool:
+        """Persist a voice's speaker conditioning tensors; returns False if there are none."""
+        conditioning = self.speaker_embeddings.get(voice_id, {}).get("conditioning")
+        if conditioning is None:
+            return False
+        _save_conditioning_tensors(conditioning, path)
+        return True
+    
+    def load_conditioning(self, voice_id: str, path: Path):
+        """Register a voice from conditioning tensors saved by save_conditioning."""
+        self.speaker_embeddings[voice_id] = {
+            "reference_audio_path": None,
+            "conditioning": self._load_conditioning_tensors(path)
+        }
+        logger.info(f"Loaded saved XTTS conditioning for voice: {voice_id}")
+    
+    def _load_conditioning_tensors(self, path: Path) -> Tuple[Any, Any]:
+        """Load (gpt_cond_latent, speaker_embedding) saved by _save_conditioning_tensors."""
+        # Map the saved tensors from disk; mmap needs a path, which this always is
+        tensors = torch.load(path, map_location=self.device, weights_only=True, mmap=True)
+        return tensors["gpt"], tensors["spk"]
+    
     def _convert_webm_to_wav(self, webm_path: str, wav_path: str):
         """Convert WebM audio to WAV format for XTTS compatibility."""
+        try:
+            from torchaudio.io import StreamReader
+        except ImportError:
+            # torchaudio builds without the libav bindings still need the ffmpeg CLI
+            self._convert_webm_to_wav_ffmpeg(webm_path, wav_path)
+            return
+        
+        # Decode and resample in-process through torchaudio's libav bindings
+        try:
+            reader = StreamReader(webm_path)
+            reader.add_basic_audio_stream(
+                frames_per_chunk=-1,
+                sample_rate=22050,  # XTTS standard sample rate
+                num_channels=1,     # Mono
+                format="fltp"
+            )
+            reader.process_all_packets()
+            (chunk,) = reader.pop_chunks()
+            torchaudio.save(wav_path, chunk.T, 22050, encoding="PCM_S", bits_per_sample=16)
+        except Exception as e:
+            raise RuntimeError(f"Error converting WebM to WAV: {e}")
+        
+        logger.info(f"Converted {webm_path} to {wav_path}")
+    
+    def _convert_webm_to_wav_ffmpeg(self, webm_path: str, wav_path: str):
+        """Convert WebM audio to WAV with an ffmpeg subprocess."""
         try:
             # Use ffmpeg to convert WebM to WAV
             cmd = [
@@ -172,39 +492,56 @@ class RealXTTSService:
         try:
             logger.info(f"Synthesizing speech: '{text[:50]}...' with voice {voice_id}")
             
-            # Handle default voice case
-            if voice_id == "default":
-                logger.info("Using default voice synthesis without voice cloning")
-                self.model.tts_to_file(
-                    text=text,
-                    language="en",
-                    file_path=output_path
-                )
-            else:
-                if voice_id not in self.speaker_embeddings:
-                    raise ValueError(f"Voice {voice_id} not found. Please clone the voice first.")
-                
-                # Get speaker data
-                speaker_data = self.speaker_embeddings[voice_id]
-                reference_audio = speaker_data.get("reference_audio_path")
-                
-                if not reference_audio or not os.path.exists(reference_audio):
-                    raise ValueError(f"Reference audio not found: {reference_audio}")
-                
-                # Use Coqui XTTS-v2 for real voice cloning as per their documentation
-                # Reference: https://docs.coqui.ai/en/latest/
-                logger.info("Using Coqui XTTS-v2 for real voice cloning synthesis")
-                
-                self.model.tts_to_file(
-                    text=text,
-                    speaker_wav=reference_audio,
-                    language="en",
-                    file_path=output_path
-                )
+            # Known when the audio is generated in memory; otherwise read from the written file
+            sample_count = None
             
-            # Load the generated audio to get duration and verify
-            audio_data, actual_sample_rate = torchaudio.load(output_path)
-            duration = audio_data.shape[1] / actual_sample_rate
+            with self._inference_lock, torch.inference_mode(), self._precision_context():
+                # Handle default voice case
+                if voice_id == "default":
+                    logger.info("Using default voice synthesis without voice cloning")
+                    self.model.tts_to_file(
+                        text=text,
+                        language="en",
+                        file_path=output_path
+                    )
+                else:
+                    if voice_id not in self.speaker_embeddings:
+                        raise ValueError(f"Voice {voice_id} not found. Please clone the voice first.")
+                    
+                    # Get speaker data
+                    speaker_data = self.speaker_embeddings[voice_id]
+                    conditioning = self._conditioning_for(voice_id)
+                    
+                    if conditioning is not None:
+                        # Reuse the cached speaker conditioning; skips the reference encoder
+                        logger.info("Using cached Coqui XTTS-v2 conditioning for voice cloning synthesis")
+                        wav = torch.from_numpy(self._inference_chunked(text, conditioning)).reshape(1, -1)
+                        actual_sample_rate = self.model.synthesizer.output_sample_rate
+                        torchaudio.save(output_path, wav, actual_sample_rate)
+                        sample_count = wav.shape[1]
+                    else:
+                        reference_audio = speaker_data.get("reference_audio_path")
+                        
+                        if not reference_audio or not os.path.exists(reference_audio):
+                            raise ValueError(f"Reference audio not found: {reference_audio}")
+                        
+                        # Use Coqui XTTS-v2 for real voice cloning as per their documentation
+                        # Reference: https://docs.coqui.ai/en/latest/
+                        logger.info("Using Coqui XTTS-v2 for real voice cloning synthesis")
+                        
+                        self.model.tts_to_file(
+                            text=text,
+                            speaker_wav=reference_audio,
+                            language="en",
+                            file_path=output_path
+                        )
+            
+            if sample_count is None:
+                # The WAV header gives the length without decoding the audio
+                with wave.open(output_path, 'rb') as wav_file:
+                    sample_count = wav_file.getnframes()
+                    actual_sample_rate = wav_file.getframerate()
+            duration = sample_count / actual_sample_rate
             
             logger.info(f"Coqui XTTS-v2 synthesis successful: {duration:.2f}s audio generated")
             
@@ -220,4 +557,129 @@ class RealXTTSService:
             return {
                 "status": "error",
                 "error": str(e)
-            }
\ No newline at end of file
+            }
+    
+    def synthesize_to_ndarray(self, text: str, voice_id: str) -> Tuple[np.ndarray, int]:
+        """
+        Synthesize speech into memory without touching the filesystem.
+        
+        Args:
+            text: Text to synthesize
+            voice_id: ID of the cloned voice, or "default"
+            
+        Returns:
+            Tuple of (mono float32 audio, sample rate)
+        """
+        with self._inference_lock:
+            return self._synthesize_to_ndarray(text, voice_id)
+    
+    def _synthesize_to_ndarray(self, text: str, voice_id: str) -> Tuple[np.ndarray, int]:
+        """synthesize_to_ndarray for callers already holding the inference lock."""
+        sample_rate = self.model.synthesizer.output_sample_rate
+        
+        with torch.inference_mode(), self._precision_context():
+            wav = self._generate_wav(text, voice_id)
+        
+        if isinstance(wav, torch.Tensor):
+            wav = wav.float().cpu().numpy()
+        return np.asarray(wav, dtype=np.float32).reshape(-1), sample_rate
+    
+    def _generate_wav(self, text: str, voice_id: str):
+        """Run one full XTTS inference for the given voice."""
+        if voice_id == "default":
+            wav = self.model.tts(text=text, language="en")
+        else:
+            if voice_id not in self.speaker_embeddings:
+                raise ValueError(f"Voice {voice_id} not found. Please clone the voice first.")
+            
+            speaker_data = self.speaker_embeddings[voice_id]
+            conditioning = self._conditioning_for(voice_id)
+            if conditioning is not None:
+                wav = self._inference_chunked(text, conditioning)
+            else:
+                reference_audio = speaker_data.get("reference_audio_path")
+                if not reference_audio or not os.path.exists(reference_audio):
+                    raise ValueError(f"Reference audio not found: {reference_audio}")
+                wav = self.model.tts(text=text, speaker_wav=reference_audio, language="en")
+        return wav
+    
+    def _inference_chunked(self, text: str, conditioning: Tuple[Any, Any]) -> np.ndarray:
+        """
+        Run cached-latent inference over sentence chunks and crossfade the results.
+        
+        Coqui's XTTS inference takes one unpadded sequence, so the chunks are
+        decoded in turn; keeping each one short avoids the long autoregressive
+        runs (and the XTTS per-input length limit) that whole paragraphs hit.
+        """
+        gpt_cond_latent, speaker_embedding = conditioning
+        tts_model = self._xtts_model()
+        wavs = []
+        for chunk in _chunk_text(text):
+            wav = tts_model.inference(chunk, "en", gpt_cond_latent, speaker_embedding)["wav"]
+            if isinstance(wav, torch.Tensor):
+                wav = wav.float().cpu().numpy()
+            wavs.append(np.asarray(wav, dtype=np.float32).reshape(-1))
+        if not wavs:
+            return np.empty(0, dtype=np.float32)
+        fade = int(self.model.synthesizer.output_sample_rate * _CROSSFADE_S)
+        return _crossfade_concat(wavs, fade)
+    
+    def synthesize_speech_stream(
+        self,
+        text: str,
+        voice_id: str,
+        chunk_ms: int = 60
+    ) -> Iterator[np.ndarray]:
+        """
+        Synthesize speech and yield float32 audio in fixed-size chunks.
+        
+        Uses the XTTS streaming decoder when cached speaker conditioning is
+        available, so the first chunk is ready long before the utterance ends.
+        The shared model's inference lock is held from the first chunk until the
+        stream is exhausted or closed, since XTTS decodes in a background thread
+        between chunks.
+        
+        Args:
+            text: Text to synthesize
+            voice_id: ID of the cloned voice, or "default"
+            chunk_ms: Chunk duration in milliseconds
+            
+        Yields:
+            Mono float32 audio chunks at the model's output sample rate
+        """
+        chunk_size = self.model.synthesizer.output_sample_rate * chunk_ms // 1000
+        speaker_data = self.speaker_embeddings.get(voice_id)
+        if voice_id != "default" and speaker_data is None:
+            raise ValueError(f"Voice {voice_id} not found. Please clone the voice first.")
+        
+        # Released from whichever worker thread finishes or closes the stream
+        with self._inference_lock:
+            tts_model = self._xtts_model()
+            conditioning = self._conditioning_for(voice_id) if speaker_data else None
+            if conditioning is not None and hasattr(tts_model, "inference_stream"):
+                gpt_cond_latent, speaker_embedding = conditioning
+                pieces = self._stream_pieces(
+                    tts_model.inference_stream(text, "en", gpt_cond_latent, speaker_embedding)
+                )
+            else:
+                # No streaming decoder for this voice; synthesize once and split
+                pieces = (self._synthesize_to_ndarray(text, voice_id)[0],)
+            
+            pending = np.empty(0, dtype=np.float32)
+            for piece in pieces:
+                pending = np.concatenate((pending, np.asarray(piece, dtype=np.float32).reshape(-1)))
+                while len(pending) >= chunk_size:
+                    yield pending[:chunk_size]
+                    pending = pending[chunk_size:]
+            if len(pending):
+                yield pending
+    
+    def _stream_pieces(self, stream) -> Iterator[np.ndarray]:
+        """Advance an XTTS inference stream, applying the precision context per step."""
+        # Autocast and inference-mode state is per thread and each step may run on a different worker thread
+        while True:
+            with torch.inference_mode(), self._precision_context():
+                piece = next(stream, None)
+            if piece is None:
+                return
+            yield piece.float().cpu().numpy()
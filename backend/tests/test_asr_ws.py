@@ -17,6 +17,24 @@ from app.services.audio.vad import VoiceActivityDetector
 client = TestClient(app)
 
 
+@pytest.fixture(scope="module")
+def audio_bytes():
+    """0.1 seconds of quiet random 16 kHz audio."""
+    return np.random.default_rng(0).integers(-1000, 1000, 1600, dtype=np.int16).tobytes()
+
+
+@pytest.fixture(scope="module")
+def speech_audio_bytes():
+    """0.1 seconds of loud random 16 kHz audio."""
+    return np.random.default_rng(1).integers(-16000, 16000, 1600, dtype=np.int16).tobytes()
+
+
+@pytest.fixture(scope="module")
+def long_audio_bytes():
+    """2 seconds of full-scale random 16 kHz audio."""
+    return np.random.default_rng(2).integers(-32768, 32767, 32000, dtype=np.int16).tobytes()
+
+
 class TestONNXWhisperASR:
     """Test the ONNX Whisper ASR service."""
     
@@ -31,18 +49,15 @@ class TestONNXWhisperASR:
         assert not asr.is_initialized
     
     @pytest.mark.asyncio
-    async def test_transcribe_audio_mock(self):
+    async def test_transcribe_audio_mock(self, long_audio_bytes):
         """Test audio transcription with mock implementation."""
         asr = ONNXWhisperASR(model_size="tiny", device="cpu")
         
-        # Create mock audio data
+        # 2 seconds of mock audio
         sample_rate = 16000
-        duration = 2.0  # 2 seconds
-        audio_data = np.random.randint(-32768, 32767, int(sample_rate * duration), dtype=np.int16)
-        audio_bytes = audio_data.tobytes()
         
         # Test transcription
-        result = await asr.transcribe_audio(audio_bytes, sample_rate)
+        result = await asr.transcribe_audio(long_audio_bytes, sample_rate)
         
         assert result is not None
         assert "text" in result
@@ -88,21 +103,17 @@ class TestAudioStreamBuffer:
         assert len(buffer.buffer) == 0
         assert not buffer.is_accumulating
     
-    def test_add_audio(self):
+    def test_add_audio(self, audio_bytes):
         """Test adding audio data."""
         buffer = AudioStreamBuffer(max_duration=5.0, sample_rate=16000)
         
-        # Create test audio data
-        audio_data = np.random.randint(-1000, 1000, 1600, dtype=np.int16)  # 0.1 seconds
-        audio_bytes = audio_data.tobytes()
-        
         # Add audio
         buffer.add_audio(audio_bytes, 16000)
         
         assert len(buffer.buffer) == 1600
         assert buffer.get_buffer_duration() == 0.1
     
-    def test_accumulation(self):
+    def test_accumulation(self, audio_bytes):
         """Test audio accumulation."""
         buffer = AudioStreamBuffer(max_duration=5.0, sample_rate=16000)
         
@@ -111,8 +122,6 @@ class TestAudioStreamBuffer:
         assert buffer.is_accumulating
         
         # Add audio
-        audio_data = np.random.randint(-1000, 1000, 1600, dtype=np.int16)
-        audio_bytes = audio_data.tobytes()
         buffer.add_audio(audio_bytes, 16000)
         
         # Check accumulated audio
@@ -125,13 +134,11 @@ class TestAudioStreamBuffer:
         buffer.stop_accumulation()
         assert not buffer.is_accumulating
     
-    def test_clear(self):
+    def test_clear(self, audio_bytes):
         """Test clearing buffer."""
         buffer = AudioStreamBuffer(max_duration=5.0, sample_rate=16000)
         
         # Add some audio
-        audio_data = np.random.randint(-1000, 1000, 1600, dtype=np.int16)
-        audio_bytes = audio_data.tobytes()
         buffer.add_audio(audio_bytes, 16000)
         
         # Clear buffer
@@ -159,6 +166,34 @@ class TestAudioStreamBuffer:
         level = buffer.get_audio_level()
         assert level > 0.0
 
+    
+    def test_ring_wraparound_matches_reference(self):
+        """Test chunked writes past max_samples keep the most recent samples in order."""
+        buffer = AudioStreamBuffer(max_duration=0.01, sample_rate=16000)  # 160 samples
+        rng = np.random.default_rng(3)
+        reference = np.empty(0, dtype=np.int16)
+        
+        buffer.start_accumulation()
+        # Chunks that fill, wrap mid-chunk, land exactly on the end and exceed the ring
+        for size in (100, 50, 30, 160, 7, 1, 400, 159, 80):
+            chunk = rng.integers(1, 32767, size, dtype=np.int16)
+            buffer.add_audio(chunk.tobytes(), 16000)
+            reference = np.concatenate((reference, chunk))
+            
+            expected = reference[-buffer.max_samples:]
+            np.testing.assert_array_equal(buffer.buffer, expected)
+            assert buffer.get_buffer_duration() == len(expected) / 16000
+            
+            for duration in (0.001, 0.005, 0.01, 1.0):
+                count = min(int(duration * 16000), len(expected))
+                np.testing.assert_allclose(
+                    buffer.get_recent_audio(duration),
+                    expected[len(expected) - count:].astype(np.float32) / 32768.0
+                )
+        
+        np.testing.assert_allclose(buffer.get_audio(), reference.astype(np.float32) / 32768.0)
+        assert buffer.get_duration() == len(reference) / 16000
+
 
 class TestVoiceActivityDetector:
     """Test the Voice Activity Detector."""
@@ -188,15 +223,12 @@ class TestVoiceActivityDetector:
         assert not is_voice
         assert not vad.is_speaking
     
-    def test_detect_voice_activity_speech(self):
+    def test_detect_voice_activity_speech(self, speech_audio_bytes):
         """Test VAD with speech audio."""
         vad = VoiceActivityDetector(energy_threshold=0.01)
         
-        # Create speech-like audio (loud enough)
-        speech_audio = np.random.randint(-16000, 16000, 1600, dtype=np.int16)
-        audio_bytes = speech_audio.tobytes()
-        
-        is_voice = vad.detect_voice_activity(audio_bytes)
+        # Speech-like audio (loud enough)
+        is_voice = vad.detect_voice_activity(speech_audio_bytes)
         # Note: This might not always detect as voice due to random nature
         # but it should not crash
     
@@ -245,12 +277,8 @@ class TestASREndpoints:
         assert "min_duration" in data
         assert "sample_rate" in data
     
-    def test_transcribe_file_endpoint(self):
+    def test_transcribe_file_endpoint(self, audio_bytes):
         """Test the file transcription endpoint."""
-        # Create mock audio data
-        audio_data = np.random.randint(-1000, 1000, 1600, dtype=np.int16)
-        audio_bytes = audio_data.tobytes()
-        
         response = client.post(
             "/asr/transcribe",
             content=audio_bytes,
@@ -305,17 +333,13 @@ class TestWebSocketConnection:
 
 
 @pytest.mark.asyncio
-async def test_mock_asr_integration():
+async def test_mock_asr_integration(audio_bytes):
     """Test integration of mock ASR components."""
     # Create components
     asr = ONNXWhisperASR(model_size="tiny", device="cpu")
     buffer = AudioStreamBuffer(max_duration=5.0, sample_rate=16000)
     vad = VoiceActivityDetector()
     
-    # Create test audio
-    audio_data = np.random.randint(-1000, 1000, 1600, dtype=np.int16)
-    audio_bytes = audio_data.tobytes()
-    
     # Test workflow
     buffer.start_accumulation()
     buffer.add_audio(audio_bytes, 16000)
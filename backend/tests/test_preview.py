@@ -1,11 +1,15 @@
 """Tests for preview endpoints."""
 
+import asyncio
+
 import pytest
 from fastapi.testclient import TestClient
 from pathlib import Path
 
 from app.main import app
 from app.core.config import settings
+from app.services.lipsync import sadtalker_real
+from app.services.lipsync.sadtalker_real import SadTalkerReplicaPool
 
 client = TestClient(app)
 
@@ -62,6 +66,54 @@ def test_generate_preview(sample_files):
     assert data["duration_seconds"] > 0
 
 
+@pytest.fixture
+def replica_pool(monkeypatch):
+    """Two-replica SadTalker pool whose replicas write a placeholder video instead of rendering."""
+    pool = SadTalkerReplicaPool(["cpu", "cpu"], num_threads=1)
+    calls = []
+    
+    for index, replica in enumerate(pool.replicas):
+        async def generate_video(face_image_path, audio_path, output_path, progress_callback=None, index=index):
+            calls.append(index)
+            await asyncio.sleep(0.01)
+            Path(output_path).write_bytes(b"mp4")
+            return {"status": "success", "output_path": output_path, "duration": 2.0, "fps": 25, "size_px": 256}
+        
+        monkeypatch.setattr(replica, "generate_video", generate_video)
+    
+    return pool, calls
+
+
+@pytest.mark.asyncio
+async def test_replica_pool_spreads_concurrent_requests(tmp_path, replica_pool):
+    """Concurrent requests go to the replica with the fewest requests in flight."""
+    pool, calls = replica_pool
+    
+    await asyncio.gather(*(
+        pool.generate_video("face.png", "audio.wav", str(tmp_path / f"out_{i}.mp4"))
+        for i in range(4)
+    ))
+    
+    assert sorted(calls) == [0, 0, 1, 1]
+    assert pool._in_flight == [0, 0]
+
+
+def test_startup_warms_replica_pool(monkeypatch):
+    """SADTALKER_WARMUP loads the shared pool while the app starts."""
+    warmed = []
+    
+    class _Pool:
+        async def warmup(self):
+            warmed.append(True)
+    
+    monkeypatch.setattr(settings, "sadtalker_warmup", True)
+    monkeypatch.setattr(sadtalker_real, "sadtalker_available", lambda: True)
+    monkeypatch.setattr(sadtalker_real, "get_sadtalker_service", lambda: _Pool())
+    
+    with TestClient(app):
+        assert warmed == [True]
+
+
 def test_generate_preview_missing_files():
     """Test preview generation with missing sample files."""
     response = client.post("/preview/generate", json={
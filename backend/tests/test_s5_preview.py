@@ -9,13 +9,94 @@ from unittest.mock import Mock, patch
 
 from app.main import app
 from app.services.preview.orchestrator import PreviewOrchestrator
-from app.services.llm.text_generator import TextGenerator
+from app.services.llm.text_generator import TextGenerator, MockTextGenerator
 from app.services.tts.voice_cloner import VoiceCloner
 from app.services.lipsync.sadtalker import SadTalkerService
 
 client = TestClient(app)
 
 
+class _FakeTokenizer:
+    """Whitespace tokenizer standing in for a Hugging Face tokenizer."""
+    
+    pad_token = None
+    eos_token = "</s>"
+    pad_token_id = 0
+    
+    def __init__(self, name):
+        self.name = name
+    
+    @classmethod
+    def from_pretrained(cls, name, cache_dir=None):
+        return cls(name)
+    
+    def __call__(self, text, return_tensors="pt", add_special_tokens=True):
+        import torch
+        from types import SimpleNamespace
+        
+        return SimpleNamespace(input_ids=torch.tensor([[len(word) for word in text.split()]]))
+    
+    def decode(self, ids, skip_special_tokens=True):
+        return " ".join("word" for _ in ids)
+    
+    def get_vocab(self):
+        # Models named "*-other-vocab" get a vocabulary of their own
+        return {"word": 1, self.name: 2} if self.name.endswith("-other-vocab") else {"word": 1}
+
+
+class _FakeCausalLM:
+    """Causal LM standing in for AutoModelForCausalLM, recording how it is used."""
+    
+    def __init__(self, name, load_kwargs):
+        import torch
+        
+        self.name = name
+        self.load_kwargs = load_kwargs
+        self.device = torch.device("cpu")
+        self.prefills = 0
+        self.generate_calls = []
+    
+    @classmethod
+    def from_pretrained(cls, name, cache_dir=None, **kwargs):
+        return cls(name, kwargs)
+    
+    def to(self, device):
+        return self
+    
+    def forward(self, input_ids, use_cache=True):
+        from types import SimpleNamespace
+        
+        return SimpleNamespace(past_key_values=[int(input_ids.sum())])
+    
+    def __call__(self, input_ids, use_cache=True):
+        self.prefills += 1
+        return self.forward(input_ids, use_cache=use_cache)
+    
+    def generate(self, input_ids, max_new_tokens, **kwargs):
+        import torch
+        
+        self.generate_calls.append(kwargs)
+        return torch.cat([input_ids, torch.ones((1, max_new_tokens), dtype=input_ids.dtype)], dim=1)
+
+
+@pytest.fixture
+def local_llm(monkeypatch):
+    """Enable the in-process LLM with fake weights and Foundry Local unavailable."""
+    from types import SimpleNamespace
+    from app.services.llm import text_generator
+    
+    monkeypatch.setattr(text_generator, "AutoTokenizer", _FakeTokenizer)
+    monkeypatch.setattr(text_generator, "AutoModelForCausalLM", _FakeCausalLM)
+    monkeypatch.setattr(text_generator.settings, "llm_local_model", True)
+    
+    async def unavailable_client():
+        return SimpleNamespace(is_available=False)
+    
+    generator = TextGenerator(model_name="test-model", device="cpu")
+    generator._foundry_client_provider = unavailable_client
+    return generator
+
+
 class TestTextGenerator:
     """Test the Text Generator service."""
     
@@ -68,6 +149,221 @@ class TestTextGenerator:
         assert result["style_adapted"] is True
         assert "text" in result
     
+    @pytest.mark.asyncio
+    async def test_generate_text_batch_mock(self):
+        """Test batched text generation falls back per prompt."""
+        generator = TextGenerator(model_name="test-model", device="cpu")
+        
+        results = await generator.generate_text_batch(
+            ["First prompt", "Second prompt"],
+            style_profiles=[None, {"tone": {"primary_tone": "formal"}}]
+        )
+        
+        assert len(results) == 2
+        assert all(isinstance(result["text"], str) for result in results)
+        assert all(result["word_count"] > 0 for result in results)
+
+    def test_compile_style(self):
+        """Test compiling a style profile into a signature."""
+        signature = TextGenerator.compile_style({
+            "style_metrics": {
+                "vocabulary_richness": 0.8,
+                "avg_sentence_length": 5.0
+            },
+            "tone": {
+                "primary_tone": "formal"
+            }
+        })
+
+        assert signature.vocab_richness_bucket == 1
+        assert signature.sent_len_bucket == -1
+        assert signature.primary_tone == "formal"
+        assert signature.style_prefix == (
+            "Use sophisticated vocabulary Use shorter, concise sentences Maintain a formal tone"
+        )
+
+    def test_style_signature_cache_keyed_on_buckets(self):
+        """Test profiles in the same style buckets share one cached signature."""
+        generator = TextGenerator(model_name="test-model", device="cpu")
+
+        signatures = {
+            generator._style_signature({
+                "style_metrics": {
+                    "vocabulary_richness": 0.71 + i / 1000,
+                    "avg_sentence_length": 21.0 + i
+                },
+                "tone": {"primary_tone": "formal"}
+            })
+            for i in range(50)
+        }
+
+        assert len(signatures) == 1
+        assert list(generator._style_signature_cache) == [(1, 1, "formal")]
+
+    def test_prefix_kv_cache_concurrent_eviction(self):
+        """Test concurrent prefix lookups on worker threads stay within the LRU bound."""
+        import torch
+        from concurrent.futures import ThreadPoolExecutor
+        from types import SimpleNamespace
+
+        class _Model:
+            device = torch.device("cpu")
+
+            def __call__(self, input_ids, use_cache):
+                return SimpleNamespace(past_key_values=int(input_ids.sum()))
+
+        generator = TextGenerator(model_name="test-model", device="cpu")
+        generator.model = _Model()
+        prefixes = [torch.tensor([[i, i + 1]]) for i in range(3 * generator._prefix_kv_cache_size)]
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            results = list(pool.map(generator._get_prefix_kv_cache, prefixes * 20))
+
+        assert results == [int(prefix.sum()) for prefix in prefixes] * 20
+        assert len(generator._prefix_kv_cache) == generator._prefix_kv_cache_size
+
+    @pytest.mark.asyncio
+    async def test_generate_text_local_model(self, local_llm):
+        """Test the in-process model serves requests when Foundry Local is down."""
+        style_profile = {"tone": {"primary_tone": "formal"}}
+        
+        first = await local_llm.generate_text("Tell me a story", style_profile, max_tokens=4)
+        second = await local_llm.generate_text("Another story please", style_profile, max_tokens=4)
+        
+        assert local_llm.is_initialized
+        assert isinstance(local_llm.model, _FakeCausalLM)
+        assert first["via_foundry"] is False
+        assert first["text"] == "word word word word"
+        assert first["tokens_generated"] == 4
+        assert second["style_adapted"]
+        # The persona's style prefix is prefilled once and reused
+        assert local_llm.model.prefills == 1
+        assert len(local_llm.model.generate_calls) == 2
+        assert all(call["past_key_values"] is not None for call in local_llm.model.generate_calls)
+    
+    @pytest.mark.asyncio
+    async def test_generate_text_local_model_disabled(self, local_llm, monkeypatch):
+        """Test nothing is loaded in-process unless LLM_LOCAL_MODEL is set."""
+        from app.services.llm import text_generator
+        
+        monkeypatch.setattr(text_generator.settings, "llm_local_model", False)
+        
+        result = await local_llm.generate_text("Tell me a story")
+        
+        assert local_llm.model is None
+        assert "text" in result
+    
+    @pytest.mark.asyncio
+    async def test_load_model_compiles_and_warms_up(self, local_llm, monkeypatch, tmp_path):
+        """Test LLM_COMPILE compiles the forward pass and warms it up at load time."""
+        from app.services.llm import text_generator
+        
+        compiled = []
+        
+        def fake_compile(fn, mode, fullgraph):
+            compiled.append(mode)
+            return fn
+        
+        monkeypatch.setattr(text_generator.settings, "llm_compile", True)
+        monkeypatch.setattr(text_generator.torch, "compile", fake_compile)
+        monkeypatch.setenv("TORCHINDUCTOR_CACHE_DIR", str(tmp_path))
+        
+        await local_llm._load_model()
+        
+        assert compiled == ["default"]
+        assert len(local_llm.model.generate_calls) == 1
+        
+        # A failed compile runs eagerly without a warmup pass
+        def failing_compile(fn, mode, fullgraph):
+            raise RuntimeError("no inductor")
+        
+        monkeypatch.setattr(text_generator.torch, "compile", failing_compile)
+        await local_llm.cleanup()
+        await local_llm._load_model()
+        
+        assert isinstance(local_llm.model, _FakeCausalLM)
+        assert local_llm.model.generate_calls == []
+    
+    @pytest.mark.asyncio
+    async def test_load_model_quantization(self, local_llm, monkeypatch):
+        """Test LLM_QUANTIZATION picks the weight dtype, falling back without bitsandbytes."""
+        import sys
+        import torch
+        from app.services.llm import text_generator
+        
+        monkeypatch.setattr(text_generator.settings, "llm_quantization", "fp16")
+        await local_llm._load_model()
+        
+        assert local_llm.torch_dtype == torch.float16
+        assert local_llm.model.load_kwargs == {"torch_dtype": torch.float16, "device_map": None}
+        
+        # int8 needs bitsandbytes; without it the weights load at the auto precision
+        monkeypatch.setattr(text_generator.settings, "llm_quantization", "int8")
+        monkeypatch.setitem(sys.modules, "bitsandbytes", None)
+        await local_llm.cleanup()
+        await local_llm._load_model()
+        
+        assert local_llm.torch_dtype == local_llm._select_dtype("auto")
+        assert "quantization_config" not in local_llm.model.load_kwargs
+    
+    def test_select_dtype(self):
+        """Test explicit precisions map to their dtype and auto never picks fp16 on CPU."""
+        import torch
+        
+        generator = TextGenerator(model_name="test-model", device="cpu")
+        
+        assert generator._select_dtype("fp32") == torch.float32
+        assert generator._select_dtype("fp16") == torch.float16
+        assert generator._select_dtype("bf16") == torch.bfloat16
+        assert generator._select_dtype("auto") in (torch.float32, torch.bfloat16)
+    
+    @pytest.mark.asyncio
+    async def test_load_model_speculative_decoding(self, local_llm, monkeypatch):
+        """Test the draft model assists generation only when it shares the vocabulary."""
+        from app.services.llm import text_generator
+        
+        monkeypatch.setattr(text_generator.settings, "llm_speculative_decoding", True)
+        monkeypatch.setattr(text_generator.settings, "llm_draft_model", "draft-model")
+        
+        await local_llm.generate_text("Tell me a story", max_tokens=2)
+        
+        assert local_llm.assistant_model.name == "draft-model"
+        assert local_llm.model.generate_calls[0]["assistant_model"] is local_llm.assistant_model
+        
+        # A draft with a different vocabulary cannot propose target tokens
+        monkeypatch.setattr(text_generator.settings, "llm_draft_model", "draft-other-vocab")
+        await local_llm.cleanup()
+        await local_llm.generate_text("Tell me a story", max_tokens=2)
+        
+        assert local_llm.assistant_model is None
+        assert local_llm.model.generate_calls[0]["assistant_model"] is None
+    
+    @pytest.mark.asyncio
+    async def test_mock_generator_unicode_prompt(self):
+        """Test the mock generator keeps non-ASCII prompts intact and splits on Unicode whitespace."""
+        generator = MockTextGenerator()
+        prompt = "caf\u00e9\u3000na\u00efve\u00a0r\u00e9sum\u00e9"
+        
+        result = await generator.generate_text(prompt)
+        truncated = await generator.generate_text(prompt, max_tokens=8)
+        
+        assert prompt in result["text"]
+        assert result["word_count"] == len(result["text"].split())
+        assert truncated["word_count"] == 4
+        assert len(truncated["text"].split()) == 4
+    
+    @pytest.mark.asyncio
+    async def test_mock_generator_deterministic(self):
+        """Test the mock response depends only on the prompt, not on call order."""
+        prompts = [f"Question number {i}" for i in range(10)]
+        
+        in_order = [(await MockTextGenerator().generate_text(p))["text"] for p in prompts]
+        generator = MockTextGenerator()
+        reversed_texts = [(await generator.generate_text(p))["text"] for p in reversed(prompts)]
+        
+        assert in_order == reversed_texts[::-1]
+        assert len(set(text.split("'")[0] for text in in_order)) > 1
+    
     def test_get_model_info(self):
         """Test getting model information."""
         generator = TextGenerator()
@@ -93,6 +389,28 @@ class TestVoiceCloner:
         assert cloner.max_text_length == 500
         assert not cloner.is_initialized
     
+    def test_initialization_defers_torch_import(self):
+        """Test constructing a voice cloner leaves torch and XTTS unimported."""
+        import subprocess
+        import sys
+        from pathlib import Path
+        
+        code = (
+            "import sys\n"
+            "from app.services.tts.voice_cloner import VoiceCloner\n"
+            "VoiceCloner()\n"
+            "assert 'torch' not in sys.modules, 'torch imported'\n"
+            "assert 'app.services.tts.xtts_real' not in sys.modules, 'xtts_real imported'\n"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", code],
+            cwd=Path(__file__).parent.parent,
+            capture_output=True,
+            text=True
+        )
+        
+        assert result.returncode == 0, result.stderr
+    
     @pytest.mark.asyncio
     async def test_clone_voice_mock(self):
         """Test voice cloning with mock implementation."""
@@ -140,7 +458,175 @@ class TestVoiceCloner:
         assert "duration" in result
         assert "sample_rate" in result
         assert result["voice_name"] == "test_voice"
-    
+
+    @pytest.mark.asyncio
+    async def test_load_voice_profile_cache(self, tmp_path):
+        """Test voice profiles are cached until the file changes."""
+        import json
+        import os
+
+        cloner = VoiceCloner(device="cpu")
+        cloner.voice_profiles_dir = tmp_path
+        profile_path = tmp_path / "cached_voice.json"
+        profile_path.write_text(json.dumps({"voice_name": "first"}))
+
+        assert (await cloner.load_voice_profile("cached_voice"))["voice_name"] == "first"
+        assert "cached_voice" in cloner._profile_cache
+
+        profile_path.write_text(json.dumps({"voice_name": "second"}))
+        stat = profile_path.stat()
+        os.utime(profile_path, (stat.st_atime, stat.st_mtime + 10))
+        assert (await cloner.load_voice_profile("cached_voice"))["voice_name"] == "second"
+
+        profile_path.unlink()
+        assert await cloner.load_voice_profile("cached_voice") is None
+
+    @pytest.mark.parametrize("audio_data, seekable", [
+        (b"\x00\x00\x00\x20ftypM4A \x00\x00\x00\x00" + b"\x00" * 64, True),
+        (b"\x1aE\xdf\xa3" + b"\x00" * 64, False),
+    ])
+    def test_process_audio_container_input(self, monkeypatch, audio_data, seekable):
+        """Test MP4/M4A uploads reach ffmpeg as a seekable file while WebM is piped."""
+        import os
+        import subprocess
+        import numpy as np
+        from app.services.tts import voice_cloner
+
+        seen = {}
+
+        def fake_run(cmd, input=None, capture_output=False, timeout=None):
+            source = cmd[cmd.index('-i') + 1]
+            seen["source"] = source
+            seen["input"] = input
+            if source != 'pipe:0':
+                with open(source, 'rb') as f:
+                    seen["file_data"] = f.read()
+            pcm = np.full(2205, 16384, dtype=np.int16).tobytes()
+            return subprocess.CompletedProcess(cmd, 0, stdout=pcm, stderr=b"")
+
+        monkeypatch.setattr(voice_cloner.subprocess, "run", fake_run)
+        cloner = VoiceCloner(device="cpu")
+
+        audio_array = cloner._process_audio_sync(audio_data)
+
+        np.testing.assert_allclose(audio_array, 0.5)
+        if seekable:
+            assert seen["input"] is None
+            assert seen["file_data"] == audio_data
+            assert not os.path.exists(seen["source"])
+        else:
+            assert seen["source"] == 'pipe:0'
+            assert seen["input"] == audio_data
+
+    @pytest.mark.asyncio
+    async def test_mock_audio_uses_instance_rng(self):
+        """Test mock audio draws only from the cloner's generator, leaving the global RNG alone."""
+        import numpy as np
+
+        outputs = []
+        global_state = np.random.get_state()[1].copy()
+        for _ in range(2):
+            cloner = VoiceCloner(device="cpu")
+            cloner._rng = np.random.default_rng(1234)
+            outputs.append((
+                cloner._create_fallback_audio(),
+                await cloner._mock_synthesize_speech("Hello there", {})
+            ))
+
+        np.testing.assert_array_equal(outputs[0][0], outputs[1][0])
+        assert outputs[0][1] == outputs[1][1]
+        np.testing.assert_array_equal(np.random.get_state()[1], global_state)
+
+    @pytest.mark.asyncio
+    async def test_store_profile_arrays_leaves_profile_intact(self, tmp_path):
+        """Test the arrays go to .npy sidecars without being removed from the cloned profile."""
+        import numpy as np
+
+        cloner = VoiceCloner(device="cpu")
+        cloner.voice_profiles_dir = tmp_path
+        voice_profile = await cloner._extract_voice_characteristics(
+            np.zeros(1600, dtype=np.float32), "Test reference text"
+        )
+
+        stored_profile = cloner._store_profile_arrays("sidecar_voice", voice_profile)
+        cloner._write_json(tmp_path / "sidecar_voice.json", stored_profile)
+
+        assert isinstance(voice_profile["speaker_embedding"], np.ndarray)
+        assert isinstance(voice_profile["acoustic_features"]["mfcc_mean"], np.ndarray)
+        assert "speaker_embedding" not in stored_profile
+        assert "mfcc_mean" not in stored_profile["acoustic_features"]
+
+        loaded = await cloner.load_voice_profile("sidecar_voice")
+        np.testing.assert_array_equal(loaded["speaker_embedding"], voice_profile["speaker_embedding"])
+        np.testing.assert_array_equal(
+            loaded["acoustic_features"]["mfcc_mean"], voice_profile["acoustic_features"]["mfcc_mean"]
+        )
+
+    @pytest.mark.asyncio
+    async def test_synthesize_speech_runs_each_request_directly(self):
+        """Test concurrent XTTS syntheses each run as their own call, without a batching delay."""
+        import numpy as np
+        from types import SimpleNamespace
+
+        calls = []
+
+        def synthesize_to_ndarray(text, voice_id):
+            calls.append((text, voice_id))
+            return np.full(10, 0.25, dtype=np.float32), 24000
+
+        cloner = VoiceCloner(device="cpu")
+        cloner.xtts_service = SimpleNamespace(speaker_embeddings={}, synthesize_to_ndarray=synthesize_to_ndarray)
+        voice_profile = {"xtts_ready": True, "xtts_voice_id": "default"}
+        texts = ["one", "two", "three", "four"]
+
+        results = await asyncio.gather(*(
+            cloner.synthesize_speech(text, voice_profile, persist=False) for text in texts
+        ))
+
+        assert sorted(calls) == sorted((text, "default") for text in texts)
+        for result in results:
+            assert result["sample_rate"] == 24000
+            assert len(result["audio_data"]) == 20
+
+    @pytest.mark.asyncio
+    async def test_synthesize_speech_stream_holds_xtts_model(self):
+        """Test a stream yields every sample and other syntheses wait until it finishes."""
+        import threading
+        import numpy as np
+        from types import SimpleNamespace
+        from app.services.tts.voice_cloner import _to_int16
+        from app.services.tts.xtts_real import RealXTTSService
+
+        wav = np.linspace(-0.5, 0.5, 250, dtype=np.float32)
+        xtts = RealXTTSService.__new__(RealXTTSService)
+        xtts.device = "cpu"
+        xtts.speaker_embeddings = {}
+        xtts.autocast_dtype = None
+        xtts._inference_lock = threading.Lock()
+        xtts._model = SimpleNamespace(
+            synthesizer=SimpleNamespace(output_sample_rate=1000),
+            tts=lambda text, language: wav
+        )
+
+        cloner = VoiceCloner(device="cpu")
+        cloner.xtts_service = xtts
+        voice_profile = {"xtts_ready": True, "xtts_voice_id": "default"}
+
+        stream = cloner.synthesize_speech_stream("Hello there.", voice_profile, chunk_ms=60)
+        chunks = [await stream.__anext__()]
+        other = asyncio.create_task(asyncio.to_thread(xtts.synthesize_to_ndarray, "Hi.", "default"))
+        await asyncio.sleep(0.05)
+        assert not other.done()
+
+        chunks += [chunk async for chunk in stream]
+        audio, sample_rate = await asyncio.wait_for(other, 5)
+
+        assert [len(chunk) for chunk in chunks] == [120, 120, 120, 120, 20]
+        streamed = np.frombuffer(b"".join(chunks), dtype=np.int16)
+        np.testing.assert_array_equal(streamed, _to_int16(wav.copy()))
+        assert sample_rate == 1000
+        assert not xtts._inference_lock.locked()
+
     def test_get_model_info(self):
         """Test getting model information."""
         cloner = VoiceCloner()
@@ -153,6 +639,70 @@ class TestVoiceCloner:
         assert "max_text_length" in info
 
 
+class TestXTTSChunking:
+    """Test the long-text chunking and crossfade helpers used by XTTS synthesis."""
+
+    def test_chunk_text_packs_sentences(self):
+        """Test whole sentences are packed into chunks up to max_chars."""
+        from app.services.tts.xtts_real import _chunk_text
+
+        assert _chunk_text("One. Two!  Three? Four.", max_chars=10) == ["One. Two!", "Three?", "Four."]
+        assert _chunk_text("Short text.", max_chars=200) == ["Short text."]
+
+    def test_chunk_text_empty(self):
+        """Test empty or whitespace-only text yields no chunks."""
+        from app.services.tts.xtts_real import _chunk_text
+
+        assert _chunk_text("") == []
+        assert _chunk_text("   \n ") == []
+
+    def test_chunk_text_splits_long_sentences(self):
+        """Test sentences longer than max_chars break at word boundaries, or mid-word when forced."""
+        from app.services.tts.xtts_real import _chunk_text
+
+        sentence = "the quick brown fox jumps over the lazy dog again and again."
+        chunks = _chunk_text(f"Hi. {sentence} Bye.", max_chars=16)
+
+        assert chunks == ["Hi.", "the quick brown", "fox jumps over", "the lazy dog", "again and again.", "Bye."]
+        assert all(len(chunk) <= 16 for chunk in chunks)
+        assert " ".join(chunks) == f"Hi. {sentence} Bye."
+
+        assert _chunk_text("a" * 25, max_chars=10) == ["a" * 10, "a" * 10, "a" * 5]
+
+    def test_crossfade_concat(self):
+        """Test each boundary overlaps by the fade length and ramps between the two waveforms."""
+        import numpy as np
+        from app.services.tts.xtts_real import _crossfade_concat
+
+        first = np.ones(10, dtype=np.float32)
+        second = np.zeros(10, dtype=np.float32)
+        joined = _crossfade_concat([first, second], fade=4)
+
+        assert len(joined) == 16
+        np.testing.assert_array_equal(joined[:6], 1.0)
+        np.testing.assert_array_equal(joined[10:], 0.0)
+        fade = joined[6:10]
+        assert fade[0] == pytest.approx(1.0) and fade[-1] == pytest.approx(0.0)
+        assert np.all(np.diff(fade) < 0)
+
+        single = np.arange(5, dtype=np.float32)
+        np.testing.assert_array_equal(_crossfade_concat([single], fade=4), single)
+
+    def test_crossfade_concat_short_wavs(self):
+        """Test waveforms shorter than the fade overlap only by their own length."""
+        import numpy as np
+        from app.services.tts.xtts_real import _crossfade_concat
+
+        short = np.full(3, 0.5, dtype=np.float32)
+        long = np.ones(10, dtype=np.float32)
+
+        assert len(_crossfade_concat([short, long], fade=5)) == 10
+        assert len(_crossfade_concat([long, short], fade=5)) == 10
+        # The middle waveform is used up by its first boundary, so the second does not overlap
+        assert len(_crossfade_concat([long, np.full(2, 2.0, dtype=np.float32), long], fade=4)) == 20
+        assert len(_crossfade_concat([long, np.empty(0, dtype=np.float32), long], fade=4)) == 20
+
+
 class TestSadTalkerService:
     """Test the SadTalker service."""
     
@@ -209,6 +759,19 @@ class TestSadTalkerService:
             os.unlink(face_path)
             os.unlink(audio_path)
     
+    def test_generate_mock_landmarks(self):
+        """Test mock landmark generation."""
+        service = SadTalkerService(device="cpu")
+        
+        landmarks = service._generate_mock_landmarks([64, 64, 192, 192])
+        
+        assert isinstance(landmarks, list)
+        assert len(landmarks) == 68
+        assert all(len(point) == 2 for point in landmarks)
+        assert landmarks[0] == [64.0, 76.8]
+        assert landmarks[16] == [192.0, 76.8]
+        assert landmarks[27] == [128.0, 115.2]
+    
     def test_get_model_info(self):
         """Test getting model information."""
         service = SadTalkerService()
@@ -222,6 +785,33 @@ class TestSadTalkerService:
         assert "enhancer" in info
 
 
+class TestFoundryLocalClient:
+    """Test the Foundry Local client's connection pool."""
+
+    def test_http_client_closed_when_loop_changes(self):
+        """Test the client opened on a finished event loop is closed when a new loop takes over."""
+        from app.services.foundry.local_client import FoundryLocalClient
+
+        foundry = FoundryLocalClient()
+
+        async def open_client():
+            return foundry._http_client()
+
+        async def reopen_client():
+            http = foundry._http_client()
+            await asyncio.gather(*foundry._closing_tasks)
+            return http
+
+        first = asyncio.run(open_client())
+        second = asyncio.run(reopen_client())
+
+        assert first is not second
+        assert first.is_closed
+        assert not second.is_closed
+        asyncio.run(foundry.aclose())
+        assert second.is_closed
+
+
 class TestPreviewOrchestrator:
     """Test the Preview Orchestrator."""
     
@@ -234,6 +824,23 @@ class TestPreviewOrchestrator:
         assert orchestrator.sadtalker is not None
         assert len(orchestrator.active_tasks) == 0
     
+    @pytest.mark.asyncio
+    async def test_default_voice_profile_is_independent_copy(self, monkeypatch, tmp_path):
+        """Test changes to a returned default voice profile do not leak into later requests."""
+        from app.services.preview import orchestrator as orchestrator_module
+        
+        monkeypatch.setattr(orchestrator_module.settings, "artifacts_dir", tmp_path)
+        orchestrator = PreviewOrchestrator()
+        
+        profile = await orchestrator._get_default_voice_profile({})
+        profile["prosody_patterns"]["pitch_mean"] = 999
+        profile["speaker_embedding"][0] = 1.0
+        
+        fresh = await orchestrator._get_default_voice_profile({})
+        
+        assert fresh["prosody_patterns"]["pitch_mean"] == 140
+        assert fresh["speaker_embedding"][0] == 0.0
+    
     @pytest.mark.asyncio
     async def test_generate_preview_mock(self):
         """Test preview generation with mock implementation."""
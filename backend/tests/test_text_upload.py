@@ -476,3 +476,72 @@ def test_upload_text_concurrent():
     assert len(results) == 5
     for index, status_code in results:
         assert status_code == 200, f"Thread {index} failed with status {status_code}"
+
+
+def test_create_style_profile_reuses_analysis(tmp_path):
+    """Test that identical text is analyzed once and written to each output path."""
+    from unittest.mock import patch
+    from app.services.text import style_profile
+    
+    sample_text = "Caching test text. It repeats across persona iterations!"
+    first = style_profile.create_style_profile(sample_text, tmp_path / "first.json")
+    
+    with patch.object(style_profile.TextStyleProfile, "analyze") as analyze:
+        second = style_profile.create_style_profile(sample_text, tmp_path / "second.json")
+    
+    analyze.assert_not_called()
+    assert second == first
+    assert (tmp_path / "second.json").read_text() == (tmp_path / "first.json").read_text()
+
+
+def test_count_syllables_matches_per_word_loop():
+    """Test vectorized syllable counting against the per-word vowel-group loop."""
+    from app.services.text.style_profile import TextStyleProfile
+    
+    def reference(words):
+        total = 0
+        for word in words:
+            vowel_groups = 0
+            prev_was_vowel = False
+            for char in word.lower():
+                is_vowel = char in 'aeiouy'
+                if is_vowel and not prev_was_vowel:
+                    vowel_groups += 1
+                prev_was_vowel = is_vowel
+            if word.lower().endswith('e') and vowel_groups > 1:
+                vowel_groups -= 1
+            total += max(1, vowel_groups)
+        return total
+    
+    profile = TextStyleProfile("placeholder")
+    word_lists = [
+        [],
+        ["a"],
+        ["e"],
+        ["the"],
+        ["rhythm"],
+        ["make", "cake", "queue", "beautiful", "strengths"],
+        ["Yesterday", "AEIOU", "bee", "idea", "syzygy", "oboe", "x"],
+        ["Hello", "world", "this", "is", "a", "longer", "sentence", "with", "onomatopoeia"],
+    ]
+    for words in word_lists:
+        assert profile._count_syllables(words) == reference(words), words
+
+
+def test_analyze_tone_counts_whole_words():
+    """Test tone indicators match whole words only, not substrings of other words."""
+    from app.services.text.style_profile import TextStyleProfile
+    
+    # "this", "likely", "hither" and "badge" contain tone words but are not tone words
+    profile = TextStyleProfile(
+        "Hi there, this is likely fine. I like it and hither we go. "
+        "Hey, the badge is bad but cool; however, thus it ends."
+    )
+    
+    assert len(profile.words) == 24
+    assert profile._analyze_tone() == {
+        "positive": round(1 / 24, 3),  # like
+        "negative": round(1 / 24, 3),  # bad
+        "formal": round(2 / 24, 3),  # however, thus
+        "casual": round(3 / 24, 3),  # hi, hey, cool
+    }